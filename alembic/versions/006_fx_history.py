@@ -0,0 +1,36 @@
+"""Add fx_rates history and original-amount columns on transactions.
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-19
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "006"
+down_revision: Union[str, None] = "005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "fx_rates",
+        sa.Column("base", sa.String(), primary_key=True),
+        sa.Column("quote", sa.String(), primary_key=True),
+        sa.Column("date", sa.Date(), primary_key=True),
+        sa.Column("rate", sa.Float(), nullable=False),
+    )
+    op.add_column("transactions", sa.Column("original_amount", sa.Float(), nullable=True))
+    op.add_column("transactions", sa.Column("original_currency", sa.String(), nullable=True))
+    op.add_column("transactions", sa.Column("fx_rate", sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("transactions") as batch:
+        batch.drop_column("fx_rate")
+        batch.drop_column("original_currency")
+        batch.drop_column("original_amount")
+    op.drop_table("fx_rates")
@@ -0,0 +1,202 @@
+"""Archive tier: closed months' transactions in a separate database file.
+
+archive_months() moves every transaction whose month (Jakarta time) is at
+or before a cutoff into ``archive.transactions`` in LEDGER_ARCHIVE_PATH, a
+database attached to each connection under the name ``archive``.  The table
+has the same columns as the hot one but no foreign keys, which SQLite cannot
+enforce across files.  The cutoff is the ``archived_through`` value (YYYYMM)
+in ledger_meta, read through the change-counter memo like any other counter.
+Each moved batch adds its balance contribution to archived_movements in the
+transaction that deletes it from the hot table, so balances never read the
+archive.
+
+Readers ask transactions_for(db, month) which entity to query.  For months
+after the cutoff, including the current one, that is the Transaction model
+itself and the query touches only the hot table.  For archived months and
+all-history listings it is the same model aliased onto hot UNION ALL
+archive.  Archived transactions are read-only: voiding or correcting one is
+refused.
+
+A batch is copied and committed to the archive first, then deleted from the
+hot table with its archived_movements rows and committed there; the two
+files have no shared transaction.  A crash between the commits leaves rows
+in both files, which the union reads once (the hot copy wins) and the next
+run finishes moving.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Any
+
+from sqlalchemy import Column, Index, MetaData, Table, delete, func, insert, select, union_all
+from sqlalchemy.orm import Session, aliased
+
+from app.config import settings
+from app.database import SessionLocal, change_counters
+from app.models import ArchivedMovement, LedgerMeta, Transaction
+from app.services import account_service
+from app.tz import col_as_jakarta, now_jakarta, now_utc
+
+ARCHIVED_THROUGH = "archived_through"  # ledger_meta: last archived month as YYYYMM, 0 if none
+
+_BATCH = 2000
+_ATTACHED = "ledger_archive_attached"  # DBAPI connection info flag
+
+archived_transactions = Table(
+    "transactions",
+    MetaData(schema="archive"),
+    *(Column(c.name, c.type, primary_key=c.primary_key, nullable=c.nullable)
+      for c in Transaction.__table__.columns),
+)
+Index("ix_archive_transactions_effective_at", archived_transactions.c.effective_at)
+
+_hot = Transaction.__table__
+_all = union_all(
+    select(_hot),
+    select(archived_transactions).where(archived_transactions.c.id.not_in(select(_hot.c.id))),
+).subquery("transactions_all")
+
+# Transaction over hot and archived rows; use like the model in queries.
+AllTransactions = aliased(Transaction, _all)
+
+
+class ArchiveError(RuntimeError):
+    pass
+
+
+def archived_through(db: Session) -> int:
+    return change_counters(db).get(ARCHIVED_THROUGH, 0)
+
+
+def transactions_for(db: Session, month: str | None = None):
+    """The entity to query for *month* (YYYY-MM), or for all history if None."""
+    cutoff = archived_through(db)
+    if not cutoff:
+        return Transaction
+    if month is not None:
+        key = month.replace("-", "")
+        if key.isdigit() and int(key) > cutoff:
+            return Transaction
+    _ensure_attached(db)
+    return AllTransactions
+
+
+def _ensure_attached(db: Session, create: bool = False) -> None:
+    """ATTACH the archive on *db*'s connection if the engine did not already."""
+    conn = db.connection()
+    if conn.info.get(_ATTACHED):
+        return
+    names = {row[1] for row in conn.exec_driver_sql("PRAGMA database_list")}
+    if "archive" not in names:
+        path = settings.archive_path
+        if not create and not os.path.exists(path):
+            raise ArchiveError(f"Transactions are archived but the archive database is missing: {path}")
+        read_only = conn.exec_driver_sql("PRAGMA query_only").scalar()
+        conn.exec_driver_sql("ATTACH DATABASE ? AS archive", (f"file:{path}?mode=ro" if read_only else path,))
+    conn.info[_ATTACHED] = True
+
+
+def default_cutoff() -> str:
+    """The newest month that leaves LEDGER_ARCHIVE_KEEP_MONTHS months hot."""
+    now = now_jakarta()
+    index = now.year * 12 + now.month - 1 - max(settings.archive_keep_months, 1)
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+def run_archive(through: str | None = None) -> dict[str, Any]:
+    """archive_months() on a fresh session of the app's write engine."""
+    with SessionLocal() as db:
+        return archive_months(db, through)
+
+
+def archive_months(db: Session, through: str | None = None) -> dict[str, Any]:
+    """Move transactions of every month up to *through* (YYYY-MM) to the archive.
+
+    *db* must be a fresh write session: attaching the archive cannot happen
+    inside a transaction.  Returns a summary of the run.
+    """
+    through = through or default_cutoff()
+    key = through.replace("-", "")
+    if len(through) != 7 or through[4] != "-" or not key.isdigit():
+        raise ArchiveError(f"Invalid month: {through!r} (expected YYYY-MM)")
+    if through >= now_jakarta().strftime("%Y-%m"):
+        raise ArchiveError("Only closed months can be archived")
+
+    _ensure_attached(db, create=True)
+    conn = db.connection()
+    conn.exec_driver_sql("PRAGMA archive.journal_mode=WAL")
+    archived_transactions.create(conn, checkfirst=True)
+
+    # Advance the cutoff first so readers union the two files while rows move.
+    cutoff = max(int(key), archived_through(db))
+    db.merge(LedgerMeta(key=ARCHIVED_THROUGH, value=cutoff))
+    db.commit()
+
+    in_range = func.strftime("%Y-%m", col_as_jakarta(Transaction.effective_at)) <= through
+    pinned = _pinned_ids(db, in_range)
+    moved = 0
+    while True:
+        # Newest first: a correction leaves the hot table before its original.
+        ids = db.scalars(
+            select(Transaction.id)
+            .where(in_range, Transaction.id.not_in(pinned))
+            .order_by(Transaction.id.desc())
+            .limit(_BATCH)
+        ).all()
+        if not ids:
+            break
+        _move(db, ids)
+        moved += len(ids)
+
+    return {
+        "through": through,
+        "moved": moved,
+        "kept_hot": db.scalar(select(func.count()).select_from(Transaction).where(in_range)),
+        "archive": settings.archive_path,
+    }
+
+
+def _pinned_ids(db: Session, in_range) -> set[int]:
+    """Ids that must stay hot this run.
+
+    The newest row keeps SQLite from reusing an archived id (the table has
+    no AUTOINCREMENT), and an original must stay while a correction that
+    stays hot still references it.
+    """
+    newest = db.scalar(select(func.max(Transaction.id)))
+    rows = db.execute(
+        select(Transaction.id, Transaction.correction_of, in_range).where(Transaction.correction_of.isnot(None))
+    ).all()
+    parent_of = {row[0]: row[1] for row in rows}
+    pinned: set[int] = set()
+    frontier = [newest] if newest is not None else []
+    frontier += [row[1] for row in rows if not row[2]]
+    while frontier:
+        txn_id = frontier.pop()
+        if txn_id in pinned:
+            continue
+        pinned.add(txn_id)
+        if txn_id in parent_of:
+            frontier.append(parent_of[txn_id])
+    return pinned
+
+
+def _move(db: Session, ids: list[int]) -> None:
+    db.execute(
+        insert(archived_transactions)
+        .prefix_with("OR REPLACE")
+        .from_select([c.name for c in _hot.columns], select(_hot).where(_hot.c.id.in_(ids)))
+    )
+    db.commit()
+
+    archived_at = now_utc()
+    for account_id, currency, original_currency, amount, original in account_service.movement_totals(
+        db, Transaction.id.in_(ids),
+    ):
+        db.add(ArchivedMovement(
+            account_id=account_id, currency=currency, original_currency=original_currency,
+            amount=int(amount), original=float(original), archived_at=archived_at,
+        ))
+    db.execute(delete(Transaction).where(Transaction.id.in_(ids)).execution_options(synchronize_session=False))
+    db.commit()
@@ -0,0 +1,119 @@
+"""Fan-out of change_log entries to connected dashboard event streams.
+
+One polling task per process tails change_log (see change_service) while at
+least one stream is open, expands each new batch into events once, and
+hands the same events to every subscriber.  Writes made by the CLI reach
+the stream the same way as the API's own writes: through the table.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import logging
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import timedelta
+from typing import Any
+
+from anyio import to_thread
+
+from app.config import settings
+from app.database import ReadSessionLocal, SessionLocal
+from app.services import change_service
+
+_PRUNE_EVERY = 60 * 60  # seconds
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    def __init__(self, maxsize: int = 256):
+        self.queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize)
+        # Set when the subscriber fell too far behind; the stream then ends
+        # and the browser reconnects with Last-Event-ID to catch up.
+        self.overflowed = False
+
+    def offer(self, event: dict[str, Any]) -> None:
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class ChangeFeed:
+    def __init__(self, session_factory=ReadSessionLocal, write_session_factory=SessionLocal):
+        self._session_factory = session_factory
+        self._write_session_factory = write_session_factory
+        self._subscribers: set[Subscription] = set()
+        self._task: asyncio.Task | None = None
+        self._cursor: int | None = None
+        self._pruned_at = 0.0
+
+    @asynccontextmanager
+    async def subscribe(self) -> AsyncIterator[Subscription]:
+        sub = Subscription()
+        self._subscribers.add(sub)
+        if self._task is None or self._task.done():
+            # A fresh context: the poller outlives this subscriber's request
+            # and must not count its queries against it (app.query_stats).
+            self._task = asyncio.create_task(self._run(), context=contextvars.Context())
+        try:
+            yield sub
+        finally:
+            self._subscribers.discard(sub)
+            if not self._subscribers:
+                await self.close()
+
+    async def close(self) -> None:
+        task, self._task = self._task, None
+        self._cursor = None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def replay(self, after_id: int) -> list[dict[str, Any]]:
+        """Events for entries after *after_id*, for a reconnecting client."""
+        with self._session_factory() as db:
+            return change_service.expand(db, change_service.changes_since(db, after_id))
+
+    def poll(self) -> list[dict[str, Any]]:
+        """Events for entries written since the previous poll.
+
+        The first poll only records where the log ends: streams start with
+        changes made after they connected.
+        """
+        with self._session_factory() as db:
+            if self._cursor is None:
+                self._cursor = change_service.latest_id(db)
+                return []
+            changes = change_service.changes_since(db, self._cursor)
+            if changes:
+                self._cursor = changes[-1].id
+                return change_service.expand(db, changes)
+        if time.monotonic() - self._pruned_at > _PRUNE_EVERY:
+            self._pruned_at = time.monotonic()
+            with self._write_session_factory() as db:
+                change_service.prune(db, timedelta(seconds=settings.change_log_retention_seconds))
+        return []
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                events = await to_thread.run_sync(self.poll)
+            except Exception:
+                logger.exception("change feed poll failed")
+                events = []
+            for event in events:
+                for sub in list(self._subscribers):
+                    sub.offer(event)
+            await asyncio.sleep(settings.change_poll_interval)
+
+
+feed = ChangeFeed()
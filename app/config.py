@@ -1,6 +1,7 @@
 """Application configuration from environment."""
 
 from pathlib import Path
+from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -16,11 +17,50 @@ class Settings(BaseSettings):
     )
 
     db_path: str = "./data/ledger.db"
+    # SQLite durability/speed trade-off; see app.database.SQLITE_PROFILES
+    # and scripts/bench_sqlite_profiles.py.
+    db_profile: Literal["durable", "balanced", "fast"] = "durable"
     api_key: str = "change-me-in-production"
     timezone: str = "Asia/Jakarta"
     dash_user: str = "admin"
     dash_pass: str = "change-me"
     secret_key: str = "ledger-secret-change-me"
+    daemon_socket: str = "./data/ledgerd.sock"
+    # Route handlers that touch the database are sync and run in the anyio
+    # worker pool; this caps how many run at once.
+    db_threads: int = 8
+    # Connections in the read-only pool used by GET routes and read tools.
+    db_read_pool_size: int = 8
+    fx_api_url: str = "https://open.er-api.com/v6/latest"
+    # Upstream tables refresh daily; cached tables older than this are refetched.
+    fx_ttl_seconds: int = 6 * 60 * 60
+    fx_timeout: float = 10.0
+    # The dashboard event stream tails change_log at this interval while
+    # anyone is connected; entries older than the retention are pruned.
+    change_poll_interval: float = 0.5
+    change_log_retention_seconds: int = 24 * 60 * 60
+    backup_dir: str = "./data/backups"
+    backup_keep: int = 7
+    # The API writes a backup this often (0 disables); `ledger backup` runs one now.
+    backup_interval_hours: float = 24.0
+    # Checkpoint/ANALYZE/incremental vacuum this often (0 disables), once the
+    # database has been idle for maintenance_idle_seconds.
+    maintenance_interval_minutes: float = 15.0
+    maintenance_idle_seconds: float = 30.0
+    maintenance_vacuum_pages: int = 4096
+    # Closed months beyond the newest archive_keep_months (current month
+    # included) move to archive_path; see app.archive.  0 hours = run only
+    # via `ledger archive`.
+    archive_path: str = "./data/archive.db"
+    archive_keep_months: int = 12
+    archive_interval_hours: float = 0.0
+    # Batched data migrations (app.data_migration): rows per transaction and
+    # the least pause between batches.
+    migration_batch_size: int = 1000
+    migration_batch_sleep: float = 0.05
+    # The daemon and CLI add their metrics here for the API's /metrics;
+    # empty disables.
+    metrics_file: str = "./data/metrics.json"
 
     @property
     def db_url(self) -> str:
@@ -28,5 +68,11 @@ class Settings(BaseSettings):
         path.parent.mkdir(parents=True, exist_ok=True)
         return f"sqlite:///{path.resolve()}"
 
+    @property
+    def db_read_url(self) -> str:
+        path = Path(self.db_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return f"sqlite:///file:{path.resolve()}?mode=ro&uri=true"
+
 
 settings = Settings()
@@ -0,0 +1,207 @@
+"""Batched, resumable data migrations.
+
+A DataMigration rewrites the rows of one table in key order, one batch at a
+time.  Each batch is its own short ``BEGIN IMMEDIATE`` transaction that also
+records the batch's last key in the ``data_migrations`` table, so an
+interrupted run resumes after the last committed batch and never applies a
+batch twice; that matters for statements that are not idempotent, such as
+shifting timestamps.  After each batch the runner pauses for at least as
+long as the batch held the write lock (and at least
+LEDGER_MIGRATION_BATCH_SLEEP), so the app's writers, waiting on
+busy_timeout, get the lock at least half the time.  Batches bump the change
+counters (app.database.bump_counters) so running processes drop cached
+results.
+
+Only rows that exist when the migration starts are rewritten: the largest
+key at that moment is stored with the progress, and batches stop there,
+also on a resumed run.  Rows the app inserts meanwhile are written by the
+new code already and must not be migrated again, so the key must grow for
+new rows: an integer primary key does; for text keys use ``rowid``.
+
+``apply`` is SQL text with ``:low`` and ``:high`` parameters, the first and
+last key of the batch (inclusive), or a function called with the connection
+and the same two keys::
+
+    SHIFT = DataMigration(
+        "transactions_to_utc", "transactions",
+        "UPDATE transactions SET effective_at = datetime(effective_at, '-7 hours') "
+        "WHERE id BETWEEN :low AND :high",
+    )
+    with engine.connect() as conn:
+        run_migration(conn, SHIFT)
+
+In an Alembic revision, run it outside the revision's transaction::
+
+    def upgrade() -> None:
+        with op.get_context().autocommit_block():
+            run_migration(op.get_bind(), SHIFT)
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import Connection, text
+
+from app.config import settings
+from app.database import bump_counters
+
+logger = logging.getLogger(__name__)
+
+# last_key has no declared type, so integer and text keys keep their type.
+_PROGRESS_DDL = """
+CREATE TABLE IF NOT EXISTS data_migrations (
+    name TEXT PRIMARY KEY,
+    last_key,
+    end_key,
+    rows_done INTEGER NOT NULL DEFAULT 0,
+    started_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    finished_at TEXT
+)
+"""
+_CHECKPOINT_SQL = (
+    "INSERT INTO data_migrations (name, last_key, rows_done, started_at, updated_at) "
+    "VALUES (?, ?, ?, datetime('now'), datetime('now')) "
+    "ON CONFLICT(name) DO UPDATE SET last_key = excluded.last_key, "
+    "rows_done = rows_done + excluded.rows_done, updated_at = excluded.updated_at"
+)
+_START_SQL = (
+    "INSERT INTO data_migrations (name, end_key, started_at, updated_at) "
+    "VALUES (?, ?, datetime('now'), datetime('now')) "
+    "ON CONFLICT(name) DO UPDATE SET end_key = excluded.end_key"
+)
+_FINISH_SQL = (
+    "INSERT INTO data_migrations (name, started_at, updated_at, finished_at) "
+    "VALUES (?, datetime('now'), datetime('now'), datetime('now')) "
+    "ON CONFLICT(name) DO UPDATE SET updated_at = excluded.updated_at, finished_at = excluded.finished_at"
+)
+
+
+class MigrationError(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True)
+class DataMigration:
+    name: str  # progress key in data_migrations; never reuse one
+    table: str
+    apply: str | Callable[[Connection, Any, Any], None]
+    key: str = "id"  # unique, sortable column that batches are cut on
+
+
+def run_migration(
+    conn: Connection,
+    migration: DataMigration,
+    batch_size: int | None = None,
+    sleep: float | None = None,
+) -> dict[str, Any]:
+    """Apply *migration* to every row not yet covered by a committed batch.
+
+    *conn* must not be inside a transaction.  Returns a summary of the run;
+    an exception from a batch rolls back that batch only.
+    """
+    batch_size = batch_size or settings.migration_batch_size
+    sleep = settings.migration_batch_sleep if sleep is None else sleep
+    raw = conn.connection.dbapi_connection
+    if raw.in_transaction:
+        raise MigrationError("run_migration needs a connection outside a transaction "
+                             "(in Alembic, inside op.get_context().autocommit_block())")
+    isolation_level = raw.isolation_level
+    raw.isolation_level = None  # explicit BEGIN/COMMIT per batch, as in atomic_session
+    try:
+        return _run(conn, migration, batch_size, sleep)
+    finally:
+        raw.isolation_level = isolation_level
+
+
+def _run(conn: Connection, migration: DataMigration, batch_size: int, sleep: float) -> dict[str, Any]:
+    conn.exec_driver_sql(_PROGRESS_DDL)
+    columns = {row[1] for row in conn.exec_driver_sql("PRAGMA table_info(data_migrations)")}
+    if "end_key" not in columns:  # created before runs were bounded
+        conn.exec_driver_sql("ALTER TABLE data_migrations ADD COLUMN end_key")
+    counted = conn.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'ledger_meta'"
+    ).first() is not None
+    progress = conn.exec_driver_sql(
+        "SELECT last_key, end_key, rows_done, finished_at FROM data_migrations WHERE name = ?",
+        (migration.name,),
+    ).first()
+    if progress is not None and progress.finished_at is not None:
+        return {"name": migration.name, "rows": 0, "total_rows": progress.rows_done, "batches": 0,
+                "finished": True, "resumed": False, "seconds": 0.0}
+
+    last_key = progress.last_key if progress is not None else None
+    end_key = progress.end_key if progress is not None else None
+    resumed = last_key is not None
+    started = time.monotonic()
+    if end_key is None:
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+        try:
+            end_key = conn.exec_driver_sql(
+                f'SELECT MAX("{migration.key}") FROM "{migration.table}"'
+            ).scalar()
+            conn.exec_driver_sql(_START_SQL, (migration.name, end_key))
+            conn.exec_driver_sql("COMMIT")
+        except BaseException:
+            conn.exec_driver_sql("ROLLBACK")
+            raise
+    rows = batches = 0
+    while True:
+        batch_started = time.monotonic()
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+        try:
+            keys = _next_keys(conn, migration, last_key, end_key, batch_size)
+            if not keys:
+                conn.exec_driver_sql(_FINISH_SQL, (migration.name,))
+                conn.exec_driver_sql("COMMIT")
+                break
+            if isinstance(migration.apply, str):
+                conn.execute(text(migration.apply), {"low": keys[0], "high": keys[-1]})
+            else:
+                migration.apply(conn, keys[0], keys[-1])
+            if counted:
+                bump_counters(conn, {migration.table})
+            conn.exec_driver_sql(_CHECKPOINT_SQL, (migration.name, keys[-1], len(keys)))
+            conn.exec_driver_sql("COMMIT")
+        except BaseException:
+            conn.exec_driver_sql("ROLLBACK")
+            raise
+        last_key = keys[-1]
+        rows += len(keys)
+        batches += 1
+        held = time.monotonic() - batch_started
+        logger.debug("data migration %s: batch %d through %s=%r in %.3fs",
+                     migration.name, batches, migration.key, last_key, held)
+        time.sleep(max(sleep, held))
+
+    seconds = round(time.monotonic() - started, 3)
+    logger.info("data migration %s: %d rows in %d batches, %.1fs%s",
+                migration.name, rows, batches, seconds, " (resumed)" if resumed else "")
+    return {
+        "name": migration.name,
+        "rows": rows,
+        "total_rows": (progress.rows_done if progress is not None else 0) + rows,
+        "batches": batches,
+        "finished": True,
+        "resumed": resumed,
+        "seconds": seconds,
+    }
+
+
+def _next_keys(
+    conn: Connection, migration: DataMigration, after: Any, through: Any, batch_size: int,
+) -> list[Any]:
+    if through is None:  # the table was empty when the run started
+        return []
+    sql = f'SELECT "{migration.key}" FROM "{migration.table}" WHERE "{migration.key}" <= ?'
+    params: tuple[Any, ...] = (through, batch_size)
+    if after is not None:
+        sql += f' AND "{migration.key}" > ?'
+        params = (through, after, batch_size)
+    sql += f' ORDER BY "{migration.key}" LIMIT ?'
+    return [row[0] for row in conn.exec_driver_sql(sql, params)]
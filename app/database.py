@@ -1,38 +1,310 @@
 """Database engine, session factory, and base model."""
 
-from collections.abc import Generator
+import os
+from collections.abc import Generator, Iterable, Iterator
+from contextlib import contextmanager
+from itertools import chain
 
-from sqlalchemy import create_engine, event
-from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
+from sqlalchemy import Connection, Engine, create_engine, event
+from sqlalchemy.orm import DeclarativeBase, ORMExecuteState, Session, sessionmaker
 
+from app import metrics, query_stats
 from app.config import settings
 
+# Writes go through a single pooled connection: SQLite allows one writer at
+# a time anyway, and queueing in the pool avoids two connections that both
+# started reading racing to upgrade to a write lock (SQLITE_BUSY without
+# waiting).  GET routes, dashboard pages and read-only CLI tools use
+# read_engine instead, so reporting scans never hold or wait for that slot.
 engine = create_engine(
     settings.db_url,
     connect_args={"check_same_thread": False},
+    pool_size=1,
+    max_overflow=0,
     echo=False,
 )
 
+read_engine = create_engine(
+    settings.db_read_url,
+    connect_args={"check_same_thread": False, "uri": True},
+    pool_size=settings.db_read_pool_size,
+    max_overflow=0,
+    echo=False,
+)
 
-@event.listens_for(engine, "connect")
-def _set_sqlite_pragmas(dbapi_conn, _connection_record):
+
+# Per-connection tuning, selected by LEDGER_DB_PROFILE.  Only `durable`
+# keeps every commit on disk across power loss; `balanced` (synchronous=NORMAL
+# in WAL mode) may lose the last commits but never corrupts the file; `fast`
+# can corrupt it on power loss or OS crash.  Sizes are in bytes except
+# cache_size, which SQLite reads as KiB when negative.
+SQLITE_PROFILES: dict[str, dict[str, int | str]] = {
+    "durable": {
+        "synchronous": "FULL",
+        "cache_size": -16 * 1024,
+        "mmap_size": 0,
+        "temp_store": "MEMORY",
+        "wal_autocheckpoint": 1000,
+        "journal_size_limit": 64 * 1024 * 1024,
+    },
+    "balanced": {
+        "synchronous": "NORMAL",
+        "cache_size": -64 * 1024,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "wal_autocheckpoint": 1000,
+        "journal_size_limit": 64 * 1024 * 1024,
+    },
+    "fast": {
+        "synchronous": "OFF",
+        "cache_size": -256 * 1024,
+        "mmap_size": 1024 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "wal_autocheckpoint": 10000,
+        "journal_size_limit": 256 * 1024 * 1024,
+    },
+}
+
+
+def configure_sqlite(dbapi_conn, profile: str, read_only: bool = False) -> None:
+    """Apply the connection pragmas shared by every profile, then *profile*'s.
+
+    Read-only connections cannot switch the journal mode (the write engine
+    already did) and get query_only as a second guard next to mode=ro.
+    """
     cursor = dbapi_conn.cursor()
-    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA query_only=ON" if read_only else "PRAGMA journal_mode=WAL")
     cursor.execute("PRAGMA foreign_keys=ON")
     cursor.execute("PRAGMA busy_timeout=5000")
+    for pragma, value in SQLITE_PROFILES[profile].items():
+        cursor.execute(f"PRAGMA {pragma}={value}")
     cursor.close()
 
 
+def attach_archive(dbapi_conn, path: str, read_only: bool = False) -> None:
+    """ATTACH the archive database (see app.archive) as ``archive`` if it exists."""
+    if os.path.exists(path):
+        cursor = dbapi_conn.cursor()
+        cursor.execute("ATTACH DATABASE ? AS archive", (f"file:{path}?mode=ro" if read_only else path,))
+        cursor.close()
+
+
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_conn, _connection_record):
+    configure_sqlite(dbapi_conn, settings.db_profile)
+    attach_archive(dbapi_conn, settings.archive_path)
+
+
+@event.listens_for(read_engine, "connect")
+def _set_read_pragmas(dbapi_conn, _connection_record):
+    configure_sqlite(dbapi_conn, settings.db_profile, read_only=True)
+    attach_archive(dbapi_conn, settings.archive_path, read_only=True)
+
+
+# Query count and time per request / CLI tool call, for every engine
+# including the throwaway ones tests and scripts create.
+event.listen(Engine, "before_cursor_execute", query_stats.before_cursor_execute)
+event.listen(Engine, "after_cursor_execute", query_stats.after_cursor_execute)
+
+
+@event.listens_for(Engine, "handle_error")
+def _count_busy(context) -> None:
+    # SQLite retries a locked database internally for busy_timeout; only the
+    # statements that still failed are visible here.
+    if "database is locked" in str(context.original_exception) or "database is busy" in str(
+        context.original_exception
+    ):
+        metrics.inc("ledger_db_busy_total")
+
+
 SessionLocal = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+ReadSessionLocal = sessionmaker(bind=read_engine, autoflush=False, expire_on_commit=False)
+
+
+def database_key(db: Session) -> Engine:
+    """Identify the database *db* reads, for keying in-memory caches.
+
+    Read-only sessions map to the write engine, so both see one cache.
+    """
+    bound = db.get_bind().engine
+    return engine if bound is read_engine else bound
 
 
 class Base(DeclarativeBase):
     pass
 
 
+# ── Change counters ───────────────────────────────────────────────────────────
+# ledger_meta holds counters that are bumped inside the transaction that
+# writes the data they describe, so every process sharing the database file
+# (API container, host CLI and daemon) sees them change atomically with the
+# data.  Caches key their entries on a counter value, which makes them
+# coherent across processes without any messaging between them.
+#
+# Every ORM write bumps them: unit-of-work flushes and bulk insert/update/
+# delete statements run through Session.execute.  Raw SQL writes to ledger
+# tables must call bump_counters() themselves.
+
+DATA_VERSION = "data_version"  # bumped by every write
+DATA_MODIFIED_AT = "data_modified_at"  # unix time of the last write
+REFERENCE_VERSION = "reference_version"  # bumped by writes to REFERENCE_TABLES
+REFERENCE_TABLES = frozenset({"users", "accounts", "categories"})
+
+_BUMP_COUNTER_SQL = (
+    "INSERT INTO ledger_meta (key, value) VALUES (?, 1) "
+    "ON CONFLICT(key) DO UPDATE SET value = value + 1"
+)
+_STAMP_MODIFIED_SQL = (
+    "INSERT INTO ledger_meta (key, value) VALUES (?, CAST(strftime('%s', 'now') AS INTEGER)) "
+    "ON CONFLICT(key) DO UPDATE SET value = excluded.value"
+)
+
+
+# Bookkeeping tables whose writes change no cached result.
+_UNCOUNTED_TABLES = frozenset({"change_log", "ledger_meta"})
+# Key in a DBAPI connection's info dict: (PRAGMA data_version, counters).
+_COUNTERS_MEMO = "ledger_counters"
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_after_flush(session: Session, _flush_context) -> None:
+    _bump_change_counters(
+        session, {obj.__table__.name for obj in chain(session.new, session.dirty, session.deleted)},
+    )
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _bump_for_bulk_write(state: ORMExecuteState) -> None:
+    if state.is_insert or state.is_update or state.is_delete:
+        _bump_change_counters(state.session, {m.local_table.name for m in state.all_mappers})
+
+
+def _bump_change_counters(session: Session, tables: set[str]) -> None:
+    if not tables:
+        return
+    session.info["uncommitted_counters"] = True
+    bump_counters(session.connection(), tables)
+
+
+def bump_counters(conn: Connection, tables: Iterable[str]) -> None:
+    """Bump the counters for a write to *tables* in *conn*'s open transaction.
+
+    ORM writes call this through the session events; raw SQL writes to
+    ledger tables call it themselves.
+    """
+    conn.info.pop(_COUNTERS_MEMO, None)
+    tables = set(tables) - _UNCOUNTED_TABLES
+    if not tables:
+        return
+    conn.exec_driver_sql(_BUMP_COUNTER_SQL, (DATA_VERSION,))
+    conn.exec_driver_sql(_STAMP_MODIFIED_SQL, (DATA_MODIFIED_AT,))
+    if tables & REFERENCE_TABLES:
+        conn.exec_driver_sql(_BUMP_COUNTER_SQL, (REFERENCE_VERSION,))
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_soft_rollback")
+def _clear_uncommitted_counters(session: Session, *_args) -> None:
+    # A session bound to a caller's Connection (atomic_session) only releases
+    # or rolls back a SAVEPOINT here; its bumps stay uncommitted until the
+    # caller ends the outer transaction.
+    if isinstance(session.bind, Connection):
+        return
+    session.info.pop("uncommitted_counters", None)
+
+
+def has_uncommitted_counters(db: Session) -> bool:
+    """True while *db* holds flushed but uncommitted counter bumps.
+
+    Anything read in that window may still be rolled back, so it must not
+    be cached under the bumped counter value.
+    """
+    return bool(db.info.get("uncommitted_counters"))
+
+
+def change_counters(db: Session) -> dict[str, int]:
+    """All ledger_meta counters as *db* currently sees them.
+
+    The values are remembered per connection next to SQLite's
+    ``PRAGMA data_version``, which changes whenever another connection (in
+    this process or another) commits.  While it is unchanged the remembered
+    values are returned without touching ledger_meta; this connection's own
+    writes drop them in _bump_change_counters.  Counters flushed but not yet
+    committed are read fresh and never remembered.
+    """
+    conn = db.connection()
+    if has_uncommitted_counters(db):
+        return dict(conn.exec_driver_sql("SELECT key, value FROM ledger_meta").all())
+    data_version = conn.exec_driver_sql("PRAGMA data_version").scalar()
+    memo = conn.info.get(_COUNTERS_MEMO)
+    if memo is not None and memo[0] == data_version:
+        return memo[1]
+    counters = dict(conn.exec_driver_sql("SELECT key, value FROM ledger_meta").all())
+    conn.info[_COUNTERS_MEMO] = (data_version, counters)
+    return counters
+
+
+def read_counter(db: Session, key: str) -> int:
+    return change_counters(db).get(key, 0)
+
+
+def read_counters(db: Session, *keys: str) -> dict[str, int]:
+    """Read several counters at once; missing ones read as 0."""
+    counters = change_counters(db)
+    return {key: counters.get(key, 0) for key in keys}
+
+
 def get_db() -> Generator[Session, None, None]:
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+def get_read_db() -> Generator[Session, None, None]:
+    """Session on the read-only engine, for routes that never write."""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@contextmanager
+def atomic_session(bind: Engine | None = None) -> Iterator[Session]:
+    """Session whose work commits or rolls back as one transaction.
+
+    Service functions call ``db.commit()`` themselves; here those commits only
+    release a SAVEPOINT inside an outer ``BEGIN IMMEDIATE`` that is committed
+    when the block exits cleanly and rolled back if it raises.  pysqlite's
+    implicit transaction handling does not mix with SAVEPOINT, so the
+    connection is switched to manual transaction control for the duration.
+    """
+    with (bind or engine).connect() as conn:
+        raw = conn.connection.dbapi_connection
+        raw.isolation_level = None
+        session = Session(
+            bind=conn,
+            join_transaction_mode="create_savepoint",
+            autoflush=False,
+            expire_on_commit=False,
+            info={"atomic": True},
+        )
+        try:
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+            yield session
+            session.flush()
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            conn.info.pop(_COUNTERS_MEMO, None)
+            raise
+        finally:
+            session.close()
+            raw.isolation_level = ""
+
+
+def in_atomic_session(db: Session) -> bool:
+    """True when *db* comes from ``atomic_session`` and so holds the write lock."""
+    return bool(db.info.get("atomic"))
@@ -2,11 +2,18 @@
 
 from __future__ import annotations
 
-from fastapi import HTTPException, Request
-from fastapi.responses import JSONResponse
+from typing import TYPE_CHECKING
+
+# Starlette's HTTPException (the base of FastAPI's) keeps the service layer
+# importable from the CLI without pulling in FastAPI itself.
+from starlette.exceptions import HTTPException
 
 from app.schemas import ErrorDetail
 
+if TYPE_CHECKING:
+    from fastapi import Request
+    from fastapi.responses import JSONResponse
+
 
 class NeedsClarificationError(Exception):
     def __init__(self, message: str, details: list[ErrorDetail]):
@@ -24,6 +31,8 @@ class LedgerHTTPException(HTTPException):
 
 
 def needs_clarification_handler(_request: Request, exc: NeedsClarificationError) -> JSONResponse:
+    from fastapi.responses import JSONResponse
+
     return JSONResponse(
         status_code=422,
         content={
@@ -37,6 +46,8 @@ def needs_clarification_handler(_request: Request, exc: NeedsClarificationError)
 
 
 def ledger_http_handler(_request: Request, exc: LedgerHTTPException) -> JSONResponse:
+    from fastapi.responses import JSONResponse
+
     return JSONResponse(
         status_code=exc.status_code,
         content={
@@ -1,34 +1,66 @@
 """FastAPI application entry point."""
 
+import asyncio
+import logging
 from contextlib import asynccontextmanager
+from functools import partial
 
+from anyio import to_thread
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import ValidationError
 
-from app.database import Base, engine
+from app import archive, backup, maintenance
+from app.change_feed import feed
+from app.config import settings
 from app.errors import (
     LedgerHTTPException,
     NeedsClarificationError,
     ledger_http_handler,
     needs_clarification_handler,
 )
-from app.routers import accounts, budgets, convert, health, meta, summary, transactions
+from app.query_stats import QueryStatsMiddleware
+from app.routers import accounts, batch, budgets, convert, health, meta, metrics, summary, transactions
 from app.routers.dashboard import router as dashboard_router
-from app.seed import seed_defaults
+from app.scheduler import run_every
+from app.seed import ensure_database
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    Base.metadata.create_all(bind=engine)
-    from app.database import SessionLocal
-    db = SessionLocal()
-    try:
-        seed_defaults(db)
-    finally:
-        db.close()
+    # Database work runs in sync handlers on the worker pool so a slow
+    # summary never blocks the event loop serving /health and the login page.
+    to_thread.current_default_thread_limiter().total_tokens = settings.db_threads
+    ensure_database()
+    if not logging.getLogger().handlers:
+        logging.basicConfig(format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+        logging.getLogger("app").setLevel(logging.INFO)
+
+    jobs = []
+    if settings.backup_interval_hours > 0:
+        interval = settings.backup_interval_hours * 60 * 60
+        jobs.append(asyncio.create_task(run_every(
+            "backup", interval, backup.backup_database,
+            initial_delay=backup.seconds_until_due(interval),
+        )))
+    if settings.maintenance_interval_minutes > 0:
+        interval = settings.maintenance_interval_minutes * 60
+        jobs.append(asyncio.create_task(run_every(
+            "maintenance", interval,
+            partial(maintenance.run_maintenance, idle_seconds=settings.maintenance_idle_seconds),
+            initial_delay=interval,
+        )))
+    if settings.archive_interval_hours > 0:
+        interval = settings.archive_interval_hours * 60 * 60
+        jobs.append(asyncio.create_task(run_every(
+            "archive", interval, archive.run_archive, initial_delay=interval,
+        )))
     yield
+    for job in jobs:
+        job.cancel()
+    await asyncio.gather(*jobs, return_exceptions=True)
+    await feed.close()
 
 
 app = FastAPI(
@@ -37,6 +69,7 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+app.add_middleware(QueryStatsMiddleware)
 app.add_exception_handler(NeedsClarificationError, needs_clarification_handler)
 app.add_exception_handler(LedgerHTTPException, ledger_http_handler)
 
@@ -60,10 +93,12 @@ async def pydantic_validation_handler(_request: Request, exc: ValidationError):
 
 
 app.include_router(health.router)
+app.include_router(metrics.router)
 app.include_router(meta.router)
 app.include_router(transactions.router)
 app.include_router(budgets.router)
 app.include_router(accounts.router)
 app.include_router(summary.router)
 app.include_router(convert.router)
+app.include_router(batch.router)
 app.include_router(dashboard_router)
@@ -0,0 +1,153 @@
+"""Database upkeep: planner statistics, incremental vacuum, WAL checkpoint.
+
+Tasks run in this order on their own autocommit connection:
+
+``optimize``
+    Refreshes the statistics the query planner uses to pick indexes.
+``vacuum``
+    Returns up to LEDGER_MAINTENANCE_VACUUM_PAGES free pages (left behind
+    by deleted rows) to the filesystem.  Needs ``auto_vacuum=INCREMENTAL``,
+    which new databases get from seed.ensure_database; an older file is
+    converted once with the ``full_vacuum`` task, which rewrites the whole
+    database and blocks writers while it runs.
+``checkpoint``
+    Copies the WAL back into the database and truncates it to zero bytes.
+    Runs last so the pages the other tasks wrote are included.
+
+The scheduled run in the API process only starts once nothing has written to
+the database for LEDGER_MAINTENANCE_IDLE_SECONDS, judged by file mtimes so
+CLI writes count too.  Each task logs its duration and the bytes it
+reclaimed from the database and WAL files.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any
+
+from app.config import settings
+
+TASKS = ("optimize", "vacuum", "checkpoint")
+
+# Rows ANALYZE samples per index; keeps a statistics refresh to milliseconds.
+_ANALYSIS_LIMIT = 1000
+# Maintenance gives way to the app: a lock it cannot get quickly fails the
+# task, which is retried at the next run.
+_BUSY_TIMEOUT = 2.0
+
+logger = logging.getLogger(__name__)
+
+
+class MaintenanceError(RuntimeError):
+    pass
+
+
+def run_maintenance(
+    tasks: list[str] | tuple[str, ...] = TASKS,
+    db_path: str | os.PathLike | None = None,
+    idle_seconds: float = 0.0,
+    vacuum_pages: int | None = None,
+) -> dict[str, Any]:
+    """Run *tasks* against *db_path* and return what each one did.
+
+    With *idle_seconds*, nothing runs unless the database has gone that long
+    without a write.
+    """
+    path = Path(db_path or settings.db_path)
+    vacuum_pages = vacuum_pages or settings.maintenance_vacuum_pages
+    unknown = [name for name in tasks if name not in _TASK_FUNCS]
+    if unknown:
+        raise MaintenanceError(f"Unknown maintenance task(s): {', '.join(unknown)}. "
+                               f"Available: {', '.join(_TASK_FUNCS)}")
+    if not path.exists():
+        raise MaintenanceError(f"Database not found: {path}")
+    quiet = time.time() - _last_write(path)
+    if quiet < idle_seconds:
+        return {"skipped": f"last write {quiet:.0f}s ago"}
+
+    results = []
+    conn = sqlite3.connect(path, timeout=_BUSY_TIMEOUT, isolation_level=None)
+    try:
+        for name in tasks:
+            results.append(_run(name, conn, path, vacuum_pages))
+    finally:
+        conn.close()
+    return {"tasks": results, "reclaimed_bytes": sum(r["reclaimed_bytes"] for r in results)}
+
+
+def _run(name: str, conn: sqlite3.Connection, path: Path, vacuum_pages: int) -> dict[str, Any]:
+    size_before = _size(path)
+    started = time.monotonic()
+    try:
+        details = _TASK_FUNCS[name](conn, vacuum_pages)
+    except sqlite3.OperationalError as exc:
+        details = {"error": str(exc)}
+    result = {
+        "task": name,
+        "seconds": round(time.monotonic() - started, 3),
+        "reclaimed_bytes": size_before - _size(path),
+        **details,
+    }
+    logger.info("%s took %.3fs and reclaimed %d bytes: %s",
+                name, result["seconds"], result["reclaimed_bytes"], details)
+    return result
+
+
+def _optimize(conn: sqlite3.Connection, _vacuum_pages: int) -> dict[str, Any]:
+    conn.execute(f"PRAGMA analysis_limit={_ANALYSIS_LIMIT}")
+    has_stats = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone()
+    # Before SQLite 3.46, PRAGMA optimize only considers tables this
+    # connection has queried, which on a fresh connection is none.
+    if has_stats and sqlite3.sqlite_version_info >= (3, 46):
+        conn.execute("PRAGMA optimize=0x10002")
+        return {"analyzed": "stale"}
+    conn.execute("ANALYZE")
+    return {"analyzed": "all"}
+
+
+def _vacuum(conn: sqlite3.Connection, vacuum_pages: int) -> dict[str, Any]:
+    free_before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+        return {"freed_pages": 0, "free_pages": free_before,
+                "note": "auto_vacuum is not incremental; run the full_vacuum task once"}
+    # The pragma frees one page per step and execute() stops after the
+    # first; executescript() steps it to completion.
+    conn.executescript(f"PRAGMA incremental_vacuum({vacuum_pages});")
+    free_after = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    return {"freed_pages": free_before - free_after, "free_pages": free_after}
+
+
+def _full_vacuum(conn: sqlite3.Connection, _vacuum_pages: int) -> dict[str, Any]:
+    conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    conn.execute("VACUUM")
+    return {"auto_vacuum": "incremental"}
+
+
+def _checkpoint(conn: sqlite3.Connection, _vacuum_pages: int) -> dict[str, Any]:
+    # busy means a reader or writer kept the WAL from being reset this time.
+    busy = conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()[0]
+    return {"busy": bool(busy)}
+
+
+_TASK_FUNCS = {
+    "optimize": _optimize,
+    "vacuum": _vacuum,
+    "full_vacuum": _full_vacuum,
+    "checkpoint": _checkpoint,
+}
+
+
+def _files(path: Path) -> list[Path]:
+    return [path, path.with_name(path.name + "-wal")]
+
+
+def _size(path: Path) -> int:
+    return sum(p.stat().st_size for p in _files(path) if p.exists())
+
+
+def _last_write(path: Path) -> float:
+    return max(p.stat().st_mtime for p in _files(path) if p.exists())
@@ -0,0 +1,227 @@
+"""Prometheus metrics: latencies, query counts, cache hit rates, file sizes.
+
+Counters and histograms live in a small in-process registry rather than
+prometheus_client: the CLI records into it on every cold start, where that
+import would not fit the start-up budget (tests/test_startup.py), and the
+text exposition format is a few lines to write.
+
+The API process renders its own samples at GET /metrics with
+``source="api"``.  The daemon and cold CLI calls are separate processes, so
+after each tool call they push() what they recorded to LEDGER_METRICS_FILE,
+adding it to the totals already there under an exclusive lock; /metrics
+renders those totals with ``source="cli"``, which makes bot-path latency
+visible next to the API's.  Gauges (database and WAL file sizes) are read
+at scrape time.
+
+Standard library only.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Seconds; the Prometheus client's defaults.
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+METRICS: dict[str, tuple[str, str]] = {
+    "ledger_http_request_seconds": ("histogram", "HTTP request latency by method and route template."),
+    "ledger_tool_seconds": ("histogram", "CLI and daemon tool call latency."),
+    "ledger_service_seconds": ("histogram", "Service function latency, cache hits included."),
+    "ledger_db_queries_total": ("counter", "SQL statements run by HTTP requests and tool calls."),
+    "ledger_db_query_seconds_total": ("counter", "Time spent in those statements."),
+    "ledger_db_busy_total": ("counter", "Statements that failed because the database stayed locked "
+                                        "past busy_timeout."),
+    "ledger_cache_requests_total": ("counter", "Cache lookups by cache and result."),
+    "ledger_fx_fetch_seconds": ("histogram", "Upstream exchange-rate fetch latency by outcome."),
+}
+
+_Key = tuple[str, tuple[tuple[str, str], ...]]
+
+_lock = threading.Lock()
+_counters: dict[_Key, float] = {}
+# Per-bucket (not cumulative) counts, the +Inf bucket, then the sum.
+_histograms: dict[_Key, list[float]] = {}
+
+
+def _key(name: str, labels: dict[str, Any]) -> _Key:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def inc(name: str, amount: float = 1.0, **labels: Any) -> None:
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0.0) + amount
+
+
+def observe(name: str, value: float, **labels: Any) -> None:
+    key = _key(name, labels)
+    with _lock:
+        values = _histograms.get(key)
+        if values is None:
+            values = _histograms[key] = [0.0] * (len(BUCKETS) + 2)
+        values[bisect_left(BUCKETS, value)] += 1
+        values[-1] += value
+
+
+@contextmanager
+def timer(name: str, **labels: Any) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - started, **labels)
+
+
+def timed(fn: Callable[..., T]) -> Callable[..., T]:
+    """Record *fn*'s latency as ledger_service_seconds{function=<name>}."""
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> T:
+        with timer("ledger_service_seconds", function=fn.__name__):
+            return fn(*args, **kwargs)
+
+    return wrapper
+
+
+def cache_result(cache: str, result: str) -> None:
+    inc("ledger_cache_requests_total", cache=cache, result=result)
+
+
+# ── Push (daemon and CLI) ─────────────────────────────────────────────────────
+
+
+def _take() -> dict[str, list]:
+    """This process's samples since the last call, as JSON-ready lists."""
+    global _counters, _histograms
+    with _lock:
+        counters, histograms = _counters, _histograms
+        _counters, _histograms = {}, {}
+    return {
+        "counters": [[name, dict(labels), value] for (name, labels), value in counters.items()],
+        "histograms": [[name, dict(labels), values] for (name, labels), values in histograms.items()],
+    }
+
+
+def pending() -> bool:
+    return bool(_counters or _histograms)
+
+
+def push(path: str) -> None:
+    """Add this process's samples to the totals in *path* and clear them here."""
+    samples = _take()
+    if not samples["counters"] and not samples["histograms"]:
+        return
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(f"{path}.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        counters, histograms = _load(path)
+        for name, labels, value in samples["counters"]:
+            key = _key(name, labels)
+            counters[key] = counters.get(key, 0.0) + value
+        for name, labels, values in samples["histograms"]:
+            key = _key(name, labels)
+            totals = histograms.get(key)
+            histograms[key] = values if totals is None else [a + b for a, b in zip(totals, values)]
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as out:
+            json.dump({
+                "counters": [[name, dict(labels), value] for (name, labels), value in counters.items()],
+                "histograms": [[name, dict(labels), values] for (name, labels), values in histograms.items()],
+            }, out)
+        os.replace(tmp, path)
+
+
+def _load(path: str) -> tuple[dict[_Key, float], dict[_Key, list[float]]]:
+    try:
+        with open(path) as f:
+            data = json.load(f)
+        counters = {_key(name, labels): value for name, labels, value in data["counters"]}
+        histograms = {
+            _key(name, labels): values for name, labels, values in data["histograms"]
+            if len(values) == len(BUCKETS) + 2
+        }
+    except FileNotFoundError:
+        return {}, {}
+    except (OSError, ValueError, KeyError, TypeError) as exc:
+        logger.warning("Ignoring unreadable metrics file %s: %s", path, exc)
+        return {}, {}
+    return counters, histograms
+
+
+# ── Exposition ────────────────────────────────────────────────────────────────
+
+
+def render(pushed_path: str | None = None, files: dict[str, str] | None = None) -> str:
+    """The Prometheus text format for this process, *pushed_path* and *files*.
+
+    *files* maps a label to a path whose size is reported as
+    ledger_db_file_bytes; missing files are skipped.
+    """
+    with _lock:
+        counters = {key + ("api",): value for key, value in _counters.items()}
+        histograms = {key + ("api",): list(values) for key, values in _histograms.items()}
+    if pushed_path:
+        pushed_counters, pushed_histograms = _load(pushed_path)
+        counters.update({key + ("cli",): value for key, value in pushed_counters.items()})
+        histograms.update({key + ("cli",): values for key, values in pushed_histograms.items()})
+
+    lines: list[str] = []
+    for name, (kind, help_text) in METRICS.items():
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+        if kind == "counter":
+            for (_name, labels, source), value in sorted(counters.items()):
+                if _name == name:
+                    lines.append(f"{name}{_labels(labels, source)} {_number(value)}")
+            continue
+        for (_name, labels, source), values in sorted(histograms.items()):
+            if _name != name:
+                continue
+            cumulative = 0.0
+            for bound, count in zip((*BUCKETS, "+Inf"), values):
+                cumulative += count
+                lines.append(f"{name}_bucket{_labels(labels, source, le=bound)} {_number(cumulative)}")
+            lines.append(f"{name}_sum{_labels(labels, source)} {_number(values[-1])}")
+            lines.append(f"{name}_count{_labels(labels, source)} {_number(cumulative)}")
+
+    lines += ["# HELP ledger_db_file_bytes Size of the database files.", "# TYPE ledger_db_file_bytes gauge"]
+    for label, path in (files or {}).items():
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            continue
+        lines.append(f'ledger_db_file_bytes{{file="{_escape(label)}"}} {size}')
+    return "\n".join(lines) + "\n"
+
+
+def _labels(labels: tuple[tuple[str, str], ...], source: str, le: float | str | None = None) -> str:
+    pairs = [*labels, ("source", source)]
+    if le is not None:
+        pairs.append(("le", str(le)))
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def reset() -> None:
+    """Drop this process's samples (tests)."""
+    _take()
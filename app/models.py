@@ -4,7 +4,9 @@ from datetime import datetime
 
 from sqlalchemy import (
     Column,
+    Date,
     DateTime,
+    Float,
     ForeignKey,
     Integer,
     String,
@@ -76,6 +78,10 @@ class Transaction(Base):
     transaction_type = Column(String, nullable=False)
     amount = Column(Integer, nullable=False)
     currency = Column(String, default="IDR", nullable=False)
+    # Set when the amount was converted from a foreign currency.
+    original_amount = Column(Float, nullable=True)
+    original_currency = Column(String, nullable=True)
+    fx_rate = Column(Float, nullable=True)  # original_currency -> currency
     category_id = Column(String, ForeignKey("categories.id"), nullable=True)
     description = Column(Text, nullable=True)
     merchant = Column(String, nullable=True)
@@ -119,3 +125,57 @@ class CategoryRule(Base):
     is_active = Column(Integer, default=1, nullable=False)
 
     category = relationship("Category")
+
+
+class FxRateTable(Base):
+    __tablename__ = "fx_rate_tables"
+
+    base = Column(String, primary_key=True)
+    rates_json = Column(Text, nullable=False)  # {"IDR": 10512.3, ...}
+    fetched_at = Column(DateTime, nullable=False)  # UTC
+
+
+class FxRate(Base):
+    __tablename__ = "fx_rates"
+
+    base = Column(String, primary_key=True)
+    quote = Column(String, primary_key=True)
+    date = Column(Date, primary_key=True)  # upstream's rate date (UTC)
+    rate = Column(Float, nullable=False)
+
+
+class LedgerMeta(Base):
+    __tablename__ = "ledger_meta"
+
+    key = Column(String, primary_key=True)
+    value = Column(Integer, default=0, nullable=False)
+
+
+class ChangeLog(Base):
+    __tablename__ = "change_log"
+    # Ids must never be reused after pruning: stream clients resume from them.
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    created_at = Column(DateTime, default=func.now(), nullable=False)
+    kind = Column(String, nullable=False)  # transaction.created, transaction.voided, ...
+    payload_json = Column(Text, nullable=False)
+
+
+class ArchivedMovement(Base):
+    """Balance contribution of transactions moved to the archive database.
+
+    Rows have the shape of account_service's grouped movements and are added
+    in the same transaction that deletes the archived rows, so balances stay
+    exact without reading the archive.
+    """
+
+    __tablename__ = "archived_movements"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    account_id = Column(String, ForeignKey("accounts.id"), nullable=False)
+    currency = Column(String, nullable=False)
+    original_currency = Column(String, nullable=True)
+    amount = Column(Integer, nullable=False)  # signed, in currency
+    original = Column(Float, nullable=False)  # signed, in original_currency
+    archived_at = Column(DateTime, nullable=False)
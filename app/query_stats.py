@@ -0,0 +1,162 @@
+"""Per-request SQL query count and latency.
+
+track() opens a scope (an HTTP request or one CLI tool call) in a context
+variable.  app.database registers before_cursor_execute/after_cursor_execute
+on every Engine; while a scope is open they add each statement's count and
+time to it, and remember the slowest statement.  Sync endpoints run on
+worker threads with a copy of the request's context, so their queries land
+in the request's scope.  Queries run on behalf of another scope, such as a
+summary computed once for several coalesced callers (app.services.
+singleflight), count toward the scope that ran them.
+
+QueryStatsMiddleware reports the scope as a ``Server-Timing`` header (read by
+browser dev tools), records it in app.metrics and, once the response has
+been sent, logs it as one logfmt line on the ``app.requests`` logger::
+
+    method=GET path=/v1/budgets/status status=200 duration_ms=41.2 db_queries=5
+    db_ms=12.3 db_slowest_ms=4.1 db_slowest="SELECT ..."
+
+(one line in the log; wrapped here).
+
+Standard library only, so the CLI can use it without paying for imports.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from app import metrics
+
+logger = logging.getLogger("app.requests")
+
+_SLOWEST_CHARS = 200
+
+
+class QueryStats:
+    __slots__ = ("queries", "db_seconds", "slowest_seconds", "slowest_statement")
+
+    def __init__(self) -> None:
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_statement = ""
+
+    def add(self, statement: str, seconds: float) -> None:
+        self.queries += 1
+        self.db_seconds += seconds
+        if seconds >= self.slowest_seconds:
+            self.slowest_seconds = seconds
+            self.slowest_statement = statement
+
+    def fields(self) -> dict[str, Any]:
+        fields: dict[str, Any] = {
+            "db_queries": self.queries,
+            "db_ms": round(self.db_seconds * 1000, 1),
+        }
+        if self.queries:
+            fields["db_slowest_ms"] = round(self.slowest_seconds * 1000, 1)
+            fields["db_slowest"] = " ".join(self.slowest_statement.split())[:_SLOWEST_CHARS]
+        return fields
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def track() -> Iterator[QueryStats]:
+    """Attribute queries run in this context to a new QueryStats."""
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def current() -> QueryStats | None:
+    return _current.get()
+
+
+def before_cursor_execute(_conn, _cursor, _statement, _parameters, context, _executemany) -> None:
+    if context is not None and _current.get() is not None:
+        context._query_started = time.perf_counter()
+
+
+def after_cursor_execute(_conn, _cursor, statement, _parameters, context, _executemany) -> None:
+    started = getattr(context, "_query_started", None)
+    stats = _current.get()
+    if started is not None and stats is not None:
+        stats.add(statement, time.perf_counter() - started)
+
+
+def record(stats: QueryStats) -> None:
+    """Add *stats* to the query counters in app.metrics."""
+    if stats.queries:
+        metrics.inc("ledger_db_queries_total", stats.queries)
+        metrics.inc("ledger_db_query_seconds_total", stats.db_seconds)
+
+
+def server_timing(stats: QueryStats, total_seconds: float) -> str:
+    parts = [f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.queries} queries"']
+    if stats.queries:
+        parts.append(f"db-slowest;dur={stats.slowest_seconds * 1000:.1f}")
+    parts.append(f"total;dur={total_seconds * 1000:.1f}")
+    return ", ".join(parts)
+
+
+def log(stats: QueryStats, total_seconds: float, **fields: Any) -> None:
+    """Log one logfmt line: *fields*, the duration, then the query fields."""
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    fields["duration_ms"] = round(total_seconds * 1000, 1)
+    fields.update(stats.fields())
+    logger.info(" ".join(f"{key}={_logfmt(value)}" for key, value in fields.items()))
+
+
+def _logfmt(value: Any) -> str:
+    text = str(value)
+    if not text or any(c in text for c in ' "=\\') or not text.isprintable():
+        return json.dumps(text, ensure_ascii=False)
+    return text
+
+
+class QueryStatsMiddleware:
+    """ASGI middleware: Server-Timing header, metrics and a log line per HTTP request."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+        with track() as stats:
+
+            async def send_with_timing(message) -> None:
+                nonlocal status
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                    timing = server_timing(stats, time.perf_counter() - started)
+                    message = {**message, "headers": [*message.get("headers", []),
+                                                      (b"server-timing", timing.encode("latin-1"))]}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                elapsed = time.perf_counter() - started
+                # The router stores the matched route in the scope; its path
+                # template keeps one series per route, not per URL.
+                route = getattr(scope.get("route"), "path", "unmatched")
+                metrics.observe("ledger_http_request_seconds", elapsed, method=scope["method"], route=route)
+                record(stats)
+                log(stats, elapsed, method=scope["method"], path=scope["path"], status=status)
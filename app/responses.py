@@ -0,0 +1,65 @@
+"""Response classes and conditional-GET helpers for the REST API."""
+
+import hashlib
+from email.utils import formatdate
+from typing import Any
+
+from fastapi.responses import JSONResponse, Response
+from sqlalchemy.orm import Session
+
+from app import serialization
+from app.database import DATA_MODIFIED_AT, DATA_VERSION, read_counters
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered by app.serialization.dumps.
+
+    Routes that return one of these skip FastAPI's response_model
+    re-validation and jsonable_encoder pass; the response_model stays on the
+    route for the OpenAPI schema.  Uses orjson when installed and
+    pydantic-core otherwise.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return serialization.dumps(content)
+
+
+def etag_for(version: str) -> str:
+    """Weak validator for *version*.
+
+    Weak because bodies also carry server_time and similar volatile fields;
+    the tag tracks the data they are built from.
+    """
+    return f'W/"{version}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against *etag*."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def not_modified(headers: dict[str, str]) -> Response:
+    return Response(status_code=304, headers=headers)
+
+
+def data_validators(db: Session, *scope: object) -> dict[str, str]:
+    """ETag/Last-Modified headers for a response built from the ledger as of now.
+
+    The tag is the global data version, so any write anywhere changes it.
+    *scope* adds inputs the URL does not carry, e.g. a month that defaulted
+    to the current one.  Cheap enough to check before any aggregation runs.
+    """
+    counters = read_counters(db, DATA_VERSION, DATA_MODIFIED_AT)
+    version = str(counters[DATA_VERSION])
+    if scope:
+        digest = hashlib.sha256("|".join(map(str, scope)).encode()).hexdigest()[:8]
+        version = f"{version}-{digest}"
+    headers = {"ETag": etag_for(version), "Cache-Control": "private, no-cache"}
+    if counters[DATA_MODIFIED_AT]:
+        headers["Last-Modified"] = formatdate(counters[DATA_MODIFIED_AT], usegmt=True)
+    return headers
@@ -1,21 +1,22 @@
 """Account endpoints: create, list, balances, adjust."""
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Header, Query
 from sqlalchemy.orm import Session
 
 from app.auth import require_api_key
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.errors import LedgerHTTPException
+from app.responses import ORJSONResponse, data_validators, etag_matches, not_modified
 from app.models import Account, Transaction, User
 from app.schemas import AccountBalance, AccountCreate, AccountOut, AdjustRequest
-from app.services import account_service
+from app.services import account_service, change_service
 from app.tz import now_utc
 
 router = APIRouter(prefix="/v1", dependencies=[Depends(require_api_key)])
 
 
 @router.post("/accounts", response_model=AccountOut, status_code=201)
-async def create_account(body: AccountCreate, db: Session = Depends(get_db)):
+def create_account(body: AccountCreate, db: Session = Depends(get_db)):
     existing = account_service.get_account(db, body.id)
     if existing:
         raise LedgerHTTPException(409, "DUPLICATE", f"Account '{body.id}' already exists")
@@ -29,24 +30,28 @@ async def create_account(body: AccountCreate, db: Session = Depends(get_db)):
 
 
 @router.get("/accounts", response_model=list[AccountOut])
-async def list_accounts(
+def list_accounts(
     user_id: str | None = Query(None),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     accounts = account_service.list_accounts(db, owner_id=user_id)
     return [AccountOut.model_validate(a) for a in accounts]
 
 
 @router.get("/accounts/balances", response_model=list[AccountBalance])
-async def account_balances(
+def account_balances(
     user_id: str | None = Query(None),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
+    if_none_match: str | None = Header(None),
 ):
-    return account_service.compute_balances(db, owner_id=user_id)
+    validators = data_validators(db)
+    if etag_matches(if_none_match, validators["ETag"]):
+        return not_modified(validators)
+    return ORJSONResponse(account_service.compute_balances(db, owner_id=user_id), headers=validators)
 
 
 @router.post("/accounts/{account_id}/adjust", response_model=AccountBalance)
-async def adjust_account(account_id: str, body: AdjustRequest, db: Session = Depends(get_db)):
+def adjust_account(account_id: str, body: AdjustRequest, db: Session = Depends(get_db)):
     acct = account_service.get_account(db, account_id)
     if not acct:
         raise LedgerHTTPException(404, "NOT_FOUND", f"Account '{account_id}' not found")
@@ -68,10 +73,7 @@ async def adjust_account(account_id: str, body: AdjustRequest, db: Session = Dep
         status="posted",
     )
     db.add(txn)
+    change_service.record_transaction(db, change_service.TRANSACTION_CREATED, txn)
     db.commit()
 
-    balance = account_service.compute_single_balance(db, account_id)
-    return AccountBalance(
-        account_id=account_id, display_name=acct.display_name,
-        owner_id=acct.owner_id, balance=balance,
-    )
+    return account_service.account_balance(db, acct)
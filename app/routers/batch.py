@@ -0,0 +1,18 @@
+"""Batch endpoint: run several tool calls in one session."""
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app import tools
+from app.auth import require_api_key
+from app.database import get_db
+from app.schemas import BatchRequest, BatchResponse
+
+router = APIRouter(prefix="/v1", dependencies=[Depends(require_api_key)])
+
+
+@router.post("/batch", response_model=BatchResponse)
+def run_batch(body: BatchRequest, db: Session = Depends(get_db)):
+    # Same executor as `ledger batch`, so results match the CLI tool output.
+    calls = [c.model_dump(exclude_none=True) for c in body.calls]
+    return tools.run_batch(calls, atomic=body.atomic, db=db)
@@ -1,11 +1,12 @@
 """Budget endpoints: upsert, list, status."""
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Header, Query
 from sqlalchemy.orm import Session
 
 from app.auth import require_api_key
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.errors import LedgerHTTPException
+from app.responses import ORJSONResponse, data_validators, etag_matches, not_modified
 from app.models import Category
 from app.schemas import BudgetOut, BudgetPut, BudgetSnapshotOut, BudgetStatusResponse
 from app.services import budget_service
@@ -15,7 +16,7 @@ router = APIRouter(prefix="/v1", dependencies=[Depends(require_api_key)])
 
 
 @router.put("/budgets/{month}/{category_id}", response_model=BudgetOut)
-async def upsert_budget(
+def upsert_budget(
     month: str,
     category_id: str,
     body: BudgetPut,
@@ -42,30 +43,36 @@ async def upsert_budget(
 
 
 @router.get("/budgets", response_model=list[BudgetOut])
-async def list_budgets(
+def list_budgets(
     month: str = Query(..., pattern=r"^\d{4}-\d{2}$"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     budgets = budget_service.list_budgets(db, month)
     return [BudgetOut.model_validate(b) for b in budgets]
 
 
 @router.get("/budgets/status", response_model=BudgetStatusResponse)
-async def budget_status(
+def budget_status(
     month: str | None = Query(None, pattern=r"^\d{4}-\d{2}$"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
+    if_none_match: str | None = Header(None),
 ):
     if not month:
         month = now_jakarta().strftime("%Y-%m")
+    validators = data_validators(db, month)
+    if etag_matches(if_none_match, validators["ETag"]):
+        return not_modified(validators)
     items, warnings = budget_service.compute_budget_status(db, month)
-    return BudgetStatusResponse(month=month, budgets=items, warnings=warnings)
+    return ORJSONResponse(
+        BudgetStatusResponse(month=month, budgets=items, warnings=warnings), headers=validators,
+    )
 
 
 @router.get("/budgets/history", response_model=list[BudgetSnapshotOut])
-async def budget_history(
+def budget_history(
     month: str = Query(..., pattern=r"^\d{4}-\d{2}$"),
     limit: int = Query(50, ge=1, le=200),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     snapshots = budget_service.list_snapshots(db, month, limit=limit)
     return [BudgetSnapshotOut.model_validate(s) for s in snapshots]
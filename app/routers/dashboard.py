@@ -1,15 +1,27 @@
-"""Server-rendered dashboard pages with cookie-based session auth."""
+"""Server-rendered dashboard pages with cookie-based session auth.
 
-from fastapi import APIRouter, Depends, Form, Query, Request
-from fastapi.responses import HTMLResponse, RedirectResponse
+Regions that change with filters, paging or month (transactions table,
+budget status, balances) are also served alone under /fragments so the
+page script can swap them in without rebuilding the layout.  /events
+streams ledger changes (server-sent events) so open pages update in place.
+"""
+
+import asyncio
+
+from fastapi import APIRouter, Depends, Form, Header, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import HTMLResponse, RedirectResponse, Response, StreamingResponse
 from fastapi.templating import Jinja2Templates
 from itsdangerous import BadSignature, TimestampSigner
 from sqlalchemy.orm import Session
+from starlette.datastructures import FormData
 
+from app import serialization
+from app.change_feed import feed
 from app.config import settings
-from app.database import get_db
-from app.models import Account, Category, User
-from app.services import account_service, budget_service, summary_service
+from app.database import get_db, get_read_db
+from app.responses import data_validators, etag_matches, not_modified
+from app.services import account_service, budget_service, meta_service, summary_service
 from app.services import transaction_service
 from app.tz import now_jakarta, to_jakarta
 
@@ -21,6 +33,7 @@ router = APIRouter(include_in_schema=False)
 _signer = TimestampSigner(settings.secret_key)
 _COOKIE_NAME = "ledger_session"
 _MAX_AGE = 60 * 60 * 24 * 7  # 7 days
+_HEARTBEAT = 15.0  # seconds between keep-alive comments on /events
 
 
 def _idr(amount: int) -> str:
@@ -29,6 +42,12 @@ def _idr(amount: int) -> str:
     return f"{sign}Rp{s}"
 
 
+def _money(amount: int | float, currency: str) -> str:
+    if currency == "IDR":
+        return _idr(round(amount))
+    return f"{currency} {amount:,.2f}"
+
+
 def _get_session_user(request: Request) -> str | None:
     token = request.cookies.get(_COOKIE_NAME)
     if not token:
@@ -47,44 +66,44 @@ def _require_login(request: Request) -> str | RedirectResponse:
     return user
 
 
-def _common_ctx(db: Session) -> dict:
-    parents = (
-        db.query(Category)
-        .filter(Category.is_active == 1, Category.parent_id.is_(None))
-        .order_by(Category.display_name)
-        .all()
-    )
-    category_tree = []
-    for p in parents:
-        children = (
-            db.query(Category)
-            .filter(Category.is_active == 1, Category.parent_id == p.id)
-            .order_by(Category.display_name)
-            .all()
-        )
-        category_tree.append({"parent": p, "children": children})
+def _fragment(
+    request: Request, db: Session, name: str, build, *scope: object, if_none_match: str | None,
+) -> Response:
+    """Render one region template, or 401/304 instead of a login redirect."""
+    if _get_session_user(request) is None:
+        return Response(status_code=401)
+    validators = data_validators(db, name, *scope)
+    if etag_matches(if_none_match, validators["ETag"]):
+        return not_modified(validators)
+    ctx = {"request": request, "idr": _idr, "money": _money, **build()}
+    return templates.TemplateResponse(request, name, ctx, headers=validators)
 
-    all_categories = db.query(Category).filter(Category.is_active == 1).order_by(Category.display_name).all()
-    cat_name_map = {c.id: c.display_name for c in all_categories}
 
+def _common_ctx(db: Session) -> dict:
+    ref = meta_service.reference_snapshot(db)
     return {
-        "category_tree": category_tree,
-        "categories": all_categories,
-        "cat_name_map": cat_name_map,
-        "accounts": db.query(Account).filter(Account.is_active == 1).order_by(Account.display_name).all(),
-        "users": db.query(User).order_by(User.display_name).all(),
+        "category_tree": ref.category_tree,
+        "categories": ref.categories,
+        "cat_name_map": ref.cat_name_map,
+        "accounts": ref.accounts,
+        "users": ref.users,
         "idr": _idr,
+        "money": _money,
         "now": now_jakarta(),
     }
 
 
+def _parent_categories(db: Session) -> list:
+    return [group["parent"] for group in meta_service.reference_snapshot(db).category_tree]
+
+
 # ── Auth routes ───────────────────────────────────────────────────────────────
 
 @router.get("/login", response_class=HTMLResponse)
 async def login_page(request: Request, error: str | None = None):
     if _get_session_user(request):
         return RedirectResponse(url="/", status_code=302)
-    return templates.TemplateResponse("login.html", {"request": request, "error": error})
+    return templates.TemplateResponse(request, "login.html", {"request": request, "error": error})
 
 
 @router.post("/login")
@@ -97,7 +116,7 @@ async def login_submit(request: Request, username: str = Form(...), password: st
             max_age=_MAX_AGE, httponly=True, samesite="lax",
         )
         return response
-    return templates.TemplateResponse("login.html", {
+    return templates.TemplateResponse(request, "login.html", {
         "request": request,
         "error": "Invalid username or password",
     })
@@ -113,7 +132,7 @@ async def logout():
 # ── Dashboard pages (all require login) ──────────────────────────────────────
 
 @router.get("/", response_class=HTMLResponse)
-async def overview(request: Request, db: Session = Depends(get_db)):
+def overview(request: Request, db: Session = Depends(get_read_db)):
     auth = _require_login(request)
     if isinstance(auth, RedirectResponse):
         return auth
@@ -121,13 +140,14 @@ async def overview(request: Request, db: Session = Depends(get_db)):
     month = now_jakarta().strftime("%Y-%m")
     summary = summary_service.monthly_summary(db, month)
     all_balances = account_service.compute_balances(db)
+    totals = account_service.household_totals(all_balances)
 
-    db_users = db.query(User).order_by(User.display_name).all()
+    db_users = meta_service.reference_snapshot(db).users
     per_user = []
     for u in db_users:
         user_summary = summary_service.monthly_summary(db, month, user_id=u.id)
         user_balances = [b for b in all_balances if b.owner_id == u.id]
-        user_total = sum(b.balance for b in user_balances)
+        user_total = totals.by_owner_idr.get(u.id, 0)
         per_user.append({
             "user": u,
             "summary": user_summary,
@@ -135,18 +155,19 @@ async def overview(request: Request, db: Session = Depends(get_db)):
             "total_balance": user_total,
         })
 
-    return templates.TemplateResponse("overview.html", {
+    return templates.TemplateResponse(request, "overview.html", {
         "request": request,
         **_common_ctx(db),
         "month": month,
         "summary": summary,
         "balances": all_balances,
+        "totals": totals,
         "per_user": per_user,
     })
 
 
 @router.get("/transactions", response_class=HTMLResponse)
-async def transactions_page(
+def transactions_page(
     request: Request,
     month: str | None = Query(None),
     category_id: str | None = None,
@@ -154,12 +175,51 @@ async def transactions_page(
     account_id: str | None = None,
     search: str | None = None,
     page: int = Query(1, ge=1),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     auth = _require_login(request)
     if isinstance(auth, RedirectResponse):
         return auth
 
+    return templates.TemplateResponse(request, "transactions.html", {
+        "request": request,
+        **_common_ctx(db),
+        **_transactions_ctx(db, month, category_id, user_id, account_id, search, page),
+    })
+
+
+@router.get("/fragments/transactions", response_class=HTMLResponse)
+def transactions_fragment(
+    request: Request,
+    month: str | None = Query(None),
+    category_id: str | None = None,
+    user_id: str | None = None,
+    account_id: str | None = None,
+    search: str | None = None,
+    page: int = Query(1, ge=1),
+    db: Session = Depends(get_read_db),
+    if_none_match: str | None = Header(None),
+):
+    month = month or now_jakarta().strftime("%Y-%m")
+    return _fragment(
+        request, db, "_transactions_table.html",
+        lambda: {
+            "cat_name_map": meta_service.reference_snapshot(db).cat_name_map,
+            **_transactions_ctx(db, month, category_id, user_id, account_id, search, page),
+        },
+        month, if_none_match=if_none_match,
+    )
+
+
+def _transactions_ctx(
+    db: Session,
+    month: str | None,
+    category_id: str | None,
+    user_id: str | None,
+    account_id: str | None,
+    search: str | None,
+    page: int,
+) -> dict:
     if not month:
         month = now_jakarta().strftime("%Y-%m")
     per_page = 30
@@ -171,9 +231,7 @@ async def transactions_page(
     )
     total_pages = max(1, (total + per_page - 1) // per_page)
 
-    return templates.TemplateResponse("transactions.html", {
-        "request": request,
-        **_common_ctx(db),
+    return {
         "txns": rows,
         "month": month,
         "total": total,
@@ -183,45 +241,63 @@ async def transactions_page(
         "filter_user": user_id or "",
         "filter_account": account_id or "",
         "filter_search": search or "",
-    })
+    }
 
 
 @router.get("/budgets", response_class=HTMLResponse)
-async def budgets_page(
+def budgets_page(
     request: Request,
     month: str | None = Query(None),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     auth = _require_login(request)
     if isinstance(auth, RedirectResponse):
         return auth
 
-    if not month:
-        month = now_jakarta().strftime("%Y-%m")
+    return templates.TemplateResponse(request, "budgets.html", {
+        "request": request,
+        **_common_ctx(db),
+        **_budgets_ctx(db, month or now_jakarta().strftime("%Y-%m")),
+    })
+
+
+@router.get("/fragments/budgets", response_class=HTMLResponse)
+def budgets_fragment(
+    request: Request,
+    month: str | None = Query(None),
+    db: Session = Depends(get_read_db),
+    if_none_match: str | None = Header(None),
+):
+    month = month or now_jakarta().strftime("%Y-%m")
+    return _fragment(
+        request, db, "_budget_status.html",
+        lambda: {
+            "cat_name_map": meta_service.reference_snapshot(db).cat_name_map,
+            **_budgets_ctx(db, month),
+        },
+        month, if_none_match=if_none_match,
+    )
+
+
+def _budgets_ctx(db: Session, month: str) -> dict:
     items, warnings = budget_service.compute_budget_status(db, month)
     raw_budgets = budget_service.list_budgets(db, month)
     budget_limit_map = {b.category_id: b.limit_amount for b in raw_budgets}
 
-    parent_categories = (
-        db.query(Category)
-        .filter(Category.is_active == 1, Category.parent_id.is_(None))
-        .order_by(Category.display_name)
-        .all()
-    )
+    parent_categories = _parent_categories(db)
 
     history = budget_service.list_snapshots(db, month, limit=20)
 
-    return templates.TemplateResponse("budgets.html", {
-        "request": request,
-        **_common_ctx(db),
+    return {
         "month": month,
         "budget_items": items,
+        "budget_status_map": {i.category_id: i for i in items},
         "raw_budgets": raw_budgets,
         "budget_limit_map": budget_limit_map,
         "parent_categories": parent_categories,
         "warnings": warnings,
         "history": history,
-    })
+    }
 
 
 @router.post("/budgets", response_class=HTMLResponse)
@@ -235,13 +311,12 @@ async def budgets_save(
 
     form = await request.form()
     month = form.get("month", now_jakarta().strftime("%Y-%m"))
+    await run_in_threadpool(_save_budgets, db, month, form)
+    return RedirectResponse(url=f"/budgets?month={month}", status_code=302)
 
-    parent_categories = (
-        db.query(Category)
-        .filter(Category.is_active == 1, Category.parent_id.is_(None))
-        .order_by(Category.display_name)
-        .all()
-    )
+
+def _save_budgets(db: Session, month: str, form: FormData) -> None:
+    parent_categories = _parent_categories(db)
 
     changes: dict[str, int] = {}
     for cat in parent_categories:
@@ -258,41 +333,91 @@ async def budgets_save(
     if changes:
         budget_service.bulk_upsert_budgets(db, month, changes, source="dashboard")
 
-    return RedirectResponse(url=f"/budgets?month={month}", status_code=302)
-
 
 @router.get("/accounts", response_class=HTMLResponse)
-async def accounts_page(request: Request, db: Session = Depends(get_db)):
+def accounts_page(request: Request, db: Session = Depends(get_read_db)):
     auth = _require_login(request)
     if isinstance(auth, RedirectResponse):
         return auth
 
+    return templates.TemplateResponse(request, "accounts.html", {
+        "request": request,
+        **_common_ctx(db),
+        **_balances_ctx(db),
+    })
+
+
+@router.get("/fragments/balances", response_class=HTMLResponse)
+def balances_fragment(
+    request: Request,
+    db: Session = Depends(get_read_db),
+    if_none_match: str | None = Header(None),
+):
+    return _fragment(
+        request, db, "_balances.html", lambda: _balances_ctx(db), if_none_match=if_none_match,
+    )
+
+
+def _balances_ctx(db: Session) -> dict:
     accts = account_service.list_accounts(db)
     balances = account_service.compute_balances(db)
     balance_map = {b.account_id: b.balance for b in balances}
+    totals = account_service.household_totals(balances)
 
-    db_users = db.query(User).order_by(User.display_name).all()
+    db_users = meta_service.reference_snapshot(db).users
     per_user_accounts = []
     for u in db_users:
         user_accts = [a for a in accts if a.owner_id == u.id]
-        user_total = sum(balance_map.get(a.id, 0) for a in user_accts)
         per_user_accounts.append({
             "user": u,
             "accounts": user_accts,
-            "total": user_total,
+            "total": totals.by_owner_idr.get(u.id, 0),
         })
 
-    shared_accts = [a for a in accts if a.owner_id is None]
-    shared_total = sum(balance_map.get(a.id, 0) for a in shared_accts)
-    grand_total = sum(balance_map.values())
-
-    return templates.TemplateResponse("accounts.html", {
-        "request": request,
-        **_common_ctx(db),
+    return {
         "accts": accts,
         "balance_map": balance_map,
         "per_user_accounts": per_user_accounts,
-        "shared_accts": shared_accts,
-        "shared_total": shared_total,
-        "grand_total": grand_total,
-    })
+        "shared_accts": [a for a in accts if a.owner_id is None],
+        "shared_total": totals.shared_idr,
+        "grand_total": totals.total_idr,
+        "unconverted": totals.unconverted,
+    }
+
+
+# ── Live updates ─────────────────────────────────────────────────────────────
+
+@router.get("/events")
+async def events(request: Request, last_event_id: str | None = Header(None)):
+    if _get_session_user(request) is None:
+        return Response(status_code=401)
+    return StreamingResponse(
+        _event_stream(request, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _event_stream(request: Request, last_event_id: str | None):
+    async with feed.subscribe() as sub:
+        yield "retry: 3000\n\n"
+        replayed = 0
+        if last_event_id and last_event_id.isdigit():
+            for event in await run_in_threadpool(feed.replay, int(last_event_id)):
+                replayed = max(replayed, event["id"])
+                yield _sse(event)
+        while not sub.overflowed:
+            try:
+                event = await asyncio.wait_for(sub.queue.get(), _HEARTBEAT)
+            except TimeoutError:
+                if await request.is_disconnected():
+                    return
+                yield ": keep-alive\n\n"
+                continue
+            if event["id"] > replayed:
+                yield _sse(event)
+
+
+def _sse(event: dict) -> str:
+    data = serialization.dumps(event["data"]).decode()
+    return f"id: {event['id']}\nevent: {event['event']}\ndata: {data}\n\n"
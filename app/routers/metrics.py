@@ -0,0 +1,23 @@
+"""Prometheus metrics endpoint."""
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app import metrics
+from app.config import settings
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    files = {
+        "db": settings.db_path,
+        "wal": f"{settings.db_path}-wal",
+        "archive": settings.archive_path,
+        "archive_wal": f"{settings.archive_path}-wal",
+    }
+    return PlainTextResponse(
+        metrics.render(settings.metrics_file or None, files),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
@@ -1,10 +1,11 @@
 """Monthly summary endpoint."""
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Header, Query
 from sqlalchemy.orm import Session
 
 from app.auth import require_api_key
-from app.database import get_db
+from app.database import get_read_db
+from app.responses import ORJSONResponse, data_validators, etag_matches, not_modified
 from app.schemas import MonthlySummary
 from app.services import summary_service
 from app.tz import now_jakarta
@@ -13,11 +14,17 @@ router = APIRouter(prefix="/v1", dependencies=[Depends(require_api_key)])
 
 
 @router.get("/summary/monthly", response_model=MonthlySummary)
-async def get_monthly_summary(
+def get_monthly_summary(
     month: str | None = Query(None, pattern=r"^\d{4}-\d{2}$"),
     user_id: str | None = Query(None),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
+    if_none_match: str | None = Header(None),
 ):
     if not month:
         month = now_jakarta().strftime("%Y-%m")
-    return summary_service.monthly_summary(db, month, user_id=user_id)
+    validators = data_validators(db, month)
+    if etag_matches(if_none_match, validators["ETag"]):
+        return not_modified(validators)
+    return ORJSONResponse(
+        summary_service.monthly_summary(db, month, user_id=user_id), headers=validators,
+    )
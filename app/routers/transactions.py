@@ -1,11 +1,12 @@
 """Transaction endpoints: create, list, get, void, correct."""
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Header, Query
 from sqlalchemy.orm import Session
 
 from app.auth import require_api_key
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.errors import LedgerHTTPException
+from app.responses import ORJSONResponse, data_validators, etag_matches, not_modified
 from app.schemas import (
     TransactionCreate,
     TransactionCreateResponse,
@@ -18,7 +19,7 @@ router = APIRouter(prefix="/v1", dependencies=[Depends(require_api_key)])
 
 
 @router.post("/transactions", response_model=TransactionCreateResponse, status_code=201)
-async def create_transaction(body: TransactionCreate, db: Session = Depends(get_db)):
+def create_transaction(body: TransactionCreate, db: Session = Depends(get_db)):
     result = transaction_service.create_transaction(db, body)
     return TransactionCreateResponse(
         transaction=TransactionOut.model_validate(result["transaction"]),
@@ -29,7 +30,7 @@ async def create_transaction(body: TransactionCreate, db: Session = Depends(get_
 
 
 @router.get("/transactions", response_model=TransactionListResponse)
-async def list_transactions(
+def list_transactions(
     month: str | None = Query(None, pattern=r"^\d{4}-\d{2}$"),
     category_id: str | None = None,
     user_id: str | None = None,
@@ -37,9 +38,13 @@ async def list_transactions(
     search: str | None = None,
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
+    if_none_match: str | None = Header(None),
 ):
-    rows, total = transaction_service.list_transactions(
+    validators = data_validators(db)
+    if etag_matches(if_none_match, validators["ETag"]):
+        return not_modified(validators)
+    rows, total = transaction_service.list_transaction_rows(
         db,
         month=month,
         category_id=category_id,
@@ -49,16 +54,14 @@ async def list_transactions(
         limit=limit,
         offset=offset,
     )
-    return TransactionListResponse(
-        transactions=[TransactionOut.model_validate(r) for r in rows],
-        total=total,
-        limit=limit,
-        offset=offset,
+    return ORJSONResponse(
+        {"transactions": rows, "total": total, "limit": limit, "offset": offset},
+        headers=validators,
     )
 
 
 @router.get("/transactions/{txn_id}", response_model=TransactionOut)
-async def get_transaction(txn_id: int, db: Session = Depends(get_db)):
+def get_transaction(txn_id: int, db: Session = Depends(get_read_db)):
     txn = transaction_service.get_transaction(db, txn_id)
     if txn is None:
         raise LedgerHTTPException(404, "NOT_FOUND", "Transaction not found")
@@ -66,13 +69,13 @@ async def get_transaction(txn_id: int, db: Session = Depends(get_db)):
 
 
 @router.post("/transactions/{txn_id}/void", response_model=TransactionOut)
-async def void_transaction(txn_id: int, db: Session = Depends(get_db)):
+def void_transaction(txn_id: int, db: Session = Depends(get_db)):
     txn = transaction_service.void_transaction(db, txn_id)
     return TransactionOut.model_validate(txn)
 
 
 @router.post("/transactions/{txn_id}/correct", response_model=TransactionCreateResponse)
-async def correct_transaction(txn_id: int, body: TransactionCreate, db: Session = Depends(get_db)):
+def correct_transaction(txn_id: int, body: TransactionCreate, db: Session = Depends(get_db)):
     result = transaction_service.correct_transaction(db, txn_id, body)
     return TransactionCreateResponse(
         transaction=TransactionOut.model_validate(result["transaction"]),
@@ -0,0 +1,38 @@
+"""Periodic background jobs run by the API process.
+
+Each job is a plain sync function run on the worker pool, so it shares the
+db_threads budget with request handlers instead of blocking the event loop.
+Jobs log their duration and result; a failing run is logged and the job
+tries again at its next interval.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from typing import Any
+
+from anyio import to_thread
+
+logger = logging.getLogger(__name__)
+
+
+async def run_every(
+    name: str,
+    interval_seconds: float,
+    fn: Callable[[], Any],
+    initial_delay: float = 0.0,
+) -> None:
+    """Call *fn* every *interval_seconds* until cancelled."""
+    await asyncio.sleep(initial_delay)
+    while True:
+        started = time.monotonic()
+        try:
+            result = await to_thread.run_sync(fn)
+        except Exception:
+            logger.exception("%s failed", name)
+        else:
+            logger.info("%s finished in %.2fs: %s", name, time.monotonic() - started, result)
+        await asyncio.sleep(interval_seconds)
@@ -99,7 +99,16 @@ class AccountBalance(BaseModel):
     account_id: str
     display_name: str
     owner_id: str | None = None
-    balance: int
+    currency: str = "IDR"
+    balance: int | float  # in the account's own currency
+    balance_idr: int | None = None  # None when a needed rate is not stored yet
+
+
+class BalanceTotals(BaseModel):
+    total_idr: int
+    by_owner_idr: dict[str, int]
+    shared_idr: int
+    unconverted: list[str]  # account IDs left out for lack of a rate
 
 
 class AdjustRequest(BaseModel):
@@ -142,6 +151,9 @@ class TransactionCreate(BaseModel):
     transaction_type: TransactionType
     amount: float = Field(..., gt=0)
     currency: str = "IDR"
+    original_amount: float | None = Field(None, gt=0)
+    original_currency: str | None = Field(None, min_length=3, max_length=3)
+    fx_rate: float | None = Field(None, gt=0)
     category_id: str | None = None
     description: str | None = None
     merchant: str | None = None
@@ -156,6 +168,19 @@ class TransactionCreate(BaseModel):
     def round_amount_to_int(cls, v: float) -> int:
         return round(v)
 
+    @field_validator("original_currency", mode="after")
+    @classmethod
+    def upper_currency(cls, v: str | None) -> str | None:
+        return v.upper() if v else v
+
+    @model_validator(mode="after")
+    def validate_original_amount(self) -> TransactionCreate:
+        if (self.original_amount is None) != (self.original_currency is None):
+            raise ValueError("original_amount and original_currency must be given together")
+        if self.fx_rate is not None and self.original_currency is None:
+            raise ValueError("fx_rate requires original_amount and original_currency")
+        return self
+
     @model_validator(mode="after")
     def validate_type_fields(self) -> TransactionCreate:
         t = self.transaction_type
@@ -218,6 +243,9 @@ class TransactionOut(BaseModel):
     transaction_type: str
     amount: int
     currency: str
+    original_amount: float | None = None
+    original_currency: str | None = None
+    fx_rate: float | None = None
     category_id: str | None = None
     description: str | None = None
     merchant: str | None = None
@@ -385,3 +413,21 @@ class MetaResponse(BaseModel):
     payment_methods: list[str]
     transaction_types: list[str]
     server_time: datetime
+
+
+# ── Batch ─────────────────────────────────────────────────────────────────────
+
+class BatchCall(BaseModel):
+    tool: str
+    args: dict[str, Any] = {}
+    id: str | None = None
+
+
+class BatchRequest(BaseModel):
+    calls: list[BatchCall] = Field(..., min_length=1, max_length=50)
+    atomic: bool = False
+
+
+class BatchResponse(BaseModel):
+    results: list[Any]
+    committed: bool
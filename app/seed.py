@@ -1,9 +1,16 @@
-"""Seed default data (users, categories, accounts) on first run."""
+"""Create the schema and seed default data (users, categories, accounts) on first run."""
 
+from sqlalchemy import Connection, Engine
 from sqlalchemy.orm import Session
 
+from app.database import Base, engine
 from app.models import Account, Category, User
 
+# Stored in PRAGMA user_version once tables and defaults are in place.  Bump
+# it whenever the models or the seed data change so existing databases run
+# the full create/seed once more on their next start.
+SCHEMA_VERSION = 6
+
 CATEGORY_HIERARCHY: dict[tuple[str, str], list[tuple[str, str]]] = {
     ("food", "Food"): [
         ("groceries", "Groceries"),
@@ -80,6 +87,44 @@ CATEGORY_HIERARCHY: dict[tuple[str, str], list[tuple[str, str]]] = {
 }
 
 
+def ensure_database(bind: Engine | None = None) -> bool:
+    """Create tables and seed defaults unless the database is already stamped.
+
+    The hot path is a single ``PRAGMA user_version`` read.  Returns True if
+    the full create/seed ran.
+    """
+    bind = bind or engine
+    with bind.connect() as conn:
+        version = conn.exec_driver_sql("PRAGMA user_version").scalar()
+        if version == 0 and not conn.exec_driver_sql("SELECT COUNT(*) FROM sqlite_master").scalar():
+            # Only an empty file can switch auto_vacuum without a full VACUUM;
+            # incremental mode lets app.maintenance return free pages.
+            conn.exec_driver_sql("PRAGMA auto_vacuum=INCREMENTAL")
+            conn.exec_driver_sql("VACUUM")
+    if version >= SCHEMA_VERSION:
+        return False
+
+    Base.metadata.create_all(bind=bind)
+    with bind.begin() as conn:
+        _add_missing_columns(conn)
+    with Session(bind=bind) as db:
+        seed_defaults(db)
+    with bind.begin() as conn:
+        conn.exec_driver_sql(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    return True
+
+
+def _add_missing_columns(conn: Connection) -> None:
+    """Add nullable columns that create_all skips on existing tables."""
+    for table in Base.metadata.sorted_tables:
+        existing = {row[1] for row in conn.exec_driver_sql(f'PRAGMA table_info("{table.name}")')}
+        for column in table.columns:
+            if column.name in existing or not column.nullable:
+                continue
+            col_type = column.type.compile(dialect=conn.dialect)
+            conn.exec_driver_sql(f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {col_type}')
+
+
 def seed_defaults(db: Session) -> None:
     _seed_users(db)
     _seed_categories(db)
@@ -0,0 +1,100 @@
+"""Fast JSON serialization for API responses and CLI output.
+
+Tool results and listings are encoded with orjson when it is installed and
+with pydantic-core's Rust encoder otherwise.  Both produce compact UTF-8
+JSON that parses to the same values as ``json.dumps``.
+
+Transaction listings skip ORM objects and per-row pydantic models entirely:
+the service reads plain column tuples and ``transaction_rows`` turns them
+into the exact dicts ``TransactionOut.model_dump(mode="json")`` would give.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Iterable, Sequence
+from datetime import datetime, timezone
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+# Column order of the tuples read by transaction_service.list_transaction_rows;
+# the keys match TransactionOut.
+TRANSACTION_FIELDS: tuple[str, ...] = (
+    "id",
+    "created_at",
+    "effective_at",
+    "user_id",
+    "transaction_type",
+    "amount",
+    "currency",
+    "original_amount",
+    "original_currency",
+    "fx_rate",
+    "category_id",
+    "description",
+    "merchant",
+    "payment_method",
+    "from_account_id",
+    "to_account_id",
+    "note",
+    "status",
+    "correction_of",
+    "metadata_json",
+)
+
+
+def _default(obj: Any) -> Any:
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump(mode="json")
+    return str(obj)
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode obj as compact UTF-8 JSON.
+
+    Pydantic models are dumped by pydantic-core in a single pass.  Values
+    neither backend understands fall back to ``str`` like the old
+    ``json.dumps(..., default=str)`` CLI output did.
+    """
+    if hasattr(obj, "model_dump_json"):
+        return obj.model_dump_json().encode("utf-8")
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+    from pydantic_core import to_json
+
+    return to_json(obj, fallback=str)
+
+
+def utc_isoformat(value: datetime | None) -> str | None:
+    """Format a stored datetime like TransactionOut does (naive means UTC)."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return value.isoformat() + "Z"
+    return value.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _parse_metadata(raw: str | None) -> dict[str, Any] | None:
+    if raw is None:
+        return None
+    try:
+        return json.loads(raw)
+    except (json.JSONDecodeError, TypeError):
+        return None
+
+
+def transaction_rows(rows: Iterable[Sequence[Any]]) -> list[dict[str, Any]]:
+    """Turn TRANSACTION_FIELDS tuples into JSON-ready transaction dicts."""
+    out: list[dict[str, Any]] = []
+    for row in rows:
+        item = dict(zip(TRANSACTION_FIELDS, row))
+        item["created_at"] = utc_isoformat(item["created_at"])
+        item["effective_at"] = utc_isoformat(item["effective_at"])
+        item["metadata_json"] = _parse_metadata(item["metadata_json"])
+        out.append(item)
+    return out
@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
-from sqlalchemy import func
+from sqlalchemy import func, select, union_all
 from sqlalchemy.orm import Session
 
-from app.models import Account, Transaction
-from app.schemas import AccountBalance
+from app import metrics
+from app.models import Account, ArchivedMovement, Transaction
+from app.schemas import AccountBalance, BalanceTotals
+from app.services import fx_service
+from app.services.singleflight import coalesce
 
 
 def list_accounts(db: Session, active_only: bool = True, owner_id: str | None = None) -> list[Account]:
@@ -36,59 +39,166 @@ def create_account(
     return acct
 
 
-def compute_balances(db: Session, owner_id: str | None = None) -> list[AccountBalance]:
-    """Compute current balance for every active account, optionally filtered by owner."""
-    accounts = list_accounts(db, active_only=True, owner_id=owner_id)
-    result: list[AccountBalance] = []
+_CREDIT_TYPES = ("income", "transfer", "adjustment")
+_DEBIT_TYPES = ("expense", "transfer", "adjustment")
 
-    for acct in accounts:
-        balance = _compute_account_balance(db, acct.id)
-        result.append(AccountBalance(
-            account_id=acct.id, display_name=acct.display_name,
-            owner_id=acct.owner_id, balance=balance,
-        ))
+HOUSEHOLD_CURRENCY = "IDR"
 
-    return result
 
+@metrics.timed
+@coalesce
+def compute_balances(db: Session, owner_id: str | None = None) -> list[AccountBalance]:
+    """Compute current balance for every active account, optionally filtered by owner.
 
-def compute_single_balance(db: Session, account_id: str) -> int:
-    acct = get_account(db, account_id)
-    if acct is None:
-        return 0
-    return _compute_account_balance(db, account_id)
+    Balances are in each account's own currency, with an IDR equivalent
+    from the stored FX rates (fx_service.latest_rates, no network).  All
+    accounts are aggregated in one query and converted in one rate lookup.
+    """
+    accounts = list_accounts(db, active_only=True, owner_id=owner_id)
+    native, rates, incomplete = _native_balances(db, accounts)
+    return [_balance_out(acct, native[acct.id], rates, acct.id in incomplete) for acct in accounts]
+
+
+def household_totals(balances: list[AccountBalance]) -> BalanceTotals:
+    """IDR totals for the household, per owner, and for shared accounts."""
+    by_owner: dict[str, int] = {}
+    shared = 0
+    unconverted: list[str] = []
+    for b in balances:
+        if b.balance_idr is None:
+            unconverted.append(b.account_id)
+            continue
+        if b.owner_id is None:
+            shared += b.balance_idr
+        else:
+            by_owner[b.owner_id] = by_owner.get(b.owner_id, 0) + b.balance_idr
+    return BalanceTotals(
+        total_idr=shared + sum(by_owner.values()),
+        by_owner_idr=by_owner,
+        shared_idr=shared,
+        unconverted=unconverted,
+    )
 
 
-def _compute_account_balance(db: Session, account_id: str) -> int:
-    posted = Transaction.status == "posted"
+def account_balance(db: Session, acct: Account) -> AccountBalance:
+    native, rates, incomplete = _native_balances(db, [acct])
+    return _balance_out(acct, native[acct.id], rates, acct.id in incomplete)
+
 
-    credit = (
-        db.query(func.coalesce(func.sum(Transaction.amount), 0))
-        .filter(
-            posted,
-            Transaction.to_account_id == account_id,
-            Transaction.transaction_type.in_(["income", "transfer", "adjustment"]),
-        )
-        .scalar()
+def _balance_out(
+    acct: Account, balance: int | float, rates: dict[tuple[str, str], float], incomplete: bool = False,
+) -> AccountBalance:
+    to_idr = None if incomplete else rates.get((acct.currency, HOUSEHOLD_CURRENCY))
+    return AccountBalance(
+        account_id=acct.id, display_name=acct.display_name,
+        owner_id=acct.owner_id, currency=acct.currency, balance=balance,
+        balance_idr=round(balance * to_idr) if to_idr is not None else None,
     )
 
-    debit = (
-        db.query(func.coalesce(func.sum(Transaction.amount), 0))
-        .filter(
-            posted,
-            Transaction.from_account_id == account_id,
-            Transaction.transaction_type.in_(["expense", "transfer"]),
-        )
-        .scalar()
+
+def _native_balances(
+    db: Session, accounts: list[Account],
+) -> tuple[dict[str, int | float], dict[tuple[str, str], float], set[str]]:
+    """Each account's balance in its own currency, the rates looked up, and
+    the accounts whose balance is incomplete.
+
+    A movement counts at its amount when recorded in the account's currency,
+    at its original_amount when that was in the account's currency, and is
+    converted at the latest stored rate otherwise.  With no stored rate the
+    movement is left out rather than guessed, and its account is reported
+    incomplete (no IDR equivalent).  The rates include every account
+    currency to IDR.
+    """
+    currencies = {a.id: a.currency for a in accounts}
+    if not currencies:
+        return {}, {}, set()
+    grouped = _grouped_movements(db, list(currencies))
+
+    pairs = {(c, HOUSEHOLD_CURRENCY) for c in currencies.values()}
+    for account_id, txn_currency, original_currency, _amount, _original in grouped:
+        if currencies[account_id] not in (txn_currency, original_currency):
+            pairs.add((txn_currency, currencies[account_id]))
+    rates = fx_service.latest_rates(db, pairs)
+
+    native: dict[str, int | float] = dict.fromkeys(currencies, 0)
+    incomplete: set[str] = set()
+    for account_id, txn_currency, original_currency, amount, original in grouped:
+        currency = currencies[account_id]
+        if txn_currency == currency:
+            native[account_id] += amount
+        elif original_currency == currency:
+            native[account_id] += original
+        elif (txn_currency, currency) in rates:
+            native[account_id] += amount * rates[(txn_currency, currency)]
+        elif amount:
+            incomplete.add(account_id)
+
+    for account_id, balance in native.items():
+        native[account_id] = int(balance) if float(balance).is_integer() else round(balance, 2)
+    return native, rates, incomplete
+
+
+def _grouped_movements(db: Session, account_ids: list[str]) -> list:
+    """Signed sums per (account, currency, original_currency) in one query.
+
+    Transactions moved to the archive database count through their
+    archived_movements rows (see app.archive), so balances never read it.
+    """
+    carried = select(
+        ArchivedMovement.account_id,
+        ArchivedMovement.currency,
+        ArchivedMovement.original_currency,
+        ArchivedMovement.amount,
+        ArchivedMovement.original,
+    ).where(ArchivedMovement.account_id.in_(account_ids))
+    return _sum_movements(
+        db, Transaction.to_account_id.in_(account_ids), Transaction.from_account_id.in_(account_ids),
+        carried=carried,
     )
 
-    adj_from = (
-        db.query(func.coalesce(func.sum(Transaction.amount), 0))
-        .filter(
-            posted,
-            Transaction.from_account_id == account_id,
-            Transaction.transaction_type == "adjustment",
-        )
-        .scalar()
+
+def movement_totals(db: Session, *criteria) -> list:
+    """Signed sums per (account, currency, original_currency) of the posted
+    transactions matching *criteria*, shaped like ArchivedMovement rows."""
+    return _sum_movements(
+        db, Transaction.to_account_id.isnot(None), Transaction.from_account_id.isnot(None), *criteria,
     )
 
-    return int(credit) - int(debit) - int(adj_from)
+
+def _sum_movements(db: Session, credit_filter, debit_filter, *criteria, carried=None) -> list:
+    posted = Transaction.status == "posted"
+    credits = select(
+        Transaction.to_account_id.label("account_id"),
+        Transaction.currency,
+        Transaction.original_currency,
+        Transaction.amount.label("amount"),
+        Transaction.original_amount.label("original"),
+    ).where(
+        posted,
+        credit_filter,
+        Transaction.transaction_type.in_(_CREDIT_TYPES),
+        *criteria,
+    )
+    debits = select(
+        Transaction.from_account_id,
+        Transaction.currency,
+        Transaction.original_currency,
+        -Transaction.amount,
+        -Transaction.original_amount,
+    ).where(
+        posted,
+        debit_filter,
+        Transaction.transaction_type.in_(_DEBIT_TYPES),
+        *criteria,
+    )
+    parts = [credits, debits] if carried is None else [credits, debits, carried]
+    moves = union_all(*parts).subquery()
+    return db.execute(
+        select(
+            moves.c.account_id,
+            moves.c.currency,
+            moves.c.original_currency,
+            func.coalesce(func.sum(moves.c.amount), 0),
+            func.coalesce(func.sum(moves.c.original), 0),
+        ).group_by(moves.c.account_id, moves.c.currency, moves.c.original_currency)
+    ).all()
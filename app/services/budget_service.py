@@ -7,8 +7,11 @@ import json
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
-from app.models import Budget, BudgetSnapshot, Category, Transaction
+from app import archive, metrics
+from app.models import Budget, BudgetSnapshot, Category
 from app.schemas import BudgetStatusItem, BudgetWarningSeverity, WarningItem
+from app.services import change_service
+from app.services.singleflight import coalesce
 from app.tz import col_as_jakarta
 
 
@@ -73,6 +76,7 @@ def upsert_budget(
         db.flush()
 
     _record_snapshot(db, month, category_id, previous_amount, limit_amount, source)
+    change_service.record_budget(db, month, [category_id])
 
     db.commit()
     db.refresh(budget)
@@ -90,6 +94,7 @@ def bulk_upsert_budgets(
     Records a single snapshot per changed category.
     """
     results: list[Budget] = []
+    changed: list[str] = []
     for category_id, limit_amount in changes.items():
         existing = (
             db.query(Budget)
@@ -123,7 +128,9 @@ def bulk_upsert_budgets(
             results.append(budget)
 
         _record_snapshot(db, month, category_id, previous_amount, limit_amount, source)
+        changed.append(category_id)
 
+    change_service.record_budget(db, month, changed)
     db.commit()
     return results
 
@@ -137,6 +144,8 @@ def list_budgets(db: Session, month: str) -> list[Budget]:
     )
 
 
+@metrics.timed
+@coalesce
 def compute_budget_status(db: Session, month: str) -> tuple[list[BudgetStatusItem], list[WarningItem]]:
     budgets = list_budgets(db, month)
     items: list[BudgetStatusItem] = []
@@ -248,15 +257,16 @@ def _category_family_spend(
     db: Session, month: str, category_ids: list[str], scope_user_id: str | None,
 ) -> int:
     """Sum expenses across a set of category IDs (parent + all children)."""
+    T = archive.transactions_for(db, month)
     q = (
-        db.query(func.coalesce(func.sum(Transaction.amount), 0))
+        db.query(func.coalesce(func.sum(T.amount), 0))
         .filter(
-            Transaction.transaction_type == "expense",
-            Transaction.status == "posted",
-            func.strftime("%Y-%m", col_as_jakarta(Transaction.effective_at)) == month,
-            Transaction.category_id.in_(category_ids),
+            T.transaction_type == "expense",
+            T.status == "posted",
+            func.strftime("%Y-%m", col_as_jakarta(T.effective_at)) == month,
+            T.category_id.in_(category_ids),
         )
     )
     if scope_user_id:
-        q = q.filter(Transaction.user_id == scope_user_id)
+        q = q.filter(T.user_id == scope_user_id)
     return int(q.scalar())
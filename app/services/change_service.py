@@ -0,0 +1,136 @@
+"""Change log: small records of ledger writes for the dashboard event stream.
+
+Writers add a ChangeLog row in the same transaction as the change itself,
+so a row becomes visible exactly when the data does, whichever process (API
+or CLI) made the write.  Readers tail the table by id and expand each batch
+into the events pushed to dashboards: the transaction itself, the current
+balances of the accounts it touched, and the budget items it affects.
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models import ChangeLog, Transaction
+from app.schemas import TransactionOut
+from app.services import account_service, budget_service
+from app.tz import now_utc, to_jakarta
+
+TRANSACTION_CREATED = "transaction.created"
+TRANSACTION_VOIDED = "transaction.voided"
+TRANSACTION_CORRECTED = "transaction.corrected"
+BUDGET_UPDATED = "budget.updated"
+
+
+def record_transaction(db: Session, kind: str, txn: Transaction, replaces: int | None = None) -> None:
+    """Log a transaction write; call before the commit that stores *txn*."""
+    if txn.id is None:
+        db.flush()
+    _record(db, kind, {
+        "transaction_id": txn.id,
+        "replaces": replaces,
+        "accounts": [a for a in (txn.from_account_id, txn.to_account_id) if a],
+        "month": to_jakarta(txn.effective_at).strftime("%Y-%m"),
+        "category_id": txn.category_id,
+    })
+
+
+def record_budget(db: Session, month: str, category_ids: list[str]) -> None:
+    """Log budget limit changes; call before the commit that stores them."""
+    if category_ids:
+        _record(db, BUDGET_UPDATED, {"month": month, "category_ids": sorted(category_ids)})
+
+
+def _record(db: Session, kind: str, payload: dict[str, Any]) -> None:
+    db.add(ChangeLog(created_at=now_utc(), kind=kind, payload_json=json.dumps(payload)))
+
+
+def latest_id(db: Session) -> int:
+    return db.query(func.max(ChangeLog.id)).scalar() or 0
+
+
+def changes_since(db: Session, after_id: int, limit: int = 200) -> list[ChangeLog]:
+    return (
+        db.query(ChangeLog)
+        .filter(ChangeLog.id > after_id)
+        .order_by(ChangeLog.id)
+        .limit(limit)
+        .all()
+    )
+
+
+def prune(db: Session, older_than: timedelta) -> int:
+    """Delete entries older than *older_than*; returns how many were removed."""
+    cutoff: datetime = now_utc() - older_than
+    deleted = db.query(ChangeLog).filter(ChangeLog.created_at < cutoff).delete(synchronize_session=False)
+    db.commit()
+    return deleted
+
+
+def expand(db: Session, changes: list[ChangeLog]) -> list[dict[str, Any]]:
+    """Turn a batch of log entries into stream events.
+
+    Each event is ``{"id", "event", "data"}``.  Transaction entries become
+    one ``transaction`` event each; the batch then gets one ``balances``
+    event for every account it touched and one ``budget`` event per month
+    whose budget items changed, all tagged with the batch's last id.
+    """
+    if not changes:
+        return []
+    events: list[dict[str, Any]] = []
+    account_ids: set[str] = set()
+    budget_categories: dict[str, set[str]] = {}
+
+    txn_ids = [json.loads(c.payload_json)["transaction_id"] for c in changes if c.kind != BUDGET_UPDATED]
+    txns = {t.id: t for t in db.query(Transaction).filter(Transaction.id.in_(txn_ids))} if txn_ids else {}
+
+    for change in changes:
+        payload = json.loads(change.payload_json)
+        if change.kind == BUDGET_UPDATED:
+            budget_categories.setdefault(payload["month"], set()).update(payload["category_ids"])
+            continue
+        account_ids.update(payload["accounts"])
+        if payload["category_id"]:
+            budget_categories.setdefault(payload["month"], set()).add(payload["category_id"])
+        txn = txns.get(payload["transaction_id"])
+        events.append({
+            "id": change.id,
+            "event": "transaction",
+            "data": {
+                "action": change.kind.removeprefix("transaction."),
+                "transaction": TransactionOut.model_validate(txn).model_dump(mode="json") if txn else None,
+                "replaces": payload["replaces"],
+                "month": payload["month"],
+            },
+        })
+
+    last_id = changes[-1].id
+    if account_ids:
+        balances = account_service.compute_balances(db)
+        totals = account_service.household_totals(balances)
+        events.append({
+            "id": last_id,
+            "event": "balances",
+            "data": {
+                "balances": [b.model_dump(mode="json") for b in balances if b.account_id in account_ids],
+                "totals": totals.model_dump(mode="json"),
+            },
+        })
+    for month, category_ids in sorted(budget_categories.items()):
+        items, warnings = budget_service.compute_budget_status(db, month)
+        parents = {budget_service.resolve_parent_category(db, cid) or cid for cid in category_ids}
+        events.append({
+            "id": last_id,
+            "event": "budget",
+            "data": {
+                "month": month,
+                "items": [i.model_dump(mode="json") for i in items if i.category_id in parents],
+                "warnings": [w.model_dump(mode="json") for w in warnings],
+            },
+        })
+    return events
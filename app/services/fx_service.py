@@ -0,0 +1,264 @@
+"""Exchange rates: per-base rate tables cached in SQLite behind one pooled client.
+
+The upstream returns every quote currency for a base in one response and
+refreshes daily, so whole tables are cached for settings.fx_ttl_seconds.
+Concurrent misses for the same base in one process share a single fetch;
+other processes (CLI, daemon, API) share the cached rows.  When the upstream
+is unreachable the last known table is served and flagged stale.
+
+Every fetched table is also kept in fx_rates by rate date, so conversions
+for a past date (reports, backfills, audits) are a local index lookup.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import TYPE_CHECKING
+
+from sqlalchemy import func, tuple_
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from app import metrics
+from app.config import settings
+from app.database import has_uncommitted_counters, in_atomic_session
+from app.errors import LedgerHTTPException
+from app.models import FxRate, FxRateTable
+from app.serialization import utc_isoformat
+from app.tz import now_utc
+
+if TYPE_CHECKING:
+    import httpx
+
+_lock = threading.Lock()
+_client: httpx.Client | None = None
+_base_locks: dict[str, threading.Lock] = {}
+
+
+@dataclass(frozen=True)
+class RateTable:
+    base: str
+    rates: dict[str, float]
+    fetched_at: datetime  # naive UTC
+    stale: bool = False
+
+
+def _http_client() -> httpx.Client:
+    global _client
+    if _client is None:
+        import httpx
+
+        with _lock:
+            if _client is None:
+                _client = httpx.Client(timeout=settings.fx_timeout)
+    return _client
+
+
+def _base_lock(base: str) -> threading.Lock:
+    with _lock:
+        return _base_locks.setdefault(base, threading.Lock())
+
+
+def _utcnow() -> datetime:
+    return now_utc().replace(tzinfo=None)
+
+
+def _is_fresh(row: FxRateTable | None) -> bool:
+    return row is not None and _utcnow() - row.fetched_at < timedelta(seconds=settings.fx_ttl_seconds)
+
+
+def _to_table(row: FxRateTable, stale: bool = False) -> RateTable:
+    return RateTable(row.base, json.loads(row.rates_json), row.fetched_at, stale)
+
+
+def _fetch(base: str) -> tuple[dict[str, float], date]:
+    import httpx
+
+    started = time.perf_counter()
+    try:
+        resp = _http_client().get(f"{settings.fx_api_url}/{base}")
+        resp.raise_for_status()
+        data = resp.json()
+    except (httpx.HTTPError, ValueError) as exc:
+        metrics.observe("ledger_fx_fetch_seconds", time.perf_counter() - started, outcome="error")
+        raise LedgerHTTPException(502, "CONVERSION_ERROR", f"Failed to fetch exchange rate: {exc}")
+    metrics.observe("ledger_fx_fetch_seconds", time.perf_counter() - started, outcome="ok")
+
+    if data.get("result") != "success":
+        raise LedgerHTTPException(
+            502, "CONVERSION_ERROR", f"Exchange rate API error: {data.get('error-type', 'unknown')}",
+        )
+    updated = data.get("time_last_update_unix")
+    as_of = datetime.fromtimestamp(updated, timezone.utc).date() if updated else _utcnow().date()
+    return data.get("rates", {}), as_of
+
+
+def _release_connection(db: Session) -> None:
+    """Return *db*'s connection to the pool before a slow upstream call.
+
+    The write engine has a single connection, so holding it through the
+    fetch would queue every API write behind a cache miss.  A session with
+    writes of its own keeps it; rolling back would lose them.
+    """
+    if not (db.new or db.dirty or db.deleted or has_uncommitted_counters(db)):
+        db.rollback()
+
+
+def _record_history(db: Session, base: str, rates: dict[str, float], as_of: date) -> None:
+    if not rates:
+        return
+    stmt = insert(FxRate).values([
+        {"base": base, "quote": quote, "date": as_of, "rate": rate} for quote, rate in rates.items()
+    ])
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[FxRate.base, FxRate.quote, FxRate.date],
+        set_={"rate": stmt.excluded.rate},
+    ))
+
+
+def get_rates(db: Session, base: str) -> RateTable:
+    """Return the rate table for *base*, fetching it when missing or expired.
+
+    Inside ``atomic_session`` nothing is fetched: the cached table is served,
+    stale if need be.
+    """
+    base = base.upper()
+    row = db.get(FxRateTable, base)
+    if _is_fresh(row):
+        metrics.cache_result("fx", "hit")
+        return _to_table(row)
+
+    with _base_lock(base):
+        # Another thread may have refreshed it while we waited.
+        row = db.get(FxRateTable, base, populate_existing=True)
+        if _is_fresh(row):
+            metrics.cache_result("fx", "hit")
+            return _to_table(row)
+
+        fallback = _to_table(row, stale=True) if row is not None else None
+        if in_atomic_session(db):
+            # The write lock is held until the whole batch ends, so a fetch
+            # here would stall every writer; callers warm the cache first.
+            if fallback is None:
+                metrics.cache_result("fx", "miss")
+                raise LedgerHTTPException(
+                    502, "CONVERSION_ERROR", f"No cached {base} rates inside an atomic batch",
+                )
+            metrics.cache_result("fx", "stale")
+            return fallback
+        _release_connection(db)
+        try:
+            rates, as_of = _fetch(base)
+        except LedgerHTTPException:
+            if fallback is None:
+                metrics.cache_result("fx", "miss")
+                raise
+            metrics.cache_result("fx", "stale")
+            return fallback
+        metrics.cache_result("fx", "miss")
+
+        # Another process may have stored the table during the fetch.
+        row = db.get(FxRateTable, base, populate_existing=True)
+        if row is None:
+            row = FxRateTable(base=base)
+            db.add(row)
+        row.rates_json = json.dumps(rates)
+        row.fetched_at = _utcnow()
+        _record_history(db, base, rates, as_of)
+        db.commit()
+        return _to_table(row)
+
+
+def historical_rate(db: Session, base: str, quote: str, on: date) -> tuple[float, date] | None:
+    """Latest stored base->quote rate dated on or before *on*, and its date.
+
+    Falls back to the inverse of a stored quote->base rate.  Never touches
+    the network.
+    """
+    base, quote = base.upper(), quote.upper()
+    if base == quote:
+        return 1.0, on
+    for b, q, invert in ((base, quote, False), (quote, base, True)):
+        row = (
+            db.query(FxRate.rate, FxRate.date)
+            .filter(FxRate.base == b, FxRate.quote == q, FxRate.date <= on)
+            .order_by(FxRate.date.desc())
+            .first()
+        )
+        if row is not None and row.rate:
+            return (1 / row.rate if invert else row.rate), row.date
+    return None
+
+
+def latest_rates(db: Session, pairs: set[tuple[str, str]]) -> dict[tuple[str, str], float]:
+    """Latest stored rate for each (base, quote) pair, in one query.
+
+    Stored inverse pairs are used when the direct pair is missing.  Pairs
+    with no stored rate either way are absent from the result.  Offline.
+    """
+    wanted = {(b, q) for b, q in pairs if b != q}
+    out: dict[tuple[str, str], float] = {(b, q): 1.0 for b, q in pairs if b == q}
+    if not wanted:
+        return out
+    lookup = wanted | {(q, b) for b, q in wanted}
+    # SQLite returns the bare rate column from the row holding MAX(date).
+    rows = (
+        db.query(FxRate.base, FxRate.quote, FxRate.rate, func.max(FxRate.date))
+        .filter(tuple_(FxRate.base, FxRate.quote).in_(lookup))
+        .group_by(FxRate.base, FxRate.quote)
+        .all()
+    )
+    stored = {(b, q): rate for b, q, rate, _ in rows if rate}
+    for b, q in wanted:
+        if (b, q) in stored:
+            out[(b, q)] = stored[(b, q)]
+        elif (q, b) in stored:
+            out[(b, q)] = 1 / stored[(q, b)]
+    return out
+
+
+def convert(
+    db: Session, amount: float, from_currency: str, to_currency: str = "IDR", on: date | None = None,
+) -> dict:
+    """Convert with today's cached table, or offline at the rate for date *on*."""
+    from_code = from_currency.upper()
+    to_code = to_currency.upper()
+
+    if from_code == to_code:
+        return {"from": from_code, "to": to_code, "amount": amount, "rate": 1.0, "result": round(amount)}
+
+    if on is not None:
+        found = historical_rate(db, from_code, to_code, on)
+        if found is None:
+            raise LedgerHTTPException(
+                404, "RATE_NOT_FOUND", f"No stored {from_code}->{to_code} rate on or before {on.isoformat()}",
+            )
+        rate, rate_date = found
+        return {
+            "from": from_code,
+            "to": to_code,
+            "amount": amount,
+            "rate": rate,
+            "result": round(amount * rate),
+            "as_of": rate_date.isoformat(),
+            "stale": False,
+        }
+
+    table = get_rates(db, from_code)
+    if to_code not in table.rates:
+        raise LedgerHTTPException(400, "VALIDATION_ERROR", f"Unknown target currency: {to_code}")
+
+    rate = table.rates[to_code]
+    return {
+        "from": from_code,
+        "to": to_code,
+        "amount": amount,
+        "rate": rate,
+        "result": round(amount * rate),
+        "as_of": utc_isoformat(table.fetched_at),
+        "stale": table.stale,
+    }
@@ -0,0 +1,138 @@
+"""Reference metadata (categories, accounts, users, enums) with a versioned cache.
+
+The payload changes only when categories, accounts or users do, so it is
+built once per reference_version counter value (see app.database) and
+served from memory until the next such write.  Its content hash doubles as
+the version handed to clients for conditional requests.
+
+reference_snapshot() derives the attribute-style objects the dashboard
+templates use from the same payload, once per version.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from app import metrics, serialization
+from app.database import REFERENCE_VERSION, database_key, has_uncommitted_counters, read_counter
+from app.models import Account, Category, User
+from app.schemas import (
+    AccountOut,
+    CategoryChild,
+    CategoryOut,
+    PaymentMethod,
+    TransactionType,
+    UserOut,
+)
+
+_lock = threading.Lock()
+# (engine, reference_version, payload, version)
+_cache: tuple[Any, int, dict[str, Any], str] | None = None
+_snapshot: ReferenceSnapshot | None = None
+
+
+@dataclass(frozen=True)
+class ReferenceSnapshot:
+    """Read-only categories, accounts and users for one metadata version."""
+
+    version: str
+    category_tree: list[dict[str, Any]]  # [{"parent": ns, "children": [ns, ...]}]
+    categories: list[SimpleNamespace]  # every active category, by display_name
+    cat_name_map: dict[str, str]
+    accounts: list[SimpleNamespace]
+    users: list[SimpleNamespace]
+
+
+def _build_payload(db: Session) -> dict[str, Any]:
+    categories = (
+        db.query(Category)
+        .filter(Category.is_active == 1)
+        .order_by(Category.display_name)
+        .all()
+    )
+    children_by_parent: dict[str, list[Category]] = {}
+    for c in categories:
+        if c.parent_id is not None:
+            children_by_parent.setdefault(c.parent_id, []).append(c)
+
+    categories_out = [
+        CategoryOut(
+            id=p.id,
+            display_name=p.display_name,
+            parent_id=None,
+            is_active=bool(p.is_active),
+            children=[CategoryChild.model_validate(c) for c in children_by_parent.get(p.id, [])],
+        ).model_dump(mode="json")
+        for p in categories
+        if p.parent_id is None
+    ]
+
+    accounts = db.query(Account).filter(Account.is_active == 1).order_by(Account.display_name).all()
+    users = db.query(User).order_by(User.display_name).all()
+
+    return {
+        "categories": categories_out,
+        "accounts": [AccountOut.model_validate(a).model_dump(mode="json") for a in accounts],
+        "users": [UserOut.model_validate(u).model_dump(mode="json") for u in users],
+        "payment_methods": [m.value for m in PaymentMethod],
+        "transaction_types": [t.value for t in TransactionType],
+    }
+
+
+def get_metadata(db: Session) -> tuple[dict[str, Any], str]:
+    """Return the metadata payload (without server_time) and its version.
+
+    The payload is shared between callers and must not be mutated.
+    """
+    global _cache
+    engine = database_key(db)
+    counter = read_counter(db, REFERENCE_VERSION)
+    cached = _cache
+    if cached is not None and cached[0] is engine and cached[1] == counter:
+        metrics.cache_result("metadata", "hit")
+        return cached[2], cached[3]
+    metrics.cache_result("metadata", "miss")
+
+    payload = _build_payload(db)
+    version = hashlib.sha256(serialization.dumps(payload)).hexdigest()[:16]
+    if not has_uncommitted_counters(db):
+        with _lock:
+            _cache = (engine, counter, payload, version)
+    return payload, version
+
+
+def reference_snapshot(db: Session) -> ReferenceSnapshot:
+    """Categories, accounts and users as attribute objects, cached per version."""
+    global _snapshot
+    payload, version = get_metadata(db)
+    snapshot = _snapshot
+    if snapshot is not None and snapshot.version == version:
+        return snapshot
+
+    category_tree = []
+    categories = []
+    for parent in payload["categories"]:
+        children = [SimpleNamespace(**c) for c in parent["children"]]
+        parent_ns = SimpleNamespace(**{k: v for k, v in parent.items() if k != "children"})
+        category_tree.append({"parent": parent_ns, "children": children})
+        categories.append(parent_ns)
+        categories.extend(children)
+    categories.sort(key=lambda c: c.display_name)
+
+    snapshot = ReferenceSnapshot(
+        version=version,
+        category_tree=category_tree,
+        categories=categories,
+        cat_name_map={c.id: c.display_name for c in categories},
+        accounts=[SimpleNamespace(**a) for a in payload["accounts"]],
+        users=[SimpleNamespace(**u) for u in payload["users"]],
+    )
+    with _lock:
+        _snapshot = snapshot
+    return snapshot
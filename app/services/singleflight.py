@@ -0,0 +1,94 @@
+"""Single-flight coalescing and a versioned result cache for expensive reads.
+
+Calls with the same function, arguments and ledger data version share one
+computation.  Concurrent callers wait for the first one to finish and
+receive its result (or exception); later callers get the finished result
+from a small LRU until any process writes to the ledger and bumps the data
+version (see app.database), so a dashboard refresh or a bot asking for the
+same summary twice costs one counter check.  Results are shared objects
+and must not be mutated by callers.
+"""
+
+from __future__ import annotations
+
+import functools
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+from sqlalchemy.orm import Session
+
+from app import metrics
+from app.database import DATA_VERSION, database_key, has_uncommitted_counters, read_counter
+
+T = TypeVar("T")
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+_MAX_RESULTS = 128
+
+_lock = threading.Lock()
+_in_flight: dict[tuple, _Call] = {}
+_results: OrderedDict[tuple, Any] = OrderedDict()
+
+
+def coalesce(fn: Callable[..., T]) -> Callable[..., T]:
+    """Decorate a ``fn(db, *args, **kwargs)`` service read."""
+
+    @functools.wraps(fn)
+    def wrapper(db: Session, *args: Any, **kwargs: Any) -> T:
+        # Sessions holding their own unflushed or uncommitted writes see
+        # data no other caller should share.
+        if db.new or db.dirty or db.deleted or has_uncommitted_counters(db):
+            return fn(db, *args, **kwargs)
+        key = (
+            fn, database_key(db), read_counter(db, DATA_VERSION),
+            args, tuple(sorted(kwargs.items())),
+        )
+        try:
+            hash(key)
+        except TypeError:
+            return fn(db, *args, **kwargs)
+
+        with _lock:
+            if key in _results:
+                _results.move_to_end(key)
+                metrics.cache_result("results", "hit")
+                return _results[key]
+            call = _in_flight.get(key)
+            leader = call is None
+            if leader:
+                call = _in_flight[key] = _Call()
+        metrics.cache_result("results", "miss" if leader else "coalesced")
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(db, *args, **kwargs)
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with _lock:
+                del _in_flight[key]
+                if call.error is None:
+                    _results[key] = call.result
+                    if len(_results) > _MAX_RESULTS:
+                        _results.popitem(last=False)
+            call.done.set()
+        return call.result
+
+    return wrapper
@@ -7,7 +7,8 @@ from collections import defaultdict
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
-from app.models import Category, Transaction, User
+from app import archive, metrics
+from app.models import Category, User
 from app.schemas import (
     CategorySpend,
     DailyTotal,
@@ -16,34 +17,38 @@ from app.schemas import (
     UserSpend,
 )
 from app.services import budget_service
+from app.services.singleflight import coalesce
 from app.tz import col_as_jakarta
 
 
+@metrics.timed
+@coalesce
 def monthly_summary(db: Session, month: str, user_id: str | None = None) -> MonthlySummary:
-    posted = Transaction.status == "posted"
-    in_month = func.strftime("%Y-%m", col_as_jakarta(Transaction.effective_at)) == month
+    T = archive.transactions_for(db, month)
+    posted = T.status == "posted"
+    in_month = func.strftime("%Y-%m", col_as_jakarta(T.effective_at)) == month
 
     base_filters = [posted, in_month]
     if user_id:
-        base_filters.append(Transaction.user_id == user_id)
+        base_filters.append(T.user_id == user_id)
 
     total_expenses = int(
-        db.query(func.coalesce(func.sum(Transaction.amount), 0))
-        .filter(*base_filters, Transaction.transaction_type == "expense")
+        db.query(func.coalesce(func.sum(T.amount), 0))
+        .filter(*base_filters, T.transaction_type == "expense")
         .scalar()
     )
 
     total_income = int(
-        db.query(func.coalesce(func.sum(Transaction.amount), 0))
-        .filter(*base_filters, Transaction.transaction_type == "income")
+        db.query(func.coalesce(func.sum(T.amount), 0))
+        .filter(*base_filters, T.transaction_type == "income")
         .scalar()
     )
 
     by_category_rows = (
-        db.query(Transaction.category_id, func.sum(Transaction.amount).label("total"))
-        .filter(*base_filters, Transaction.transaction_type == "expense", Transaction.category_id.isnot(None))
-        .group_by(Transaction.category_id)
-        .order_by(func.sum(Transaction.amount).desc())
+        db.query(T.category_id, func.sum(T.amount).label("total"))
+        .filter(*base_filters, T.transaction_type == "expense", T.category_id.isnot(None))
+        .group_by(T.category_id)
+        .order_by(func.sum(T.amount).desc())
         .all()
     )
     by_category: list[CategorySpend] = []
@@ -58,10 +63,10 @@ def monthly_summary(db: Session, month: str, user_id: str | None = None) -> Mont
     by_parent_category = _roll_up_to_parents(db, by_category)
 
     by_user_rows = (
-        db.query(Transaction.user_id, func.sum(Transaction.amount).label("total"))
-        .filter(*base_filters, Transaction.transaction_type == "expense")
-        .group_by(Transaction.user_id)
-        .order_by(func.sum(Transaction.amount).desc())
+        db.query(T.user_id, func.sum(T.amount).label("total"))
+        .filter(*base_filters, T.transaction_type == "expense")
+        .group_by(T.user_id)
+        .order_by(func.sum(T.amount).desc())
         .all()
     )
     by_user: list[UserSpend] = []
@@ -73,13 +78,13 @@ def monthly_summary(db: Session, month: str, user_id: str | None = None) -> Mont
             total=int(row.total),
         ))
 
-    jkt_effective = col_as_jakarta(Transaction.effective_at)
+    jkt_effective = col_as_jakarta(T.effective_at)
     daily_rows = (
         db.query(
             func.strftime("%Y-%m-%d", jkt_effective).label("date"),
-            func.sum(Transaction.amount).label("total"),
+            func.sum(T.amount).label("total"),
         )
-        .filter(*base_filters, Transaction.transaction_type == "expense")
+        .filter(*base_filters, T.transaction_type == "expense")
         .group_by(func.strftime("%Y-%m-%d", jkt_effective))
         .order_by("date")
         .all()
@@ -87,10 +92,10 @@ def monthly_summary(db: Session, month: str, user_id: str | None = None) -> Mont
     daily_totals = [DailyTotal(date=r.date, total=int(r.total)) for r in daily_rows]
 
     merchant_rows = (
-        db.query(Transaction.merchant, func.sum(Transaction.amount).label("total"), func.count().label("count"))
-        .filter(*base_filters, Transaction.transaction_type == "expense", Transaction.merchant.isnot(None))
-        .group_by(Transaction.merchant)
-        .order_by(func.sum(Transaction.amount).desc())
+        db.query(T.merchant, func.sum(T.amount).label("total"), func.count().label("count"))
+        .filter(*base_filters, T.transaction_type == "expense", T.merchant.isnot(None))
+        .group_by(T.merchant)
+        .order_by(func.sum(T.amount).desc())
         .limit(10)
         .all()
     )
@@ -8,14 +8,16 @@ from datetime import datetime
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
+from app import archive, metrics, serialization
 from app.errors import LedgerHTTPException
 from app.models import Account, Category, Transaction, User
 from app.schemas import ErrorDetail, TransactionCreate, TransactionType
-from app.services import account_service, budget_service
+from app.services import account_service, budget_service, change_service, fx_service
 from app.services.budget_service import get_category_family
 from app.tz import col_as_jakarta, now_utc, resolve_effective_at, to_jakarta, to_utc
 
 
+@metrics.timed
 def create_transaction(db: Session, data: TransactionCreate) -> dict:
     _validate_references(db, data)
 
@@ -28,6 +30,7 @@ def create_transaction(db: Session, data: TransactionCreate) -> dict:
         transaction_type=data.transaction_type.value,
         amount=data.amount,
         currency=data.currency,
+        **_fx_columns(db, data, effective),
         category_id=data.category_id,
         description=data.description,
         merchant=data.merchant,
@@ -40,6 +43,7 @@ def create_transaction(db: Session, data: TransactionCreate) -> dict:
     )
 
     db.add(txn)
+    change_service.record_transaction(db, change_service.TRANSACTION_CREATED, txn)
     db.commit()
     db.refresh(txn)
 
@@ -56,6 +60,25 @@ def create_transaction(db: Session, data: TransactionCreate) -> dict:
     }
 
 
+def _fx_columns(db: Session, data: TransactionCreate, effective: datetime) -> dict:
+    """Original amount, currency and rate for a converted transaction.
+
+    An explicit fx_rate wins; otherwise the stored rate for the effective
+    date is used, and failing that the rate implied by the two amounts.
+    """
+    if data.original_currency is None:
+        return {}
+    rate = data.fx_rate
+    if rate is None:
+        found = fx_service.historical_rate(db, data.original_currency, data.currency, effective.date())
+        rate = found[0] if found else data.amount / data.original_amount
+    return {
+        "original_amount": data.original_amount,
+        "original_currency": data.original_currency,
+        "fx_rate": rate,
+    }
+
+
 def list_transactions(
     db: Session,
     *,
@@ -67,55 +90,116 @@ def list_transactions(
     limit: int = 50,
     offset: int = 0,
 ) -> tuple[list[Transaction], int]:
-    q = db.query(Transaction).filter(Transaction.status == "posted")
+    T = archive.transactions_for(db, month)
+    q = _filter_transactions(
+        db, db.query(T), T,
+        month=month, category_id=category_id, user_id=user_id,
+        account_id=account_id, search=search,
+    )
+    total = q.count()
+    rows = q.order_by(T.effective_at.desc()).limit(limit).offset(offset).all()
+    return rows, total
+
+
+def list_transaction_rows(
+    db: Session,
+    *,
+    month: str | None = None,
+    category_id: str | None = None,
+    user_id: str | None = None,
+    account_id: str | None = None,
+    search: str | None = None,
+    limit: int = 50,
+    offset: int = 0,
+) -> tuple[list[dict], int]:
+    """Same filters as list_transactions, returning JSON-ready dicts.
+
+    Reads plain column tuples instead of ORM objects so API and CLI
+    listings never build a Transaction or a TransactionOut per row.
+    """
+    T = archive.transactions_for(db, month)
+    columns = [getattr(T, f) for f in serialization.TRANSACTION_FIELDS]
+    q = _filter_transactions(
+        db, db.query(*columns), T,
+        month=month, category_id=category_id, user_id=user_id,
+        account_id=account_id, search=search,
+    )
+    total = q.count()
+    rows = q.order_by(T.effective_at.desc()).limit(limit).offset(offset).all()
+    return serialization.transaction_rows(rows), total
+
+
+def _filter_transactions(
+    db: Session,
+    q,
+    T,
+    *,
+    month: str | None,
+    category_id: str | None,
+    user_id: str | None,
+    account_id: str | None,
+    search: str | None,
+):
+    q = q.filter(T.status == "posted")
 
     if month:
-        q = q.filter(func.strftime("%Y-%m", col_as_jakarta(Transaction.effective_at)) == month)
+        q = q.filter(func.strftime("%Y-%m", col_as_jakarta(T.effective_at)) == month)
     if category_id:
         family = get_category_family(db, category_id)
-        q = q.filter(Transaction.category_id.in_(family))
+        q = q.filter(T.category_id.in_(family))
     if user_id:
-        q = q.filter(Transaction.user_id == user_id)
+        q = q.filter(T.user_id == user_id)
     if account_id:
         q = q.filter(
-            (Transaction.from_account_id == account_id)
-            | (Transaction.to_account_id == account_id)
+            (T.from_account_id == account_id)
+            | (T.to_account_id == account_id)
         )
     if search:
         pattern = f"%{search}%"
         q = q.filter(
-            Transaction.description.ilike(pattern)
-            | Transaction.merchant.ilike(pattern)
-            | Transaction.note.ilike(pattern)
+            T.description.ilike(pattern)
+            | T.merchant.ilike(pattern)
+            | T.note.ilike(pattern)
         )
-
-    total = q.count()
-    rows = q.order_by(Transaction.effective_at.desc()).limit(limit).offset(offset).all()
-    return rows, total
+    return q
 
 
 def get_transaction(db: Session, txn_id: int) -> Transaction | None:
-    return db.query(Transaction).filter(Transaction.id == txn_id).first()
+    txn = db.query(Transaction).filter(Transaction.id == txn_id).first()
+    if txn is None and archive.archived_through(db):
+        T = archive.transactions_for(db)
+        txn = db.query(T).filter(T.id == txn_id).first()
+    return txn
+
+
+def _get_for_update(db: Session, txn_id: int, not_found: str) -> Transaction:
+    """The hot row for *txn_id*; archived transactions are read-only."""
+    txn = db.query(Transaction).filter(Transaction.id == txn_id).first()
+    if txn is not None:
+        return txn
+    if get_transaction(db, txn_id) is not None:
+        raise LedgerHTTPException(
+            409, "TRANSACTION_ARCHIVED", "Transaction is in an archived month and can no longer be changed",
+        )
+    raise LedgerHTTPException(404, "NOT_FOUND", not_found)
 
 
 def void_transaction(db: Session, txn_id: int) -> Transaction:
-    txn = get_transaction(db, txn_id)
-    if txn is None:
-        raise LedgerHTTPException(404, "NOT_FOUND", "Transaction not found")
+    txn = _get_for_update(db, txn_id, "Transaction not found")
     if txn.status == "voided":
         raise LedgerHTTPException(400, "ALREADY_VOIDED", "Transaction is already voided")
     txn.status = "voided"
+    change_service.record_transaction(db, change_service.TRANSACTION_VOIDED, txn)
     db.commit()
     db.refresh(txn)
     return txn
 
 
 def correct_transaction(db: Session, txn_id: int, data: TransactionCreate) -> dict:
-    original = get_transaction(db, txn_id)
-    if original is None:
-        raise LedgerHTTPException(404, "NOT_FOUND", "Original transaction not found")
+    original = _get_for_update(db, txn_id, "Original transaction not found")
 
     original.status = "voided"
+    change_service.record_transaction(db, change_service.TRANSACTION_VOIDED, original)
     db.flush()
 
     _validate_references(db, data)
@@ -127,6 +211,7 @@ def correct_transaction(db: Session, txn_id: int, data: TransactionCreate) -> di
         transaction_type=data.transaction_type.value,
         amount=data.amount,
         currency=data.currency,
+        **_fx_columns(db, data, effective),
         category_id=data.category_id,
         description=data.description,
         merchant=data.merchant,
@@ -139,6 +224,7 @@ def correct_transaction(db: Session, txn_id: int, data: TransactionCreate) -> di
         metadata_json=json.dumps(data.metadata) if data.metadata else None,
     )
     db.add(new_txn)
+    change_service.record_transaction(db, change_service.TRANSACTION_CORRECTED, new_txn, replaces=txn_id)
     db.commit()
     db.refresh(new_txn)
 
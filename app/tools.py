@@ -0,0 +1,779 @@
+"""Agent tool functions and the batch executor.
+
+Each tool wraps the service layer and returns plain JSON-ready values, so
+the same calls serve the CLI, the daemon and MCP mode (``mcp_server.py``)
+and the REST batch endpoint (``POST /v1/batch``).
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any
+
+# mcp_server.py imports this module in every fresh CLI process, so only the
+# standard library is imported at module level; see tests/test_startup.py.
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+# Set while a batch runs so every tool in it shares the batch's session.
+_batch_session: ContextVar[Any] = ContextVar("_batch_session", default=None)
+
+
+@contextmanager
+def _db():
+    shared = _batch_session.get()
+    if shared is not None:
+        yield shared
+        return
+
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@contextmanager
+def _read_db():
+    """Session on the read-only engine, for tools that never write.
+
+    Inside a batch the batch's session is used so reads see its writes.
+    """
+    shared = _batch_session.get()
+    if shared is not None:
+        yield shared
+        return
+
+    from app.database import ReadSessionLocal
+
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def _serialize_txn(txn) -> dict:
+    from app.schemas import TransactionOut
+
+    return TransactionOut.model_validate(txn).model_dump(mode="json")
+
+
+def _error_dict(code: str, message: str, details: list[dict] | None = None) -> dict:
+    return {"error": {"code": code, "message": message, "details": details or []}}
+
+
+def _run_tool(fn, *args, **kwargs) -> dict | list | Any:
+    """Call a service function, catching Ledger-specific exceptions."""
+    from app.errors import LedgerHTTPException, NeedsClarificationError
+
+    try:
+        return fn(*args, **kwargs)
+    except NeedsClarificationError as exc:
+        return _error_dict(
+            "NEEDS_CLARIFICATION",
+            exc.message,
+            [d.model_dump(exclude_none=True) for d in exc.details],
+        )
+    except LedgerHTTPException as exc:
+        return _error_dict(
+            exc.code,
+            exc.error_message,
+            [d.model_dump(exclude_none=True) for d in exc.details],
+        )
+
+
+# ---------------------------------------------------------------------------
+# Transaction tools
+# ---------------------------------------------------------------------------
+
+
+def create_transaction(
+    user_id: str,
+    transaction_type: str,
+    amount: float,
+    category_id: str | None = None,
+    from_account_id: str | None = None,
+    to_account_id: str | None = None,
+    description: str | None = None,
+    merchant: str | None = None,
+    payment_method: str | None = None,
+    effective_at: str | None = None,
+    timezone: str | None = None,
+    note: str | None = None,
+    metadata: dict | None = None,
+    currency: str = "IDR",
+    original_amount: float | None = None,
+    original_currency: str | None = None,
+    fx_rate: float | None = None,
+) -> dict:
+    """Create a financial transaction (expense, income, transfer, or adjustment).
+
+    Returns the created transaction with its integer ID, updated account
+    balances, budget status, and any warnings.
+
+    Required fields by type:
+    - expense: user_id, amount, category_id, from_account_id
+    - income: user_id, amount, to_account_id
+    - transfer: user_id, amount, from_account_id, to_account_id
+    - adjustment: user_id, amount
+
+    Send effective_at as ISO 8601 naive local time (no offset) with timezone
+    as an IANA name (e.g. "Asia/Jakarta"). The backend converts to UTC.
+    Omit both to default to now.
+
+    For foreign-currency spending, pass the converted IDR amount as amount
+    plus original_amount, original_currency and the fx_rate returned by
+    convert_currency.
+    """
+    from app.errors import NeedsClarificationError
+    from app.schemas import PaymentMethod, TransactionCreate, TransactionType
+    from app.services import transaction_service
+
+    with _db() as db:
+        ea = datetime.fromisoformat(effective_at) if effective_at else None
+        try:
+            data = TransactionCreate(
+                user_id=user_id,
+                transaction_type=TransactionType(transaction_type),
+                amount=amount,
+                currency=currency,
+                original_amount=original_amount,
+                original_currency=original_currency,
+                fx_rate=fx_rate,
+                category_id=category_id,
+                from_account_id=from_account_id,
+                to_account_id=to_account_id,
+                description=description,
+                merchant=merchant,
+                payment_method=PaymentMethod(payment_method) if payment_method else None,
+                effective_at=ea,
+                timezone=timezone,
+                note=note,
+                metadata=metadata,
+            )
+        except NeedsClarificationError as exc:
+            return _error_dict(
+                "NEEDS_CLARIFICATION",
+                exc.message,
+                [d.model_dump(exclude_none=True) for d in exc.details],
+            )
+        except Exception as exc:
+            return _error_dict("VALIDATION_ERROR", str(exc))
+
+        result = _run_tool(transaction_service.create_transaction, db, data)
+        if isinstance(result, dict) and "error" in result:
+            return result
+
+        return {
+            "transaction": _serialize_txn(result["transaction"]),
+            "balances": [b.model_dump(mode="json") for b in result["balances"]],
+            "budget_status": [b.model_dump(mode="json") for b in result["budget_status"]],
+            "warnings": [w.model_dump(mode="json") for w in result["warnings"]],
+        }
+
+
+def list_transactions(
+    month: str | None = None,
+    user_id: str | None = None,
+    category_id: str | None = None,
+    account_id: str | None = None,
+    search: str | None = None,
+    limit: int = 50,
+    offset: int = 0,
+) -> dict:
+    """List transactions with optional filters.
+
+    month: YYYY-MM format. category_id: filter by category (includes
+    subcategories). limit: 1-200, default 50.
+    """
+    from app.services import transaction_service
+
+    with _read_db() as db:
+        result = _run_tool(
+            transaction_service.list_transaction_rows,
+            db,
+            month=month,
+            user_id=user_id,
+            category_id=category_id,
+            account_id=account_id,
+            search=search,
+            limit=min(limit, 200),
+            offset=max(offset, 0),
+        )
+        if isinstance(result, dict) and "error" in result:
+            return result
+
+        rows, total = result
+        return {
+            "transactions": rows,
+            "total": total,
+            "limit": limit,
+            "offset": offset,
+        }
+
+
+def get_transaction(txn_id: int) -> dict:
+    """Get a single transaction by its integer ID."""
+    from app.services import transaction_service
+
+    with _read_db() as db:
+        txn = transaction_service.get_transaction(db, txn_id)
+        if txn is None:
+            return _error_dict("NOT_FOUND", "Transaction not found")
+        return _serialize_txn(txn)
+
+
+def void_transaction(txn_id: int) -> dict:
+    """Void (cancel) a transaction. Irreversible — sets status to 'voided'."""
+    from app.services import transaction_service
+
+    with _db() as db:
+        result = _run_tool(transaction_service.void_transaction, db, txn_id)
+        if isinstance(result, dict) and "error" in result:
+            return result
+        return _serialize_txn(result)
+
+
+def correct_transaction(
+    txn_id: int,
+    user_id: str,
+    transaction_type: str,
+    amount: float,
+    category_id: str | None = None,
+    from_account_id: str | None = None,
+    to_account_id: str | None = None,
+    description: str | None = None,
+    merchant: str | None = None,
+    payment_method: str | None = None,
+    effective_at: str | None = None,
+    timezone: str | None = None,
+    note: str | None = None,
+    metadata: dict | None = None,
+    currency: str = "IDR",
+    original_amount: float | None = None,
+    original_currency: str | None = None,
+    fx_rate: float | None = None,
+) -> dict:
+    """Correct a transaction: voids the original and creates a replacement.
+
+    Fetch the original first with get_transaction, copy ALL fields, then
+    override only the fields the user wants to change.  The body schema
+    is identical to create_transaction.
+    """
+    from app.errors import NeedsClarificationError
+    from app.schemas import PaymentMethod, TransactionCreate, TransactionType
+    from app.services import transaction_service
+
+    with _db() as db:
+        ea = datetime.fromisoformat(effective_at) if effective_at else None
+        try:
+            data = TransactionCreate(
+                user_id=user_id,
+                transaction_type=TransactionType(transaction_type),
+                amount=amount,
+                currency=currency,
+                original_amount=original_amount,
+                original_currency=original_currency,
+                fx_rate=fx_rate,
+                category_id=category_id,
+                from_account_id=from_account_id,
+                to_account_id=to_account_id,
+                description=description,
+                merchant=merchant,
+                payment_method=PaymentMethod(payment_method) if payment_method else None,
+                effective_at=ea,
+                timezone=timezone,
+                note=note,
+                metadata=metadata,
+            )
+        except NeedsClarificationError as exc:
+            return _error_dict(
+                "NEEDS_CLARIFICATION",
+                exc.message,
+                [d.model_dump(exclude_none=True) for d in exc.details],
+            )
+        except Exception as exc:
+            return _error_dict("VALIDATION_ERROR", str(exc))
+
+        result = _run_tool(transaction_service.correct_transaction, db, txn_id, data)
+        if isinstance(result, dict) and "error" in result:
+            return result
+
+        return {
+            "transaction": _serialize_txn(result["transaction"]),
+            "balances": [b.model_dump(mode="json") for b in result["balances"]],
+            "budget_status": [b.model_dump(mode="json") for b in result["budget_status"]],
+            "warnings": [w.model_dump(mode="json") for w in result["warnings"]],
+        }
+
+
+# ---------------------------------------------------------------------------
+# Account tools
+# ---------------------------------------------------------------------------
+
+
+def list_accounts(user_id: str | None = None) -> list[dict]:
+    """List accounts, optionally filtered by user_id (owner).
+
+    You can send just the display name (e.g. "Cash", "BCA") as an account
+    ID when creating transactions — the backend resolves it to the user's
+    own prefixed account automatically.
+    """
+    from app.schemas import AccountOut
+    from app.services import account_service
+
+    with _read_db() as db:
+        accounts = account_service.list_accounts(db, owner_id=user_id)
+        return [AccountOut.model_validate(a).model_dump(mode="json") for a in accounts]
+
+
+def get_account_balances(user_id: str | None = None) -> list[dict]:
+    """Get current balance for each active account.
+
+    Omit user_id for household-wide balances.
+    """
+    from app.services import account_service
+
+    with _read_db() as db:
+        balances = account_service.compute_balances(db, owner_id=user_id)
+        return [b.model_dump(mode="json") for b in balances]
+
+
+def create_account(
+    id: str,
+    display_name: str,
+    type: str,
+    owner_id: str | None = None,
+    currency: str = "IDR",
+) -> dict:
+    """Create a new account.
+
+    id: unique ID, convention is owner_SHORTNAME (e.g. 'fazrin_DANA').
+    type: bank | cash | ewallet | credit_card | other.
+    owner_id: user who owns this account.
+    """
+    from app.models import User
+    from app.schemas import AccountOut
+    from app.services import account_service
+
+    with _db() as db:
+        existing = account_service.get_account(db, id)
+        if existing:
+            return _error_dict("DUPLICATE", f"Account '{id}' already exists")
+
+        if owner_id and not db.query(User).filter(User.id == owner_id).first():
+            db.add(User(id=owner_id, display_name=owner_id))
+            db.flush()
+
+        result = _run_tool(
+            account_service.create_account,
+            db, id, display_name, type, currency, owner_id,
+        )
+        if isinstance(result, dict) and "error" in result:
+            return result
+
+        return AccountOut.model_validate(result).model_dump(mode="json")
+
+
+def adjust_account_balance(
+    account_id: str,
+    amount: float,
+    user_id: str,
+    note: str | None = None,
+) -> dict:
+    """Adjust an account's balance directly.
+
+    Positive amount = credit (add money), negative = debit (remove money).
+    Creates an adjustment transaction under the hood.
+    """
+    from app.models import Transaction, User
+    from app.services import account_service, change_service
+    from app.tz import now_utc
+
+    with _db() as db:
+        acct = account_service.get_account(db, account_id)
+        if not acct:
+            return _error_dict("NOT_FOUND", f"Account '{account_id}' not found")
+
+        if not db.query(User).filter(User.id == user_id).first():
+            db.add(User(id=user_id, display_name=user_id))
+            db.flush()
+
+        txn = Transaction(
+            effective_at=now_utc(),
+            user_id=user_id,
+            transaction_type="adjustment",
+            amount=abs(round(amount)),
+            currency=acct.currency,
+            description=f"Balance adjustment for {acct.display_name}",
+            to_account_id=account_id if amount >= 0 else None,
+            from_account_id=account_id if amount < 0 else None,
+            note=note,
+            status="posted",
+        )
+        db.add(txn)
+        change_service.record_transaction(db, change_service.TRANSACTION_CREATED, txn)
+        db.commit()
+
+        return account_service.account_balance(db, acct).model_dump(mode="json")
+
+
+# ---------------------------------------------------------------------------
+# Budget tools
+# ---------------------------------------------------------------------------
+
+
+def upsert_budget(
+    month: str,
+    category_id: str,
+    limit_amount: int,
+    scope_user_id: str | None = None,
+) -> dict:
+    """Set or update a budget for a parent category in a given month.
+
+    month: YYYY-MM format. category_id must be a parent category (e.g.
+    'food', not 'groceries'). scope_user_id: null = household budget.
+    """
+    from app.models import Category
+    from app.schemas import BudgetOut
+    from app.services import budget_service
+
+    with _db() as db:
+        cat = db.query(Category).filter(Category.id == category_id).first()
+        if not cat:
+            return _error_dict("NOT_FOUND", f"Category '{category_id}' not found")
+        if cat.parent_id is not None:
+            return _error_dict(
+                "VALIDATION_ERROR",
+                f"Budgets must target a parent category. "
+                f"'{category_id}' is a subcategory of '{cat.parent_id}'.",
+            )
+
+        result = _run_tool(
+            budget_service.upsert_budget,
+            db,
+            month=month,
+            category_id=category_id,
+            limit_amount=limit_amount,
+            scope_user_id=scope_user_id,
+        )
+        if isinstance(result, dict) and "error" in result:
+            return result
+
+        return BudgetOut.model_validate(result).model_dump(mode="json")
+
+
+def list_budgets(month: str) -> list[dict]:
+    """List all budgets for a month (YYYY-MM)."""
+    from app.schemas import BudgetOut
+    from app.services import budget_service
+
+    with _read_db() as db:
+        budgets = budget_service.list_budgets(db, month)
+        return [BudgetOut.model_validate(b).model_dump(mode="json") for b in budgets]
+
+
+def get_budget_status(month: str | None = None) -> dict:
+    """Get budget usage, remaining amount, percent, and warnings per category.
+
+    Defaults to the current month if omitted.
+    """
+    from app.services import budget_service
+    from app.tz import now_jakarta
+
+    with _read_db() as db:
+        if not month:
+            month = now_jakarta().strftime("%Y-%m")
+        items, warnings = budget_service.compute_budget_status(db, month)
+        return {
+            "month": month,
+            "budgets": [i.model_dump(mode="json") for i in items],
+            "warnings": [w.model_dump(mode="json") for w in warnings],
+        }
+
+
+def get_budget_history(month: str, limit: int = 50) -> list[dict]:
+    """Get budget change history for a month."""
+    from app.schemas import BudgetSnapshotOut
+    from app.services import budget_service
+
+    with _read_db() as db:
+        snaps = budget_service.list_snapshots(db, month, limit=min(limit, 200))
+        return [BudgetSnapshotOut.model_validate(s).model_dump(mode="json") for s in snaps]
+
+
+# ---------------------------------------------------------------------------
+# Summary & metadata tools
+# ---------------------------------------------------------------------------
+
+
+def get_monthly_summary(month: str | None = None, user_id: str | None = None) -> dict:
+    """Get a spending summary for a month.
+
+    Returns total expenses, total income, net, breakdown by category
+    and user, daily totals, top merchants, budget status, and warnings.
+    Omit user_id for household-wide summary.
+    """
+    from app.services import summary_service
+    from app.tz import now_jakarta
+
+    with _read_db() as db:
+        if not month:
+            month = now_jakarta().strftime("%Y-%m")
+        result = summary_service.monthly_summary(db, month, user_id=user_id)
+        return result.model_dump(mode="json")
+
+
+def get_metadata(since_version: str | None = None) -> dict:
+    """Get all categories, accounts, users, payment methods, transaction
+    types, and the current server time.
+
+    Call this to discover valid IDs and to get the current date/time
+    for resolving relative time expressions like 'yesterday'.  Pass the
+    'version' from an earlier reply as since_version to get just
+    {"unchanged": true, "version", "server_time"} when nothing changed.
+    """
+    from app.services import meta_service
+    from app.tz import now_jakarta
+
+    with _read_db() as db:
+        payload, version = meta_service.get_metadata(db)
+
+    server_time = now_jakarta().isoformat()
+    if since_version == version:
+        return {"unchanged": True, "version": version, "server_time": server_time}
+    return {**payload, "version": version, "server_time": server_time}
+
+
+def convert_currency(
+    amount: float,
+    from_currency: str,
+    to_currency: str = "IDR",
+    date: str | None = None,
+) -> dict:
+    """Convert an amount from one currency to another using daily exchange rates.
+
+    Always use this for foreign currency amounts (AUD, USD, SGD, etc.)
+    before logging a transaction.  Use the 'result' field directly as
+    the IDR amount — never calculate the conversion yourself.  Pass date
+    (YYYY-MM-DD) to convert offline at the stored rate for that day.
+    """
+    from datetime import date as date_cls
+
+    from app.services import fx_service
+
+    try:
+        on = date_cls.fromisoformat(date) if date else None
+    except ValueError:
+        return _error_dict("VALIDATION_ERROR", f"Invalid date: {date!r} (expected YYYY-MM-DD)")
+
+    with _db() as db:
+        return _run_tool(fx_service.convert, db, amount, from_currency, to_currency, on)
+
+
+def health_check() -> dict:
+    """Check if the Ledger backend is operational."""
+    return {"status": "ok"}
+
+
+# ---------------------------------------------------------------------------
+# Batch execution
+# ---------------------------------------------------------------------------
+
+_BATCH_LIMIT = 50
+
+
+class _RefError(Exception):
+    pass
+
+
+class _BatchAborted(Exception):
+    pass
+
+
+def _lookup_ref(ref: str, results: list, step_ids: dict[str, int]) -> Any:
+    """Resolve "<step>.<path>" against earlier results, e.g. "0.transaction.id"."""
+    step, _, path = str(ref).partition(".")
+    if step in step_ids:
+        index = step_ids[step]
+    elif step.isdigit():
+        index = int(step)
+    else:
+        raise _RefError(f"Unknown step '{step}' in reference '{ref}'")
+    if index >= len(results):
+        raise _RefError(f"Reference '{ref}' points at a step that has not run yet")
+
+    value = results[index]
+    if isinstance(value, dict) and "error" in value:
+        raise _RefError(f"Reference '{ref}' points at a step that failed")
+    for key in filter(None, path.split(".")):
+        try:
+            value = value[int(key)] if isinstance(value, list) else value[key]
+        except (KeyError, IndexError, TypeError, ValueError):
+            raise _RefError(f"Reference '{ref}' not found in step {index} result") from None
+    return value
+
+
+def _resolve_refs(value: Any, results: list, step_ids: dict[str, int]) -> Any:
+    """Replace every {"$ref": "<step>.<path>"} in a call's args."""
+    if isinstance(value, dict):
+        if set(value) == {"$ref"}:
+            return _lookup_ref(value["$ref"], results, step_ids)
+        return {k: _resolve_refs(v, results, step_ids) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_resolve_refs(v, results, step_ids) for v in value]
+    return value
+
+
+def _run_batch_steps(db, calls: list[dict], atomic: bool) -> list:
+    results: list = []
+    step_ids: dict[str, int] = {}
+
+    for index, call in enumerate(calls):
+        if not isinstance(call, dict):
+            call = {}
+        tool_name = call.get("tool")
+        if call.get("id") is not None:
+            step_ids[str(call["id"])] = index
+
+        if tool_name not in TOOL_REGISTRY or tool_name == "batch":
+            result = _error_dict("UNKNOWN_TOOL", f"Unknown tool in batch: {tool_name}")
+        else:
+            try:
+                kwargs = _resolve_refs(call.get("args") or {}, results, step_ids)
+                result = TOOL_REGISTRY[tool_name](**kwargs)
+            except _RefError as exc:
+                result = _error_dict("REF_ERROR", str(exc))
+            except TypeError as exc:
+                result = _error_dict("ARG_ERROR", str(exc))
+            except Exception as exc:
+                result = _error_dict("INTERNAL_ERROR", str(exc))
+
+        results.append(result)
+        if isinstance(result, dict) and "error" in result:
+            # Drop whatever the failed step flushed so the next commit
+            # (or the batch's own) does not pick it up.
+            db.rollback()
+            if atomic:
+                raise _BatchAborted(results)
+
+    return results
+
+
+def _prefetch_rates(calls: list[dict], db=None) -> None:
+    """Warm the FX cache for an atomic batch's convert_currency calls.
+
+    Runs before the batch takes the write lock, which it then holds until it
+    ends; inside it fx_service serves cached rates only.  Failures are left
+    for the convert_currency step itself to report.
+    """
+    from app.errors import LedgerHTTPException
+    from app.services import fx_service
+
+    bases = set()
+    for call in calls:
+        args = call.get("args") if isinstance(call, dict) and call.get("tool") == "convert_currency" else None
+        if not isinstance(args, dict) or args.get("date") or not isinstance(args.get("from_currency"), str):
+            continue
+        base = args["from_currency"].upper()
+        if base != str(args.get("to_currency", "IDR")).upper():
+            bases.add(base)
+    if not bases:
+        return
+
+    with (nullcontext(db) if db is not None else _db()) as session:
+        for base in sorted(bases):
+            try:
+                fx_service.get_rates(session, base)
+            except LedgerHTTPException:
+                pass
+
+
+def run_batch(calls: list[dict], atomic: bool = False, db=None) -> dict:
+    """Run several tool calls in one database session; see ``batch``.
+
+    Non-atomic batches share *db* (a fresh session when omitted).  Atomic
+    batches open their own transaction on *db*'s engine (the write engine
+    when omitted).
+    """
+    if not isinstance(calls, list) or not calls:
+        return _error_dict("VALIDATION_ERROR", "calls must be a non-empty list")
+    if len(calls) > _BATCH_LIMIT:
+        return _error_dict("VALIDATION_ERROR", f"A batch may contain at most {_BATCH_LIMIT} calls")
+    if _batch_session.get() is not None:
+        return _error_dict("VALIDATION_ERROR", "Batches cannot be nested")
+
+    if atomic:
+        from app.database import atomic_session
+
+        _prefetch_rates(calls, db)
+        session_scope = atomic_session(db.get_bind() if db is not None else None)
+    elif db is not None:
+        session_scope = nullcontext(db)
+    else:
+        session_scope = _db()
+
+    try:
+        with session_scope as session:
+            token = _batch_session.set(session)
+            try:
+                results = _run_batch_steps(session, calls, atomic)
+            finally:
+                _batch_session.reset(token)
+    except _BatchAborted as aborted:
+        results = aborted.args[0]
+        skipped = _error_dict("ROLLED_BACK", "Not run: an earlier call in this atomic batch failed")
+        results = results + [skipped] * (len(calls) - len(results))
+        return {"results": results, "committed": False}
+
+    return {"results": results, "committed": True}
+
+
+def batch(calls: list[dict], atomic: bool = False) -> dict:
+    """Run several tool calls in one process and one database session.
+
+    Each call is {"tool": "<tool_name>", "args": {...}} with an optional
+    "id".  Args may reference an earlier call's result with
+    {"$ref": "<index or id>.<path>"}, e.g. {"$ref": "0.transaction.id"}.
+
+    Returns {"results": [...], "committed": bool} with one result per call.
+    With atomic=true all calls run in one transaction: the first error
+    rolls everything back, later calls are skipped, and committed is false.
+    Exchange rates for its convert_currency calls are fetched before the
+    transaction starts; a currency given by $ref must already be cached.
+    """
+    return run_batch(calls, atomic)
+
+
+# ---------------------------------------------------------------------------
+# Registry
+# ---------------------------------------------------------------------------
+
+TOOL_REGISTRY: dict[str, Any] = {
+    "create_transaction": create_transaction,
+    "list_transactions": list_transactions,
+    "get_transaction": get_transaction,
+    "void_transaction": void_transaction,
+    "correct_transaction": correct_transaction,
+    "list_accounts": list_accounts,
+    "get_account_balances": get_account_balances,
+    "create_account": create_account,
+    "adjust_account_balance": adjust_account_balance,
+    "upsert_budget": upsert_budget,
+    "list_budgets": list_budgets,
+    "get_budget_status": get_budget_status,
+    "get_budget_history": get_budget_history,
+    "get_monthly_summary": get_monthly_summary,
+    "get_metadata": get_metadata,
+    "convert_currency": convert_currency,
+    "health_check": health_check,
+    "batch": batch,
+}
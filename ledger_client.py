@@ -0,0 +1,76 @@
+"""Thin client for the Ledger daemon.
+
+The ``ledger`` wrapper runs this instead of ``mcp_server.py`` so a bot step
+costs one bare interpreter start plus a Unix socket round-trip, not a full
+import of the service layer.  Only the standard library is imported here.
+
+If the daemon is not reachable the call is handed to ``mcp_server.py`` in
+CLI mode, so the wrapper keeps working when the daemon is down.  The
+fallback only happens when nothing was sent: a daemon that dies mid-call
+reports an error instead of running a (possibly) non-idempotent tool twice.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+
+SOCKET_ENV = "LEDGER_DAEMON_SOCKET"
+DEFAULT_SOCKET = "./data/ledgerd.sock"
+
+_CONNECT_TIMEOUT = 0.5
+_REPLY_TIMEOUT = 120
+# Modes and admin commands that run in their own process: backups, vacuums
+# and archive runs can outlast _REPLY_TIMEOUT and should not tie up a daemon
+# worker.
+_LOCAL_ONLY = {"--mcp", "--daemon", "backup", "maintenance", "archive"}
+
+
+def socket_path() -> str:
+    return os.environ.get(SOCKET_ENV, DEFAULT_SOCKET)
+
+
+def call_daemon(argv: list[str], path: str | None = None) -> tuple[str, int] | None:
+    """Forward argv to the daemon and return (stdout, exit_code).
+
+    Returns None if the daemon could not be reached.
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(_CONNECT_TIMEOUT)
+        try:
+            sock.connect(path or socket_path())
+        except OSError:
+            return None
+
+        sock.settimeout(_REPLY_TIMEOUT)
+        try:
+            sock.sendall(json.dumps({"argv": argv}).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as reader:
+                reply = json.loads(reader.readline())
+            return reply["stdout"], int(reply["exit_code"])
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            error = {"error": {"code": "DAEMON_ERROR", "message": f"Ledger daemon failed: {exc}", "details": []}}
+            return json.dumps(error), 1
+    finally:
+        sock.close()
+
+
+def main() -> None:
+    argv = sys.argv[1:]
+    if not (argv and argv[0] in _LOCAL_ONLY):
+        reply = call_daemon(argv)
+        if reply is not None:
+            output, exit_code = reply
+            print(output)
+            sys.exit(exit_code)
+
+    server = Path(__file__).with_name("mcp_server.py")
+    os.execv(sys.executable, [sys.executable, str(server), *argv])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""Benchmark: latency of cheap endpoints while heavy summaries are running.
+
+Starts uvicorn against a throwaway database filled with synthetic
+transactions, measures /health, /login and /v1/meta alone, then again while
+a few clients hammer /v1/summary/monthly.  With database work on the worker
+pool the cheap endpoints should stay in the low milliseconds under load; a
+handler that blocks the event loop shows up as a p99 close to the summary's
+own latency.
+
+Usage:
+    python scripts/bench_concurrency.py
+    python scripts/bench_concurrency.py --transactions 500000 --heavy-clients 8 --seconds 10
+"""
+
+import argparse
+import os
+import random
+import socket
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+API_KEY = "bench"
+MONTH = "2026-02"
+CHEAP_PATHS = ["/health", "/login", "/v1/meta"]
+HEAVY_PATH = f"/v1/summary/monthly?month={MONTH}"
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _start_server(db_path: Path, port: int, threads: int) -> subprocess.Popen:
+    env = dict(os.environ, LEDGER_DB_PATH=str(db_path), LEDGER_API_KEY=API_KEY,
+               LEDGER_DB_THREADS=str(threads))
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, env=env,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/health", timeout=1)
+            return proc
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    proc.kill()
+    raise SystemExit("server did not start")
+
+
+def _fill(db_path: Path, count: int) -> None:
+    conn = sqlite3.connect(db_path)
+    categories = [r[0] for r in conn.execute("SELECT id FROM categories WHERE parent_id IS NOT NULL")]
+    accounts = [r[0] for r in conn.execute("SELECT id FROM accounts WHERE owner_id = 'fazrin'")]
+    rng = random.Random(42)
+    rows = (
+        (f"{MONTH}-{rng.randint(1, 28):02d} {rng.randint(0, 23):02d}:00:00", "fazrin", "expense",
+         rng.randint(1, 500) * 1000, "IDR", rng.choice(categories), rng.choice(accounts), "posted")
+        for _ in range(count)
+    )
+    with conn:
+        conn.executemany(
+            "INSERT INTO transactions (effective_at, created_at, user_id, transaction_type, amount,"
+            " currency, category_id, from_account_id, status)"
+            " VALUES (?, datetime('now'), ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+    conn.close()
+
+
+def _sample(client: httpx.Client, seconds: float) -> list[float]:
+    latencies = []
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        for path in CHEAP_PATHS:
+            start = time.perf_counter()
+            client.get(path)
+            latencies.append((time.perf_counter() - start) * 1000)
+        time.sleep(0.01)
+    return latencies
+
+
+def _hammer(base_url: str, stop: threading.Event, latencies: list[float]) -> None:
+    with httpx.Client(base_url=base_url, headers={"X-API-Key": API_KEY}, timeout=120) as client:
+        while not stop.is_set():
+            start = time.perf_counter()
+            client.get(HEAVY_PATH).raise_for_status()
+            latencies.append((time.perf_counter() - start) * 1000)
+
+
+def _report(label: str, latencies: list[float]) -> None:
+    ordered = sorted(latencies)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(f"  {label:<24} n={len(ordered):<6} p50={statistics.median(ordered):8.1f} ms"
+          f"  p99={p99:8.1f} ms  max={ordered[-1]:8.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--transactions", type=int, default=200_000)
+    parser.add_argument("--heavy-clients", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--threads", type=int, default=8, help="LEDGER_DB_THREADS for the server")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.db"
+        port = _free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        proc = _start_server(db_path, port, args.threads)
+        try:
+            print(f"Filling {args.transactions:,} transactions...")
+            _fill(db_path, args.transactions)
+
+            with httpx.Client(base_url=base_url, headers={"X-API-Key": API_KEY}, timeout=120) as client:
+                print("Cheap endpoints, idle server:")
+                _report("cheap", _sample(client, args.seconds))
+
+                stop = threading.Event()
+                heavy: list[float] = []
+                workers = [
+                    threading.Thread(target=_hammer, args=(base_url, stop, heavy))
+                    for _ in range(args.heavy_clients)
+                ]
+                for w in workers:
+                    w.start()
+                time.sleep(0.5)
+                print(f"Cheap endpoints, {args.heavy_clients} clients looping {HEAVY_PATH}:")
+                _report("cheap", _sample(client, args.seconds))
+                stop.set()
+                for w in workers:
+                    w.join()
+                _report("summary (heavy)", heavy)
+        finally:
+            proc.terminate()
+            proc.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Benchmark: write throughput and summary latency per SQLite profile.
+
+For each profile in app.database.SQLITE_PROFILES, creates a throwaway
+database and measures single-row commits per second (the fsync cost the
+profile controls), committed create_transaction calls per second (each one
+a separate transaction with its balance and budget recomputation, like bot
+writes), and bulk-fill speed, then times monthly summaries over the filled
+history.  Durability differences only show up on power loss, so read the
+numbers next to the profile descriptions in app/database.py.
+
+Usage:
+    python scripts/bench_sqlite_profiles.py
+    python scripts/bench_sqlite_profiles.py --profiles durable balanced --writes 5000 --transactions 500000
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.database import SQLITE_PROFILES, bump_counters, configure_sqlite  # noqa: E402
+from app.schemas import TransactionCreate, TransactionType  # noqa: E402
+from app.seed import ensure_database  # noqa: E402
+from app.services import singleflight, summary_service, transaction_service  # noqa: E402
+
+MONTH = "2026-02"
+
+
+def _engine(db_path: Path, profile: str):
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    event.listen(engine, "connect", lambda conn, _rec: configure_sqlite(conn, profile))
+    return engine
+
+
+def _commits(engine, count: int) -> float:
+    raw = engine.raw_connection()
+    try:
+        start = time.perf_counter()
+        for _ in range(count):
+            raw.execute("INSERT INTO ledger_meta (key, value) VALUES ('bench', 1)"
+                        " ON CONFLICT(key) DO UPDATE SET value = value + 1")
+            raw.commit()
+        return count / (time.perf_counter() - start)
+    finally:
+        raw.close()
+
+
+def _writes(engine, count: int) -> float:
+    data = TransactionCreate(
+        user_id="fazrin", transaction_type=TransactionType.expense, amount=25000,
+        category_id="coffee", from_account_id="fazrin_BCA",
+    )
+    start = time.perf_counter()
+    with Session(engine) as db:
+        for _ in range(count):
+            transaction_service.create_transaction(db, data)
+    return count / (time.perf_counter() - start)
+
+
+def _fill(engine, count: int) -> float:
+    rng = random.Random(42)
+    with engine.connect() as conn:
+        categories = list(conn.scalars(text("SELECT id FROM categories WHERE parent_id IS NOT NULL")))
+        accounts = list(conn.scalars(text("SELECT id FROM accounts WHERE owner_id = 'fazrin'")))
+        rows = [
+            (f"{MONTH}-{rng.randint(1, 28):02d} {rng.randint(0, 23):02d}:00:00", "fazrin", "expense",
+             rng.randint(1, 500) * 1000, "IDR", rng.choice(categories), rng.choice(accounts), "posted")
+            for _ in range(count)
+        ]
+        start = time.perf_counter()
+        conn.exec_driver_sql(
+            "INSERT INTO transactions (effective_at, created_at, user_id, transaction_type, amount,"
+            " currency, category_id, from_account_id, status)"
+            " VALUES (?, datetime('now'), ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        bump_counters(conn, {"transactions"})
+        conn.commit()
+        return count / (time.perf_counter() - start)
+
+
+def _summaries(engine, count: int) -> list[float]:
+    latencies = []
+    with Session(engine) as db:
+        for _ in range(count):
+            singleflight._results.clear()  # time the queries, not a cache hit
+            start = time.perf_counter()
+            summary_service.monthly_summary(db, MONTH)
+            latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profiles", nargs="+", choices=sorted(SQLITE_PROFILES), default=list(SQLITE_PROFILES))
+    parser.add_argument("--writes", type=int, default=1000, help="commits per write test")
+    parser.add_argument("--transactions", type=int, default=200_000, help="bulk-filled history rows")
+    parser.add_argument("--summaries", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'profile':<10} {'commits/s':>10} {'writes/s':>10} {'fill rows/s':>12}"
+          f" {'summary p50':>12} {'summary max':>12}")
+    for profile in args.profiles:
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = _engine(Path(tmp) / "bench.db", profile)
+            ensure_database(engine)
+            commits = _commits(engine, args.writes)
+            writes = _writes(engine, args.writes)
+            fill = _fill(engine, args.transactions)
+            latencies = _summaries(engine, args.summaries)
+            engine.dispose()
+        print(f"{profile:<10} {commits:>10.0f} {writes:>10.0f} {fill:>12.0f}"
+              f" {statistics.median(latencies):>9.1f} ms {max(latencies):>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
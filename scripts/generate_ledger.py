@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""Generate a large, realistic ledger for benchmarks and performance tests.
+
+Creates a new database with the default users, categories and accounts
+(seed.ensure_database), extra users with their own accounts, household and
+per-user budgets for every month, and the requested number of transactions
+spread evenly over the months up to --end:
+
+- expenses (most rows) with per-category amounts, merchants, payment
+  methods, the occasional note, and foreign-currency purchases converted at
+  a drifting rate (mostly AUD for users in Sydney);
+- incomes (salaries, freelance, other), transfers between a user's own
+  accounts, and balance adjustments;
+- voided rows, and corrections: a voided original plus the posted row that
+  replaces it, as correct_transaction writes them.
+
+Users alternate between Asia/Jakarta and Australia/Sydney (fazrin and
+magfira use their configured zones), and times are drawn in the user's
+local day before being stored as UTC.  Budgets are set near each month's
+actual spend, so some are exceeded and some are not.
+
+Rows are written with one executemany per month on the `fast` profile; the
+same arguments always produce the same users, accounts, budgets and
+transactions.  Tests use generate() through the ``large_ledger`` fixture in
+tests/conftest.py.
+
+Usage:
+    python scripts/generate_ledger.py data/bench.db
+    python scripts/generate_ledger.py /tmp/big.db --transactions 5000000 --users 4 --years 5 --end 2026-09
+"""
+
+import argparse
+import calendar
+import json
+import math
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import create_engine, event
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.database import bump_counters, configure_sqlite  # noqa: E402
+from app.seed import ensure_database  # noqa: E402
+from app.tz import USER_TIMEZONES, now_jakarta  # noqa: E402
+
+TIMEZONES = ("Asia/Jakarta", "Australia/Sydney")
+
+# Accounts for generated users, as seed._seed_accounts creates them for the defaults.
+ACCOUNTS = [("BCA", "BCA", "bank"), ("JAGO", "Jago", "bank"), ("CASH", "Cash", "cash"), ("GOPAY", "GoPay", "ewallet")]
+
+# Expense category: (relative frequency, amount range in IDR, merchants).
+EXPENSES: dict[str, tuple[float, tuple[int, int], tuple[str, ...]]] = {
+    "groceries": (12, (40_000, 1_200_000), ("Superindo", "Hero", "Ranch Market", "Alfamart", "Indomaret", "Woolworths")),
+    "eating_out": (14, (30_000, 450_000), ("Sate Khas Senayan", "Solaria", "Hokben", "Bakmi GM", "Pho Hoa")),
+    "coffee": (14, (18_000, 85_000), ("Kopi Kenangan", "Starbucks", "Janji Jiwa", "Fore Coffee", "Tanamera")),
+    "delivery": (8, (25_000, 300_000), ("GoFood", "GrabFood", "ShopeeFood")),
+    "fuel": (5, (100_000, 600_000), ("Pertamina", "Shell", "BP")),
+    "parking": (5, (2_000, 50_000), ("Secure Parking", "Parkee")),
+    "toll": (4, (5_000, 120_000), ("Jasa Marga",)),
+    "public_transport": (4, (3_500, 30_000), ("KRL", "MRT Jakarta", "TransJakarta", "Opal")),
+    "ride_hailing": (8, (12_000, 150_000), ("Gojek", "Grab", "Uber")),
+    "electricity": (1, (300_000, 2_500_000), ("PLN",)),
+    "water": (1, (80_000, 400_000), ("PAM Jaya",)),
+    "internet": (1, (300_000, 800_000), ("IndiHome", "Biznet", "First Media")),
+    "phone": (1, (50_000, 300_000), ("Telkomsel", "XL", "Optus")),
+    "gas_lpg": (1, (20_000, 250_000), ("Pertamina LPG",)),
+    "subscriptions": (2, (50_000, 300_000), ("Netflix", "Spotify", "YouTube Premium", "iCloud")),
+    "rent": (0.3, (3_000_000, 12_000_000), ()),
+    "furnishing": (1, (100_000, 5_000_000), ("IKEA", "Informa", "Ace Hardware")),
+    "maintenance": (1, (50_000, 2_000_000), ("Mitra10", "Depo Bangunan")),
+    "cleaning": (1, (50_000, 400_000), ("Bersihin", "Go-Clean")),
+    "clothing": (2, (100_000, 2_000_000), ("Uniqlo", "Zara", "H&M", "Erigo")),
+    "electronics": (0.7, (200_000, 15_000_000), ("Erafone", "iBox", "JB Hi-Fi", "Tokopedia")),
+    "household_items": (3, (20_000, 600_000), ("Shopee", "Tokopedia", "Kmart")),
+    "medical": (1, (150_000, 3_000_000), ("Siloam", "Mayapada", "RS Pondok Indah")),
+    "pharmacy": (2, (20_000, 400_000), ("Kimia Farma", "Guardian", "Chemist Warehouse")),
+    "gym": (1, (150_000, 900_000), ("Fitness First", "Celebrity Fitness", "Anytime Fitness")),
+    "movies": (1.5, (40_000, 250_000), ("CGV", "XXI", "Cinepolis")),
+    "games": (1, (15_000, 900_000), ("Steam", "PlayStation Store", "Nintendo eShop")),
+    "hobbies": (1, (50_000, 1_500_000), ("Gramedia", "Tokopedia")),
+    "outings": (2, (50_000, 1_000_000), ("Dufan", "Ancol", "Taronga Zoo")),
+    "car_service": (0.4, (300_000, 4_000_000), ("Auto2000", "Shop & Drive")),
+    "car_insurance": (0.1, (2_000_000, 8_000_000), ("Asuransi Astra",)),
+    "car_tax": (0.1, (1_500_000, 6_000_000), ("Samsat",)),
+    "haircut": (1, (30_000, 250_000), ("Barbershop", "Johnny Andrean")),
+    "skincare": (1.5, (50_000, 800_000), ("Sociolla", "Sephora")),
+    "courses": (0.3, (200_000, 5_000_000), ("Coursera", "Udemy")),
+    "books": (1, (50_000, 400_000), ("Gramedia", "Periplus", "Kinokuniya")),
+    "gifts_items": (1, (100_000, 2_000_000), ()),
+    "charity": (0.5, (50_000, 1_000_000), ("Kitabisa", "Dompet Dhuafa")),
+    "zakat": (0.2, (250_000, 5_000_000), ("BAZNAS",)),
+    "gold": (0.3, (1_000_000, 10_000_000), ("Antam", "Pegadaian")),
+    "stock": (0.3, (1_000_000, 20_000_000), ("Stockbit", "Ajaib")),
+    "bond": (0.1, (1_000_000, 10_000_000), ("Bibit",)),
+    "saving": (0.5, (500_000, 5_000_000), ()),
+}
+INCOMES = {"salary": (8_000_000, 30_000_000), "freelance": (1_000_000, 12_000_000), "other_income": (50_000, 2_000_000)}
+# Share of each transaction type, in order; the rest are adjustments.
+TYPE_SHARES = (("expense", 0.86), ("transfer", 0.07), ("income", 0.05))
+# Local hour of day: few at night, peaks at lunch and in the evening.
+HOUR_WEIGHTS = (1, 1, 1, 1, 1, 2, 4, 8, 10, 9, 8, 10, 14, 12, 9, 8, 9, 11, 14, 13, 11, 8, 5, 2)
+# IDR per unit at the first month; drifts over the years.
+FX = {"AUD": 10_500.0, "USD": 15_500.0, "SGD": 11_500.0}
+NOTES = ("split with magfira", "reimbursable", "birthday", "weekly shop", "promo", "paid for both", "office",
+         "trip", "monthly", "forgot to log yesterday")
+PAYMENT_METHODS = {"bank": ("debit", "qris", "bank_transfer", "credit"), "cash": ("cash",), "ewallet": ("ewallet", "qris")}
+
+VOID_SHARE = 0.015
+CORRECTION_SHARE = 0.01
+
+_INSERT_TRANSACTIONS = (
+    "INSERT INTO transactions (id, created_at, effective_at, user_id, transaction_type, amount, currency,"
+    " original_amount, original_currency, fx_rate, category_id, description, merchant, payment_method,"
+    " from_account_id, to_account_id, note, status, correction_of)"
+    " VALUES (?, ?, ?, ?, ?, ?, 'IDR', ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+# Positions in _Month.rows, which are the INSERT's columns after id.
+_CREATED, _EFFECTIVE, _USER, _TYPE, _AMOUNT, _CATEGORY, _STATUS, _CORRECTION_OF = 0, 1, 2, 3, 4, 8, 15, 16
+
+
+def _months(end: str, years: int) -> list[tuple[int, int]]:
+    year, month = int(end[:4]), int(end[5:7])
+    last = year * 12 + month - 1
+    return [(i // 12, i % 12 + 1) for i in range(last - years * 12 + 1, last + 1)]
+
+
+def _last_month() -> str:
+    now = now_jakarta()
+    return f"{now.year - 1}-12" if now.month == 1 else f"{now.year}-{now.month - 1:02d}"
+
+
+def _ts(value: datetime) -> str:
+    # The format SQLAlchemy's DateTime stores, so range filters compare correctly.
+    return value.isoformat(" ", "microseconds")
+
+
+def _amount(rng: random.Random, low: int, high: int) -> int:
+    # Log-uniform: small purchases far more common than large ones.
+    value = math.exp(rng.uniform(math.log(low), math.log(high)))
+    return max(500, int(round(value / 500)) * 500)
+
+
+class _Month:
+    """Transaction rows for one month, built in local time and stored as UTC."""
+
+    def __init__(self, rng, year, month, users, accounts, month_index):
+        self.rng = rng
+        self.year, self.month = year, month
+        self.days = calendar.monthrange(year, month)[1]
+        self.users = users
+        self.accounts = accounts
+        self.rates = {code: rate * (1 + 0.04 * math.sin(month_index / 5)) for code, rate in FX.items()}
+        self.rows: list[list] = []
+
+    def _when(self, tz: ZoneInfo) -> tuple[datetime, datetime]:
+        rng = self.rng
+        local = datetime(self.year, self.month, rng.randint(1, self.days),
+                         rng.choices(range(24), HOUR_WEIGHTS)[0], rng.randrange(60), rng.randrange(60), tzinfo=tz)
+        effective = local.astimezone(timezone.utc).replace(tzinfo=None)
+        created = effective + timedelta(seconds=int(rng.expovariate(1 / 1800)))
+        return created, effective
+
+    def add(self) -> int:
+        """Add one transaction, or a voided original and its correction; returns the row count."""
+        rng = self.rng
+        user_id, tz = rng.choice(self.users)
+        created, effective = self._when(tz)
+        accounts = self.accounts[user_id]
+        kind = rng.random()
+        for transaction_type, share in TYPE_SHARES:
+            if kind < share:
+                break
+            kind -= share
+        else:
+            transaction_type = "adjustment"
+
+        original_amount = original_currency = fx_rate = category = description = merchant = note = None
+        from_account = to_account = None
+        if transaction_type == "expense":
+            category = rng.choices(_EXPENSE_IDS, _EXPENSE_WEIGHTS)[0]
+            _, (low, high), merchants = EXPENSES[category]
+            amount = _amount(rng, low, high)
+            merchant = rng.choice(merchants) if merchants and rng.random() < 0.85 else None
+            account_id, account_type = rng.choice(accounts)
+            from_account = account_id
+            payment_method = rng.choice(PAYMENT_METHODS[account_type])
+            abroad = 0.35 if tz.key == "Australia/Sydney" else 0.02
+            if rng.random() < abroad:
+                original_currency = "AUD" if tz.key == "Australia/Sydney" else rng.choice(("USD", "SGD"))
+                fx_rate = round(self.rates[original_currency], 2)
+                original_amount = round(amount / fx_rate, 2)
+                amount = int(round(original_amount * fx_rate))
+            description = merchant or category.replace("_", " ").capitalize()
+        elif transaction_type == "income":
+            category = rng.choices(("salary", "freelance", "other_income"), (2, 3, 5))[0]
+            amount = _amount(rng, *INCOMES[category])
+            to_account = rng.choice([a for a in accounts if a[1] == "bank"])[0]
+            payment_method = "bank_transfer"
+            description = category.replace("_", " ").capitalize()
+        elif transaction_type == "transfer":
+            (from_account, _), (to_account, _) = rng.sample(accounts, 2)
+            amount = _amount(rng, 50_000, 5_000_000)
+            payment_method = "bank_transfer"
+            description = f"Top up {to_account.split('_', 1)[1]}"
+        else:
+            account_id = rng.choice(accounts)[0]
+            amount = _amount(rng, 1_000, 300_000)
+            if rng.random() < 0.5:
+                to_account = account_id
+            else:
+                from_account = account_id
+            payment_method = None
+            description = "Balance adjustment"
+        if rng.random() < 0.12:
+            note = rng.choice(NOTES)
+
+        status = "voided" if rng.random() < VOID_SHARE else "posted"
+        row = [created, effective, user_id, transaction_type, amount, original_amount, original_currency, fx_rate,
+               category, description, merchant, payment_method, from_account, to_account, note, status, None]
+        self.rows.append(row)
+        if transaction_type != "expense" or status == "voided" or rng.random() >= CORRECTION_SHARE:
+            return 1
+        row[_STATUS] = "voided"
+        correction = list(row)
+        correction[_CREATED] = created + timedelta(hours=rng.randint(1, 72))
+        correction[_AMOUNT] = _amount(rng, max(500, amount // 2), amount * 2)
+        correction[_STATUS] = "posted"
+        correction[_CORRECTION_OF] = row  # replaced by the original's id once ids are assigned
+        self.rows.append(correction)
+        return 2
+
+    def insert_rows(self, first_id: int) -> list[tuple]:
+        """Rows in created order with ids from *first_id*, ready for executemany."""
+        self.rows.sort(key=lambda row: row[_CREATED])
+        ids = {id(row): first_id + n for n, row in enumerate(self.rows)}
+        return [
+            (ids[id(row)], _ts(row[_CREATED]), _ts(row[_EFFECTIVE]), *row[_EFFECTIVE + 1:_CORRECTION_OF],
+             ids[id(row[_CORRECTION_OF])] if row[_CORRECTION_OF] else None)
+            for row in self.rows
+        ]
+
+
+_EXPENSE_IDS = list(EXPENSES)
+_EXPENSE_WEIGHTS = [EXPENSES[c][0] for c in _EXPENSE_IDS]
+
+
+def generate(
+    path: str | Path,
+    transactions: int = 1_000_000,
+    users: int = 2,
+    years: int = 3,
+    end: str | None = None,
+    seed: int = 42,
+) -> dict:
+    """Create a generated ledger at *path*, which must not exist yet.
+
+    *end* (YYYY-MM, default last month) is the newest month with data.
+    Returns counts and timings.
+    """
+    path = Path(path)
+    if path.exists():
+        raise FileExistsError(f"Refusing to overwrite {path}")
+    end = end or _last_month()
+    started = time.perf_counter()
+    rng = random.Random(seed)
+
+    engine = create_engine(f"sqlite:///{path}")
+    event.listen(engine, "connect", lambda conn, _rec: configure_sqlite(conn, "fast"))
+    ensure_database(engine)
+
+    user_ids = ["fazrin", "magfira"] + [f"user{n:02d}" for n in range(3, users + 1)]
+    user_ids = user_ids[:max(users, 1)]
+    zones = {uid: ZoneInfo(USER_TIMEZONES.get(uid, TIMEZONES[n % 2])) for n, uid in enumerate(user_ids)}
+    months = _months(end, years)
+    since = datetime(*months[0], 1)
+
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "INSERT OR IGNORE INTO users (id, display_name, created_at) VALUES (?, ?, ?)",
+            [(uid, uid.capitalize(), _ts(since)) for uid in user_ids],
+        )
+        conn.exec_driver_sql(
+            "INSERT OR IGNORE INTO accounts (id, display_name, type, currency, owner_id, is_active, created_at)"
+            " VALUES (?, ?, ?, 'IDR', ?, 1, ?)",
+            [(f"{uid}_{suffix}", name, kind, uid, _ts(since)) for uid in user_ids for suffix, name, kind in ACCOUNTS],
+        )
+        accounts = {uid: [] for uid in user_ids}
+        for account_id, kind, owner in conn.exec_driver_sql(
+            "SELECT id, type, owner_id FROM accounts WHERE is_active = 1 ORDER BY id"
+        ):
+            if owner in accounts:
+                accounts[owner].append((account_id, kind))
+        parents = dict(conn.exec_driver_sql("SELECT id, parent_id FROM categories WHERE parent_id IS NOT NULL").all())
+
+    next_id = 1
+    counts = {"expense": 0, "income": 0, "transfer": 0, "adjustment": 0}
+    voided = corrections = budgets = 0
+    user_pairs = [(uid, zones[uid]) for uid in user_ids]
+    with engine.connect() as conn:
+        for index, (year, month) in enumerate(months):
+            target = transactions * (index + 1) // len(months) - transactions * index // len(months)
+            batch = _Month(rng, year, month, user_pairs, accounts, index)
+            added = 0
+            while added < target:
+                added += batch.add()
+            rows = batch.insert_rows(next_id)
+            next_id += len(rows)
+            conn.exec_driver_sql(_INSERT_TRANSACTIONS, rows)
+
+            spend: dict[tuple[str, str | None], int] = {}
+            for row in batch.rows:
+                counts[row[_TYPE]] += 1
+                voided += row[_STATUS] == "voided"
+                corrections += row[_CORRECTION_OF] is not None
+                if row[_TYPE] == "expense" and row[_STATUS] == "posted":
+                    category, amount = row[_CATEGORY], row[_AMOUNT]
+                    parent = parents[category]
+                    spend[(parent, None)] = spend.get((parent, None), 0) + amount
+                    if category in ("coffee", "eating_out"):
+                        user_id = row[_USER]
+                        spend[(category, user_id)] = spend.get((category, user_id), 0) + amount
+            label = f"{year:04d}-{month:02d}"
+            budget_rows = [
+                (label, category, max(100_000, int(round(total * rng.uniform(0.8, 1.3), -5))), scope, _ts(since), _ts(since))
+                for (category, scope), total in sorted(spend.items(), key=lambda item: (item[0][0], item[0][1] or ""))
+            ]
+            conn.exec_driver_sql(
+                "INSERT INTO budgets (month, category_id, limit_amount, scope_user_id, created_at, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                budget_rows,
+            )
+            budgets += len(budget_rows)
+            conn.commit()
+
+        bump_counters(conn, {"users", "accounts", "budgets", "transactions"})
+        conn.exec_driver_sql("PRAGMA analysis_limit=1000")
+        conn.exec_driver_sql("ANALYZE")
+        conn.commit()
+    engine.dispose()
+
+    seconds = time.perf_counter() - started
+    return {
+        "path": str(path),
+        "months": f"{months[0][0]:04d}-{months[0][1]:02d}..{end}",
+        "users": len(user_ids),
+        "accounts": sum(len(a) for a in accounts.values()),
+        "budgets": budgets,
+        "transactions": next_id - 1,
+        "by_type": counts,
+        "voided": voided,
+        "corrections": corrections,
+        "seconds": round(seconds, 1),
+        "rows_per_second": round((next_id - 1) / seconds),
+        "bytes": path.stat().st_size,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", help="database file to create")
+    parser.add_argument("--transactions", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=2)
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--end", help="newest month, YYYY-MM (default: last month)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    try:
+        result = generate(args.path, args.transactions, args.users, args.years, args.end, args.seed)
+    except FileExistsError as exc:
+        raise SystemExit(str(exc))
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,31 +5,56 @@ Previously the app stored naive datetimes using now_jakarta(), so the raw values
 in SQLite represent Jakarta local time.  After the UTC-storage change, the app
 reads them as UTC, causing a +7 hour shift.
 
-This script subtracts 7 hours from every datetime column to correct that.
+This script subtracts 7 hours from every datetime column to correct that.  It
+runs as batched data migrations (app.data_migration): short transactions that
+leave room for the app's writers, with progress recorded in the database, so
+an interrupted run can simply be started again and continues where it
+stopped without shifting any row twice.
 
 Usage:
     python scripts/migrate_to_utc.py              # uses default ./data/ledger.db
     python scripts/migrate_to_utc.py /path/to.db  # explicit path
 
-A backup is created automatically before any changes (*.pre-utc-migration.bak).
+A backup is created automatically before any changes (*.pre-utc-migration.bak);
+a resumed run keeps the existing one.
 """
 
-import shutil
 import sqlite3
 import sys
 from pathlib import Path
 
+from sqlalchemy import create_engine, event
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.config import settings  # noqa: E402
+from app.data_migration import DataMigration, run_migration  # noqa: E402
+from app.database import configure_sqlite  # noqa: E402
+
 OFFSET = "-7 hours"
 
-COLUMNS_TO_MIGRATE = [
-    ("transactions", "effective_at"),
-    ("transactions", "created_at"),
-    ("users", "created_at"),
-    ("accounts", "created_at"),
-    ("budgets", "created_at"),
-    ("budgets", "updated_at"),
-    ("budget_snapshots", "created_at"),
-]
+COLUMNS_TO_MIGRATE = {
+    "transactions": ("effective_at", "created_at"),
+    "users": ("created_at",),
+    "accounts": ("created_at",),
+    "budgets": ("created_at", "updated_at"),
+    "budget_snapshots": ("created_at",),
+}
+
+
+def _migration(table: str, columns: tuple[str, ...]) -> DataMigration:
+    assignments = ", ".join(f"{column} = datetime({column}, '{OFFSET}')" for column in columns)
+    # rowid, not id: users and accounts have text ids, which new rows need
+    # not sort after, so only rowid bounds the run to the rows there at start.
+    return DataMigration(
+        name=f"utc_timestamps:{table}",
+        table=table,
+        apply=f"UPDATE {table} SET {assignments} WHERE rowid BETWEEN :low AND :high",
+        key="rowid",
+    )
+
+
+MIGRATIONS = [_migration(table, columns) for table, columns in COLUMNS_TO_MIGRATE.items()]
 
 
 def migrate(db_path: str) -> None:
@@ -39,32 +64,34 @@ def migrate(db_path: str) -> None:
         sys.exit(1)
 
     backup = path.with_suffix(".pre-utc-migration.bak")
-    print(f"Backing up  {path}  →  {backup}")
-    shutil.copy2(path, backup)
-
-    conn = sqlite3.connect(str(path))
-    cur = conn.cursor()
-
+    if backup.exists():
+        print(f"Backup exists, resuming  ({backup})")
+    else:
+        print(f"Backing up  {path}  →  {backup}")
+        src, dst = sqlite3.connect(path), sqlite3.connect(backup)
+        try:
+            src.backup(dst)  # consistent copy, including committed WAL content
+        finally:
+            dst.close()
+            src.close()
+
+    engine = create_engine(f"sqlite:///{path}")
+    event.listen(engine, "connect", lambda conn, _rec: configure_sqlite(conn, settings.db_profile))
     total_affected = 0
-    for table, column in COLUMNS_TO_MIGRATE:
-        cur.execute(f"SELECT COUNT(*) FROM {table} WHERE {column} IS NOT NULL")
-        count = cur.fetchone()[0]
-        if count == 0:
-            print(f"  {table}.{column:15s}  — no rows, skipped")
-            continue
-
-        cur.execute(
-            f"UPDATE {table} SET {column} = datetime({column}, ?) WHERE {column} IS NOT NULL",
-            (OFFSET,),
-        )
-        affected = cur.rowcount
-        total_affected += affected
-        print(f"  {table}.{column:15s}  — {affected} rows shifted by {OFFSET}")
-
-    conn.commit()
-    conn.close()
-
-    print(f"\nDone. {total_affected} total values migrated to UTC.")
+    with engine.connect() as conn:
+        for migration in MIGRATIONS:
+            result = run_migration(conn, migration)
+            total_affected += result["rows"]
+            if result["batches"] == 0 and result["total_rows"]:
+                note = "already migrated"
+            elif result["rows"] == 0:
+                note = "no rows, skipped"
+            else:
+                note = f"{result['rows']} rows shifted by {OFFSET}" + (" (resumed)" if result["resumed"] else "")
+            print(f"  {migration.table:17s}  — {note}")
+    engine.dispose()
+
+    print(f"\nDone. {total_affected} rows migrated to UTC.")
     print(f"Backup saved at: {backup}")
 
 
@@ -7,6 +7,9 @@ With the MCP upgrade, the bot calls typed tools (create_transaction,
 get_account_balances, etc.) instead of generating raw curl commands.
 Tests assert on tool call names and arguments directly.
 
+Also holds the database, API client and daemon fixtures shared by the
+integration tests.
+
 Requirements:
     pip install openai pytest python-dotenv
 
@@ -482,6 +485,146 @@ def llm():
     return openai.OpenAI(**kwargs)
 
 
+@pytest.fixture(scope="session")
+def large_ledger(tmp_path_factory):
+    """A generated ledger for performance tests: (path, generate() summary).
+
+    Three users, three years of data ending 2026-09; LEDGER_PERF_TRANSACTIONS
+    sets the number of transactions (default 20000).  Built once per session.
+    """
+    from scripts.generate_ledger import generate
+
+    path = tmp_path_factory.mktemp("large_ledger") / "ledger.db"
+    transactions = int(os.environ.get("LEDGER_PERF_TRANSACTIONS", 20_000))
+    return path, generate(path, transactions, users=3, end="2026-09")
+
+
+@pytest.fixture()
+def db():
+    """Create a fresh in-memory database for each test."""
+    from sqlalchemy import create_engine, event
+    from sqlalchemy.orm import sessionmaker
+
+    from app.database import Base
+    from app.seed import seed_defaults
+
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_conn, _connection_record):
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    session = Session()
+
+    seed_defaults(session)
+
+    yield session
+
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture()
+def _patch_db(db, monkeypatch):
+    """Monkey-patch the tools' _db() context manager to use the test session."""
+    from contextlib import contextmanager
+
+    @contextmanager
+    def _test_db():
+        yield db
+
+    from app import tools
+    monkeypatch.setattr(tools, "_db", _test_db)
+    monkeypatch.setattr(tools, "_read_db", _test_db)
+
+
+@pytest.fixture()
+def client():
+    """TestClient over a seeded in-memory database.
+
+    Endpoints run in a worker thread, so the engine uses StaticPool to share
+    its single connection (and therefore its data) across threads.
+    """
+    from fastapi.testclient import TestClient
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+
+    from app.config import settings
+    from app.database import Base, get_db, get_read_db
+    from app.main import app
+    from app.seed import seed_defaults
+
+    engine = create_engine(
+        "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)()
+    seed_defaults(session)
+
+    app.dependency_overrides[get_db] = lambda: session
+    app.dependency_overrides[get_read_db] = lambda: session
+    yield TestClient(app, headers={"X-API-Key": settings.api_key})
+    app.dependency_overrides.clear()
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture()
+def daemon(tmp_path, _patch_db, monkeypatch):
+    """A ledger daemon on a temporary socket, served from a background thread."""
+    import threading
+
+    import mcp_server
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "metrics_file", str(tmp_path / "metrics.json"))
+    path = str(tmp_path / "ledgerd.sock")
+    server = mcp_server._make_daemon_server(path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield path
+    server.shutdown()
+    server.server_close()
+
+
+# ---------------------------------------------------------------------------
+# Database helpers
+# ---------------------------------------------------------------------------
+
+
+def ensure_user(db, user_id="fazrin", display_name="Fazrin"):
+    from app.models import User
+
+    if not db.query(User).filter(User.id == user_id).first():
+        db.add(User(id=user_id, display_name=display_name))
+        db.commit()
+
+
+def ensure_account(db, account_id, display_name, owner_id, acct_type="bank"):
+    from app.models import Account
+
+    if not db.query(Account).filter(Account.id == account_id).first():
+        ensure_user(db, owner_id, owner_id)
+        db.add(Account(id=account_id, display_name=display_name, type=acct_type, owner_id=owner_id))
+        db.commit()
+
+
+def seed_test_accounts(db):
+    """Create the standard test accounts for fazrin."""
+    ensure_user(db, "fazrin", "Fazrin")
+    for aid, name, atype in [
+        ("fazrin_BCA", "BCA", "bank"),
+        ("fazrin_JAGO", "Jago", "bank"),
+        ("fazrin_CASH", "Cash", "cash"),
+    ]:
+        ensure_account(db, aid, name, "fazrin", atype)
+
+
 # ---------------------------------------------------------------------------
 # Bot interaction
 # ---------------------------------------------------------------------------
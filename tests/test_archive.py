@@ -0,0 +1,145 @@
+"""Tests for the archive tier (app/archive.py).
+
+Run:
+    pytest tests/test_archive.py -v
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.orm import Session
+
+from app import archive, backup
+from app.database import configure_sqlite
+from app.errors import LedgerHTTPException
+from app.models import Budget, Transaction
+from app.services import account_service, summary_service, transaction_service
+from app.seed import ensure_database
+from app.tz import now_jakarta, now_utc
+
+
+@pytest.fixture()
+def engine(tmp_path, monkeypatch):
+    monkeypatch.setattr(archive.settings, "archive_path", str(tmp_path / "archive.db"))
+    engine = create_engine(f"sqlite:///{tmp_path / 'ledger.db'}", connect_args={"check_same_thread": False})
+    event.listen(engine, "connect", lambda conn, _rec: configure_sqlite(conn, "durable"))
+    ensure_database(engine)
+    with Session(engine) as db:
+        _add(db, datetime(2025, 1, 10), "income", 1_000_000, to_account_id="fazrin_BCA")
+        _add(db, datetime(2025, 1, 12), "expense", 20_000, from_account_id="fazrin_BCA", category_id="coffee")
+        _add(db, datetime(2025, 1, 15), "expense", 30_000, from_account_id="fazrin_BCA", category_id="coffee",
+             merchant="Kopi")
+        _add(db, datetime(2025, 2, 3), "expense", 99_000, from_account_id="fazrin_BCA", status="voided")
+        _add(db, now_utc().replace(tzinfo=None), "expense", 5_000, from_account_id="fazrin_BCA",
+             category_id="coffee")
+        db.add(Budget(month="2025-01", category_id="food", limit_amount=100_000))
+        db.commit()
+    yield engine
+    engine.dispose()
+
+
+def _add(db, effective_at, transaction_type, amount, **fields):
+    txn = Transaction(effective_at=effective_at, user_id="fazrin", transaction_type=transaction_type,
+                      amount=amount, currency="IDR", status=fields.pop("status", "posted"), **fields)
+    db.add(txn)
+    db.flush()
+    return txn
+
+
+def _views(db):
+    summary = summary_service.monthly_summary(db, "2025-01")
+    rows, total = transaction_service.list_transaction_rows(db, month="2025-01")
+    return {
+        "summary": summary.model_dump(),
+        "balances": [b.model_dump() for b in account_service.compute_balances(db)],
+        "january": (sorted(r["id"] for r in rows), total),
+        "all": transaction_service.list_transactions(db)[1],
+    }
+
+
+def _hot_count(db):
+    return db.scalar(select(func.count()).select_from(Transaction))
+
+
+class TestArchive:
+
+    def test_results_unchanged_after_moving_rows(self, engine):
+        with Session(engine) as db:
+            before = _views(db)
+        with Session(engine) as db:
+            result = archive.archive_months(db, "2025-12")
+        assert result["moved"] == 4
+        with Session(engine) as db:
+            assert _hot_count(db) == 1
+            assert archive.archived_through(db) == 202512
+            assert _views(db) == before
+            assert before["summary"]["total_expenses"] == 50_000
+            assert before["summary"]["budget_status"][0]["used"] == 50_000
+
+    def test_current_month_reads_only_the_hot_table(self, engine):
+        with Session(engine) as db:
+            archive.archive_months(db, "2025-12")
+        statements: list[str] = []
+        listener = lambda *a: statements.append(a[2])  # noqa: E731
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            with Session(engine) as db:
+                summary = summary_service.monthly_summary(db, now_jakarta().strftime("%Y-%m"))
+                transaction_service.list_transactions(db, month=now_jakarta().strftime("%Y-%m"))
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+        assert summary.total_expenses == 5_000
+        assert not [s for s in statements if "archive." in s]
+
+    def test_archived_rows_are_readable_but_read_only(self, engine):
+        with Session(engine) as db:
+            january = transaction_service.list_transactions(db, month="2025-01")[0][0].id
+            archive.archive_months(db, "2025-12")
+        with Session(engine) as db:
+            assert transaction_service.get_transaction(db, january).amount in (20_000, 30_000)
+            with pytest.raises(LedgerHTTPException) as exc:
+                transaction_service.void_transaction(db, january)
+            assert exc.value.code == "TRANSACTION_ARCHIVED"
+
+    def test_corrected_and_newest_rows_stay_hot(self, engine):
+        with Session(engine) as db:
+            original = db.scalar(select(Transaction).where(Transaction.merchant == "Kopi"))
+            original.status = "voided"
+            _add(db, now_utc().replace(tzinfo=None), "expense", 31_000, from_account_id="fazrin_BCA",
+                 correction_of=original.id)
+            newest = _add(db, datetime(2025, 3, 1), "expense", 1_000, from_account_id="fazrin_BCA")
+            db.commit()
+            original_id, newest_id = original.id, newest.id
+        with Session(engine) as db:
+            result = archive.archive_months(db, "2025-12")
+        assert result["kept_hot"] == 2
+        with Session(engine) as db:
+            hot = set(db.scalars(select(Transaction.id)))
+            assert {original_id, newest_id} <= hot
+
+    def test_later_backdated_rows_join_the_archive_on_the_next_run(self, engine):
+        with Session(engine) as db:
+            archive.archive_months(db, "2025-12")
+        with Session(engine) as db:
+            _add(db, datetime(2025, 1, 20), "expense", 7_000, from_account_id="fazrin_BCA", category_id="coffee")
+            _add(db, now_utc().replace(tzinfo=None), "income", 1, to_account_id="fazrin_BCA")
+            db.commit()
+            assert summary_service.monthly_summary(db, "2025-01").total_expenses == 57_000
+        with Session(engine) as db:
+            assert archive.archive_months(db, "2025-12")["moved"] == 1
+        with Session(engine) as db:
+            assert summary_service.monthly_summary(db, "2025-01").total_expenses == 57_000
+
+    def test_only_closed_months(self, engine):
+        with Session(engine) as db, pytest.raises(archive.ArchiveError, match="closed"):
+            archive.archive_months(db, now_jakarta().strftime("%Y-%m"))
+
+    def test_backup_includes_the_archive(self, engine, tmp_path):
+        with Session(engine) as db:
+            archive.archive_months(db, "2025-12")
+        result = backup.backup_database(tmp_path / "ledger.db", tmp_path / "backups")
+        assert result["archive_path"].endswith(".db.gz")
+        assert "/archive-" in result["archive_path"]
@@ -0,0 +1,137 @@
+"""Tests for online backups (app/backup.py) and the ``backup`` CLI command.
+
+Run:
+    pytest tests/test_backup.py -v
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import pytest
+from sqlalchemy import create_engine, event
+
+import mcp_server
+from app import backup
+from app.database import configure_sqlite
+from app.seed import ensure_database
+
+
+@pytest.fixture()
+def db_file(tmp_path):
+    """A seeded WAL database with a few rows still sitting in the WAL."""
+    path = tmp_path / "ledger.db"
+    engine = create_engine(f"sqlite:///{path}")
+    event.listen(engine, "connect", lambda conn, _rec: configure_sqlite(conn, "durable"))
+    ensure_database(engine)
+    with engine.begin() as conn:
+        for i in range(50):
+            conn.exec_driver_sql(
+                "INSERT INTO users (id, display_name, created_at) VALUES (?, ?, 0)", (f"u{i}", f"User {i}")
+            )
+    yield path
+    engine.dispose()
+
+
+def _restore(gz_path, tmp_path):
+    restored = tmp_path / "restored.db"
+    with gzip.open(gz_path, "rb") as src:
+        restored.write_bytes(src.read())
+    return sqlite3.connect(restored)
+
+
+def test_backup_is_complete_and_self_contained(db_file, tmp_path):
+    dest = tmp_path / "backups"
+    result = backup.backup_database(db_file, dest, keep=3)
+
+    assert result["integrity"] == "ok"
+    assert os.listdir(dest) == [os.path.basename(result["path"])]
+    conn = _restore(result["path"], tmp_path)
+    try:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+        assert conn.execute("SELECT COUNT(*) FROM users").fetchone()[0] == 52
+    finally:
+        conn.close()
+
+
+def test_completes_while_another_connection_keeps_writing(db_file, tmp_path):
+    with sqlite3.connect(db_file) as conn:
+        conn.executemany("INSERT INTO users (id, display_name, created_at) VALUES (?, ?, 0)",
+                         [(f"bulk{i}", "x" * 1000) for i in range(5000)])
+    before = 52 + 5000
+    done = threading.Event()
+    writes = []
+    deadline = time.monotonic() + 10  # a copy restarted by every write would still be running
+
+    def _write():
+        writer = sqlite3.connect(db_file, timeout=30)
+        while not done.is_set() and time.monotonic() < deadline:
+            with writer:
+                writer.execute("INSERT INTO users (id, display_name, created_at) VALUES (?, 'w', 0)",
+                               (f"w{len(writes)}",))
+            writes.append(time.monotonic())
+        writer.close()
+
+    thread = threading.Thread(target=_write)
+    thread.start()
+    while not writes:
+        time.sleep(0.001)
+    try:
+        result = backup.backup_database(db_file, tmp_path / "backups")
+        finished = time.monotonic()
+    finally:
+        done.set()
+        thread.join()
+
+    assert finished < deadline
+    assert len(writes) > 1
+    conn = _restore(result["path"], tmp_path)
+    try:
+        assert before <= conn.execute("SELECT COUNT(*) FROM users").fetchone()[0] <= before + len(writes)
+        assert conn.execute("PRAGMA quick_check").fetchone()[0] == "ok"
+    finally:
+        conn.close()
+
+
+def test_rotation_keeps_newest(tmp_path):
+    for day in range(1, 6):
+        (tmp_path / f"ledger-2026010{day}-000000.db.gz").write_bytes(b"")
+    removed = backup.rotate(tmp_path, keep=2)
+
+    assert [p.name for p in removed] == [f"ledger-2026010{d}-000000.db.gz" for d in (3, 2, 1)]
+    assert [p.name for p in backup.list_backups(tmp_path)] == [
+        "ledger-20260105-000000.db.gz", "ledger-20260104-000000.db.gz",
+    ]
+
+
+def test_seconds_until_due(tmp_path):
+    assert backup.seconds_until_due(3600, tmp_path) == 0
+    (tmp_path / "ledger-20260101-000000.db.gz").write_bytes(b"")
+    assert 3590 < backup.seconds_until_due(3600, tmp_path) <= 3600
+
+
+def test_missing_database(tmp_path):
+    with pytest.raises(backup.BackupError, match="not found"):
+        backup.backup_database(tmp_path / "nope.db", tmp_path / "backups")
+
+
+def test_cli_command(db_file, tmp_path, monkeypatch):
+    monkeypatch.setattr(backup.settings, "db_path", str(db_file))
+    dest = tmp_path / "backups"
+    output, code = mcp_server._dispatch(["backup", json.dumps({"dest": str(dest), "keep": 1})])
+
+    assert code == 0
+    assert json.loads(output)["path"].startswith(str(dest))
+    assert "backup" in json.loads(mcp_server._dispatch([])[0])["admin"]
+    assert "backup" not in mcp_server.TOOL_REGISTRY
+
+
+def test_cli_command_reports_failure(tmp_path, monkeypatch):
+    monkeypatch.setattr(backup.settings, "db_path", str(tmp_path / "nope.db"))
+    output, _ = mcp_server._dispatch(["backup", json.dumps({"dest": str(tmp_path)})])
+    assert json.loads(output)["error"]["code"] == "BACKUP_FAILED"
@@ -0,0 +1,117 @@
+"""Tests for multi-currency account balances and household IDR totals.
+
+Run:
+    pytest tests/test_balances.py -v
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime
+
+from sqlalchemy import event
+
+from app.models import Account, FxRate, Transaction
+from app.services import account_service
+from tests.conftest import seed_test_accounts
+
+
+def _add_txn(db, **fields):
+    data = dict(
+        effective_at=datetime(2026, 2, 1), user_id="fazrin", transaction_type="income",
+        amount=0, currency="IDR", status="posted",
+    )
+    data.update(fields)
+    db.add(Transaction(**data))
+
+
+def _setup_aud_account(db):
+    seed_test_accounts(db)
+    db.add(Account(id="fazrin_CBA_AUD", display_name="CBA", type="bank", currency="AUD", owner_id="fazrin"))
+    db.flush()
+    # Recorded natively in AUD.
+    _add_txn(db, to_account_id="fazrin_CBA_AUD", amount=1000, currency="AUD")
+    # Logged in IDR after conversion, original amount kept.
+    _add_txn(
+        db, transaction_type="expense", from_account_id="fazrin_CBA_AUD", category_id="coffee",
+        amount=52500, original_amount=5.0, original_currency="AUD", fx_rate=10500.0,
+    )
+    _add_txn(db, to_account_id="fazrin_BCA", amount=2_000_000)
+    db.commit()
+
+
+def _by_id(balances):
+    return {b.account_id: b for b in balances}
+
+
+class TestMultiCurrencyBalances:
+
+    def test_native_balance_and_idr_equivalent(self, db):
+        _setup_aud_account(db)
+        db.add(FxRate(base="AUD", quote="IDR", date=date(2026, 1, 31), rate=10000.0))
+        db.commit()
+
+        balances = _by_id(account_service.compute_balances(db, owner_id="fazrin"))
+        aud = balances["fazrin_CBA_AUD"]
+        assert (aud.currency, aud.balance, aud.balance_idr) == ("AUD", 995, 9_950_000)
+        assert balances["fazrin_BCA"].balance == balances["fazrin_BCA"].balance_idr == 2_000_000
+
+        totals = account_service.household_totals(list(balances.values()))
+        assert totals.total_idr == 11_950_000
+        assert totals.by_owner_idr == {"fazrin": 11_950_000}
+        assert totals.unconverted == []
+
+    def test_latest_rate_and_inverse_pairs_are_used(self, db):
+        _setup_aud_account(db)
+        db.add_all([
+            FxRate(base="IDR", quote="AUD", date=date(2026, 1, 1), rate=0.0001),
+            FxRate(base="IDR", quote="AUD", date=date(2026, 2, 1), rate=0.00008),
+        ])
+        db.commit()
+
+        aud = _by_id(account_service.compute_balances(db))["fazrin_CBA_AUD"]
+        assert aud.balance_idr == 12_437_500
+
+    def test_missing_rate_leaves_account_out_of_totals(self, db):
+        _setup_aud_account(db)
+
+        balances = account_service.compute_balances(db, owner_id="fazrin")
+        assert _by_id(balances)["fazrin_CBA_AUD"].balance_idr is None
+        totals = account_service.household_totals(balances)
+        assert totals.unconverted == ["fazrin_CBA_AUD"]
+        assert totals.total_idr == 2_000_000
+
+    def test_movement_without_a_rate_is_not_counted_one_to_one(self, db):
+        _setup_aud_account(db)
+        # Logged in IDR with no AUD original; no AUD<->IDR rate stored yet.
+        _add_txn(db, transaction_type="expense", from_account_id="fazrin_CBA_AUD", category_id="coffee",
+                 amount=50_000)
+        db.commit()
+
+        balances = account_service.compute_balances(db, owner_id="fazrin")
+        aud = _by_id(balances)["fazrin_CBA_AUD"]
+        assert (aud.balance, aud.balance_idr) == (995, None)
+        assert account_service.household_totals(balances).unconverted == ["fazrin_CBA_AUD"]
+
+        # Once a rate is stored the movement converts at it.
+        db.add(FxRate(base="AUD", quote="IDR", date=date(2026, 1, 31), rate=10000.0))
+        db.commit()
+        aud = _by_id(account_service.compute_balances(db, owner_id="fazrin"))["fazrin_CBA_AUD"]
+        assert (aud.balance, aud.balance_idr) == (990, 9_900_000)
+
+    def test_query_count_does_not_grow_with_accounts(self, db):
+        _setup_aud_account(db)
+        for i in range(20):
+            db.add(Account(id=f"extra_{i}", display_name=f"Extra {i}", type="cash", owner_id="fazrin"))
+        db.commit()
+
+        statements: list[str] = []
+        engine = db.get_bind()
+        listener = lambda *a: statements.append(a[2])  # noqa: E731
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            account_service.compute_balances(db)
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+        # data version check + counters (re-read after the commit above),
+        # accounts, grouped movements, rates
+        assert len(statements) == 5
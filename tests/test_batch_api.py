@@ -0,0 +1,63 @@
+"""Tests for POST /v1/batch, the REST face of the batch tool.
+
+Run:
+    pytest tests/test_batch_api.py -v
+"""
+
+from __future__ import annotations
+
+MONTH = "2026-02"
+
+LUNCH = {
+    "user_id": "fazrin", "transaction_type": "expense", "amount": 45000,
+    "category_id": "eating_out", "from_account_id": "fazrin_BCA",
+}
+
+
+def _budget(category_id: str, amount: int = 1000) -> dict:
+    return {"tool": "upsert_budget", "args": {"month": MONTH, "category_id": category_id, "limit_amount": amount}}
+
+
+def _codes(body: dict) -> list[str | None]:
+    return [r.get("error", {}).get("code") if isinstance(r, dict) else None for r in body["results"]]
+
+
+def test_non_atomic_batch_keeps_going_after_a_failure(client):
+    resp = client.post("/v1/batch", json={"calls": [
+        {"tool": "get_transaction", "args": {"txn_id": 999}},
+        _budget("food"),
+    ]})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["committed"] is True
+    assert _codes(body) == ["NOT_FOUND", None]
+    assert [b["category_id"] for b in client.get(f"/v1/budgets?month={MONTH}").json()] == ["food"]
+
+
+def test_atomic_batch_rolls_back_every_call(client):
+    resp = client.post("/v1/batch", json={"atomic": True, "calls": [
+        _budget("food"),
+        _budget("nonexistent"),
+        {"tool": "health_check"},
+    ]})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["committed"] is False
+    assert _codes(body) == [None, "NOT_FOUND", "ROLLED_BACK"]
+    assert client.get(f"/v1/budgets?month={MONTH}").json() == []
+
+
+def test_ref_reads_an_earlier_result(client):
+    resp = client.post("/v1/batch", json={"calls": [
+        {"tool": "create_transaction", "id": "lunch", "args": LUNCH},
+        {"tool": "get_transaction", "args": {"txn_id": {"$ref": "lunch.transaction.id"}}},
+    ]})
+    created, fetched = resp.json()["results"]
+    assert fetched["id"] == created["transaction"]["id"]
+    assert client.get(f"/v1/transactions/{fetched['id']}").json()["amount"] == 45000
+
+
+def test_at_most_fifty_calls(client):
+    health = {"tool": "health_check"}
+    assert client.post("/v1/batch", json={"calls": [health] * 50}).status_code == 200
+    assert client.post("/v1/batch", json={"calls": [health] * 51}).status_code == 422
@@ -0,0 +1,188 @@
+"""Tests for the change log and the dashboard event feed.
+
+Run:
+    pytest tests/test_change_feed.py -v
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from contextlib import contextmanager
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import query_stats
+from app.change_feed import ChangeFeed
+from app.config import settings
+from app.models import ChangeLog
+from app.seed import ensure_database
+from app.services import budget_service, change_service
+from tests.conftest import seed_test_accounts
+
+
+def _expense(amount=65000, **extra):
+    import mcp_server
+
+    return mcp_server.create_transaction(
+        user_id="fazrin", transaction_type="expense", amount=amount, category_id="groceries",
+        from_account_id="fazrin_BCA", effective_at="2026-02-10T05:00:00+07:00", **extra,
+    )
+
+
+class TestChangeLog:
+
+    def test_writes_are_logged_with_their_transaction(self, db, _patch_db):
+        import mcp_server
+
+        seed_test_accounts(db)
+        txn_id = _expense()["transaction"]["id"]
+        mcp_server.void_transaction(txn_id)
+        mcp_server.adjust_account_balance("fazrin_JAGO", 1000, "fazrin")
+
+        kinds = [(c.kind, json.loads(c.payload_json)) for c in db.query(ChangeLog).order_by(ChangeLog.id)]
+        assert [k for k, _ in kinds] == [
+            change_service.TRANSACTION_CREATED,
+            change_service.TRANSACTION_VOIDED,
+            change_service.TRANSACTION_CREATED,
+        ]
+        assert kinds[0][1] == {
+            "transaction_id": txn_id, "replaces": None, "accounts": ["fazrin_BCA"],
+            "month": "2026-02", "category_id": "groceries",
+        }
+
+    def test_correction_logs_void_and_replacement(self, db, _patch_db):
+        import mcp_server
+
+        seed_test_accounts(db)
+        txn_id = _expense()["transaction"]["id"]
+        mcp_server.correct_transaction(
+            txn_id, user_id="fazrin", transaction_type="expense", amount=70000,
+            category_id="coffee", from_account_id="fazrin_JAGO",
+        )
+        changes = change_service.changes_since(db, 1)
+        assert [c.kind for c in changes] == [
+            change_service.TRANSACTION_VOIDED, change_service.TRANSACTION_CORRECTED,
+        ]
+        assert json.loads(changes[1].payload_json)["replaces"] == txn_id
+
+    def test_budget_changes_are_logged(self, db):
+        budget_service.bulk_upsert_budgets(db, "2026-02", {"food": 1_000_000, "transport": 500_000})
+        budget_service.bulk_upsert_budgets(db, "2026-02", {"food": 1_000_000})  # unchanged
+        changes = db.query(ChangeLog).all()
+        assert len(changes) == 1
+        assert json.loads(changes[0].payload_json) == {"month": "2026-02", "category_ids": ["food", "transport"]}
+
+    def test_expand_adds_balances_and_budget_items(self, db, _patch_db):
+        seed_test_accounts(db)
+        budget_service.upsert_budget(db, "2026-02", "food", 1_000_000)
+        _expense()
+        _expense(amount=35000)
+
+        events = change_service.expand(db, change_service.changes_since(db, 0))
+        by_kind = {}
+        for e in events:
+            by_kind.setdefault(e["event"], []).append(e)
+        assert len(by_kind["transaction"]) == 2
+        assert [b["account_id"] for b in by_kind["balances"][0]["data"]["balances"]] == ["fazrin_BCA"]
+        assert by_kind["balances"][0]["data"]["balances"][0]["balance"] == -100000
+        budget = by_kind["budget"][0]["data"]
+        assert budget["month"] == "2026-02"
+        assert [(i["category_id"], i["used"]) for i in budget["items"]] == [("food", 100000)]
+        assert {e["id"] for e in by_kind["balances"] + by_kind["budget"]} == {events[1]["id"]}
+
+    def test_prune_keeps_recent_entries(self, db, _patch_db):
+        seed_test_accounts(db)
+        _expense()
+        assert change_service.prune(db, timedelta(hours=1)) == 0
+        assert change_service.prune(db, timedelta(seconds=-1)) == 1
+
+
+@pytest.fixture()
+def shared_db(tmp_path, monkeypatch):
+    """A file database reached through separate sessions, like API and CLI."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'feed.db'}", connect_args={"check_same_thread": False})
+    ensure_database(engine)
+    factory = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+    @contextmanager
+    def _cli_db():
+        with factory() as session:
+            yield session
+
+    from app import tools
+
+    monkeypatch.setattr(tools, "_db", _cli_db)
+    monkeypatch.setattr(tools, "_read_db", _cli_db)
+    yield factory
+    engine.dispose()
+
+
+class TestChangeFeed:
+
+    def test_poll_picks_up_writes_from_another_session(self, shared_db):
+        feed = ChangeFeed(shared_db, shared_db)
+        _expense()  # before the feed started: not streamed
+        assert feed.poll() == []
+        assert feed.poll() == []
+
+        txn_id = _expense()["transaction"]["id"]
+        events = feed.poll()
+        assert [e["event"] for e in events] == ["transaction", "balances", "budget"]
+        assert events[0]["data"]["transaction"]["id"] == txn_id
+        assert feed.poll() == []
+
+    def test_replay_after_last_event_id(self, shared_db):
+        feed = ChangeFeed(shared_db, shared_db)
+        _expense()
+        _expense()
+        replayed = feed.replay(1)
+        assert [e["event"] for e in replayed] == ["transaction", "balances", "budget"]
+        assert replayed[0]["id"] == 2
+
+    def test_subscribers_share_one_poller(self, shared_db, monkeypatch):
+        monkeypatch.setattr(settings, "change_poll_interval", 0.01)
+        feed = ChangeFeed(shared_db, shared_db)
+        polls = []
+        real_poll = feed.poll
+        monkeypatch.setattr(feed, "poll", lambda: polls.append(1) or real_poll())
+
+        async def _scenario():
+            async with feed.subscribe() as first, feed.subscribe() as second:
+                while not polls:
+                    await asyncio.sleep(0.01)
+                await asyncio.to_thread(_expense)
+                got = [await asyncio.wait_for(q.queue.get(), 5) for q in (first, second)]
+            return got
+
+        first_event, second_event = asyncio.run(_scenario())
+        assert first_event is second_event
+        assert first_event["event"] == "transaction"
+        assert feed._task is None
+
+    def test_polls_are_not_counted_against_the_first_subscriber(self, shared_db, monkeypatch):
+        monkeypatch.setattr(settings, "change_poll_interval", 0.01)
+        feed = ChangeFeed(shared_db, shared_db)
+        polls = []
+        real_poll = feed.poll
+        monkeypatch.setattr(feed, "poll", lambda: polls.append(1) or real_poll())
+
+        async def _request():
+            with query_stats.track() as stats:
+                async with feed.subscribe():
+                    while len(polls) < 3:
+                        await asyncio.sleep(0.01)
+            return stats
+
+        assert asyncio.run(_request()).queries == 0
+
+
+def test_events_endpoint_requires_session():
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    assert TestClient(app).get("/events").status_code == 401
@@ -0,0 +1,60 @@
+"""Tests for data-version ETags and 304 responses on the read endpoints.
+
+Run:
+    pytest tests/test_conditional_get.py -v
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from app.services import account_service
+
+READ_ROUTES = [
+    "/v1/summary/monthly?month=2026-02",
+    "/v1/budgets/status?month=2026-02",
+    "/v1/accounts/balances",
+    "/v1/transactions?month=2026-02",
+]
+
+
+@pytest.mark.parametrize("url", READ_ROUTES)
+def test_matching_etag_gets_304(client, url):
+    resp = client.get(url)
+    assert resp.status_code == 200
+    etag = resp.headers["etag"]
+    assert etag.startswith('W/"')
+    assert "last-modified" in resp.headers
+
+    resp = client.get(url, headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.headers["etag"] == etag
+    assert resp.content == b""
+
+
+@pytest.mark.parametrize("url", READ_ROUTES)
+def test_write_changes_etag(client, url):
+    etag = client.get(url).headers["etag"]
+
+    resp = client.put("/v1/budgets/2026-02/food", json={"limit_amount": 500000})
+    assert resp.status_code == 200
+
+    resp = client.get(url, headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.headers["etag"] != etag
+
+
+def test_304_skips_aggregation(client, monkeypatch):
+    etag = client.get("/v1/accounts/balances").headers["etag"]
+
+    def _boom(*args, **kwargs):
+        raise AssertionError("balances recomputed for a conditional hit")
+
+    monkeypatch.setattr(account_service, "compute_balances", _boom)
+    assert client.get("/v1/accounts/balances", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_month_is_part_of_the_tag(client):
+    feb = client.get("/v1/summary/monthly?month=2026-02").headers["etag"]
+    mar = client.get("/v1/summary/monthly?month=2026-03").headers["etag"]
+    assert feb != mar
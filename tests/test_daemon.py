@@ -0,0 +1,43 @@
+"""Tests for the ledger daemon and its thin client.
+
+The daemon is served from a background thread on a temporary socket and
+uses the same in-memory database fixture as the tool tests.
+
+Run:
+    pytest tests/test_daemon.py -v
+"""
+
+from __future__ import annotations
+
+import json
+
+import ledger_client
+from tests.conftest import seed_test_accounts
+
+
+class TestDaemon:
+
+    def test_health_check(self, daemon):
+        output, exit_code = ledger_client.call_daemon(["health_check"], daemon)
+        assert exit_code == 0
+        assert json.loads(output) == {"status": "ok"}
+
+    def test_matches_cli_output(self, db, daemon):
+        import mcp_server
+        seed_test_accounts(db)
+
+        argv = ["get_account_balances", '{"user_id": "fazrin"}']
+        assert ledger_client.call_daemon(argv, daemon) == mcp_server._dispatch(argv)
+
+    def test_lists_tools_without_args(self, daemon):
+        output, exit_code = ledger_client.call_daemon([], daemon)
+        assert exit_code == 0
+        assert "health_check" in json.loads(output)["tools"]
+
+    def test_unknown_tool_exit_code(self, daemon):
+        output, exit_code = ledger_client.call_daemon(["nope"], daemon)
+        assert exit_code == 1
+        assert json.loads(output)["error"]["code"] == "UNKNOWN_TOOL"
+
+    def test_unreachable_daemon_returns_none(self, tmp_path):
+        assert ledger_client.call_daemon(["health_check"], str(tmp_path / "missing.sock")) is None
@@ -0,0 +1,92 @@
+"""Tests for the dashboard's /fragments region endpoints.
+
+Run:
+    pytest tests/test_dashboard_fragments.py -v
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from app.config import settings
+
+MONTH = "2026-02"
+
+
+@pytest.fixture()
+def dash(client):
+    resp = client.post(
+        "/login", data={"username": settings.dash_user, "password": settings.dash_pass},
+        follow_redirects=False,
+    )
+    assert resp.status_code == 302
+    client.post("/v1/transactions", json={
+        "user_id": "fazrin", "transaction_type": "expense", "amount": 65000,
+        "category_id": "groceries", "from_account_id": "fazrin_BCA",
+        "description": "detergent", "effective_at": f"{MONTH}-10T05:00:00+07:00",
+    }).raise_for_status()
+    return client
+
+
+def test_fragments_require_session(client):
+    for path in ("/fragments/transactions", "/fragments/budgets", "/fragments/balances"):
+        assert client.get(path, follow_redirects=False).status_code == 401
+
+
+def test_transactions_fragment_is_the_table_only(dash):
+    resp = dash.get(f"/fragments/transactions?month={MONTH}")
+    assert resp.status_code == 200
+    assert "detergent" in resp.text
+    assert "Groceries" in resp.text
+    assert f'data-subtitle="{MONTH} &middot; 1 records"' in resp.text
+    assert "<html" not in resp.text and "<nav" not in resp.text
+
+    page = dash.get(f"/transactions?month={MONTH}")
+    assert 'id="txn-region"' in page.text and "detergent" in page.text
+
+
+def test_fragment_conditional_get(dash):
+    first = dash.get(f"/fragments/budgets?month={MONTH}")
+    etag = first.headers["ETag"]
+    assert dash.get(f"/fragments/budgets?month={MONTH}", headers={"If-None-Match": etag}).status_code == 304
+    other_month = dash.get("/fragments/budgets?month=2026-03", headers={"If-None-Match": etag})
+    assert other_month.status_code == 200
+
+
+def test_budgets_fragment_shows_status_for_budgeted_rows(dash):
+    dash.put(f"/v1/budgets/{MONTH}/food", json={"limit_amount": 100000}).raise_for_status()
+    resp = dash.get(f"/fragments/budgets?month={MONTH}")
+    assert resp.status_code == 200
+    row = resp.text.split(f'<tr data-budget="food" data-month="{MONTH}">', 1)[1].split("</tr>", 1)[0]
+    assert '<td class="amount" data-field="used">Rp65.000</td>' in row
+    assert 'data-field="remaining">Rp35.000</td>' in row
+    assert "No budget set" not in row
+    assert 'data-budget="transport"' not in resp.text
+
+
+def test_budgets_fragment_exposes_live_update_hooks(dash):
+    """The base.html budget listener patches rows in place via these hooks."""
+    dash.put(f"/v1/budgets/{MONTH}/food", json={"limit_amount": 100000}).raise_for_status()
+    page = dash.get(f"/budgets?month={MONTH}").text
+    assert 'id="budget-region"' in page
+    region = page.split('id="budget-region"', 1)[1]
+    assert f'<div data-month="{MONTH}"' in region
+    row = region.split(f'data-budget="food" data-month="{MONTH}"', 1)[1].split("</tr>", 1)[0]
+    for field in ("used", "remaining", "bar", "pct"):
+        assert f'data-field="{field}"' in row
+
+
+def test_balances_fragment_reflects_writes(dash):
+    assert "Rp65.000" in dash.get("/fragments/balances").text
+    dash.post("/v1/transactions", json={
+        "user_id": "fazrin", "transaction_type": "income", "amount": 1000000,
+        "to_account_id": "fazrin_BCA",
+    }).raise_for_status()
+    assert "Rp935.000" in dash.get("/fragments/balances").text
+
+
+@pytest.mark.parametrize("path", ["/", "/transactions", "/budgets", f"/budgets?month={MONTH}", "/accounts"])
+def test_full_pages_still_render(dash, path):
+    resp = dash.get(path)
+    assert resp.status_code == 200
+    assert "<nav" in resp.text
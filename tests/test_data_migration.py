@@ -0,0 +1,139 @@
+"""Tests for batched, resumable data migrations (app/data_migration.py).
+
+Run:
+    pytest tests/test_data_migration.py -v
+"""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, event, text
+
+from app.data_migration import DataMigration, MigrationError, run_migration
+from app.database import DATA_VERSION, REFERENCE_VERSION, configure_sqlite
+from app.seed import ensure_database
+
+ROOT = Path(__file__).resolve().parent.parent
+
+DOUBLE = DataMigration(
+    "double_amounts", "transactions",
+    "UPDATE transactions SET amount = amount * 2 WHERE id BETWEEN :low AND :high",
+)
+
+
+@pytest.fixture()
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'ledger.db'}")
+    event.listen(engine, "connect", lambda conn, _rec: configure_sqlite(conn, "durable"))
+    ensure_database(engine)
+    with engine.begin() as conn:
+        for i in range(1, 26):
+            conn.execute(text(
+                "INSERT INTO transactions (effective_at, created_at, user_id, transaction_type, amount, "
+                "currency, from_account_id, status) VALUES (:at, :at, 'fazrin', 'expense', :amount, 'IDR', "
+                "'fazrin_BCA', 'posted')"
+            ), {"at": datetime(2026, 1, 1, 12), "amount": i})
+    yield engine
+    engine.dispose()
+
+
+def _amounts(engine) -> list[int]:
+    with engine.connect() as conn:
+        return list(conn.scalars(text("SELECT amount FROM transactions ORDER BY id")))
+
+
+def _counter(engine, key: str) -> int:
+    with engine.connect() as conn:
+        return conn.scalar(text("SELECT value FROM ledger_meta WHERE key = :key"), {"key": key}) or 0
+
+
+class TestRunMigration:
+
+    def test_applies_every_row_once_in_batches(self, engine):
+        with engine.connect() as conn:
+            result = run_migration(conn, DOUBLE, batch_size=10, sleep=0)
+        assert (result["rows"], result["batches"], result["finished"]) == (25, 3, True)
+        assert _amounts(engine) == [i * 2 for i in range(1, 26)]
+
+        with engine.connect() as conn:
+            again = run_migration(conn, DOUBLE, batch_size=10, sleep=0)
+        assert (again["rows"], again["total_rows"]) == (0, 25)
+        assert _amounts(engine) == [i * 2 for i in range(1, 26)]
+
+    def test_resumes_after_the_last_committed_batch(self, engine):
+        calls = []
+
+        def flaky(conn, low, high):
+            calls.append(low)
+            if len(calls) == 2:
+                raise RuntimeError("interrupted")
+            conn.execute(text("UPDATE transactions SET amount = amount * 2 WHERE id BETWEEN :low AND :high"),
+                         {"low": low, "high": high})
+
+        migration = DataMigration("double_flaky", "transactions", flaky)
+        with engine.connect() as conn, pytest.raises(RuntimeError):
+            run_migration(conn, migration, batch_size=10, sleep=0)
+        assert _amounts(engine) == [i * 2 for i in range(1, 11)] + list(range(11, 26))
+
+        with engine.connect() as conn:
+            result = run_migration(conn, migration, batch_size=10, sleep=0)
+        assert result["resumed"] and (result["rows"], result["total_rows"]) == (15, 25)
+        assert _amounts(engine) == [i * 2 for i in range(1, 26)]
+
+    def test_rows_written_after_the_start_are_left_alone(self, engine):
+        def interrupted(conn, low, high):
+            raise RuntimeError("interrupted")
+
+        with engine.connect() as conn, pytest.raises(RuntimeError):
+            run_migration(conn, DataMigration("double_amounts", "transactions", interrupted), sleep=0)
+        # A live writer adds a row, already in the new form, before the resume.
+        with engine.begin() as conn:
+            conn.execute(text(
+                "INSERT INTO transactions (effective_at, created_at, user_id, transaction_type, amount, "
+                "currency, from_account_id, status) VALUES (:at, :at, 'fazrin', 'expense', 1000, 'IDR', "
+                "'fazrin_BCA', 'posted')"
+            ), {"at": datetime(2026, 1, 2, 12)})
+
+        with engine.connect() as conn:
+            result = run_migration(conn, DOUBLE, batch_size=10, sleep=0)
+        assert result["rows"] == 25
+        assert _amounts(engine) == [i * 2 for i in range(1, 26)] + [1000]
+
+    def test_batches_bump_change_counters(self, engine):
+        before = _counter(engine, DATA_VERSION), _counter(engine, REFERENCE_VERSION)
+        with engine.connect() as conn:
+            run_migration(conn, DOUBLE, batch_size=10, sleep=0)
+            run_migration(conn, DataMigration(
+                "rename_users", "users",
+                "UPDATE users SET display_name = display_name || '!' WHERE id BETWEEN :low AND :high",
+            ), batch_size=1, sleep=0)
+        assert _counter(engine, DATA_VERSION) > before[0]
+        assert _counter(engine, REFERENCE_VERSION) > before[1]
+        with engine.connect() as conn:
+            names = list(conn.scalars(text("SELECT display_name FROM users")))
+        assert names and all(name.endswith("!") and not name.endswith("!!") for name in names)
+
+    def test_refuses_a_connection_inside_a_transaction(self, engine):
+        with engine.connect() as conn:
+            conn.execute(text("UPDATE transactions SET amount = amount WHERE id = 1"))
+            with pytest.raises(MigrationError, match="outside a transaction"):
+                run_migration(conn, DOUBLE)
+
+
+class TestMigrateToUtcScript:
+
+    def test_shifts_once_and_resumes_as_a_no_op(self, engine, tmp_path):
+        db_path = tmp_path / "ledger.db"
+        engine.dispose()
+        for _ in range(2):
+            subprocess.run([sys.executable, "scripts/migrate_to_utc.py", str(db_path)],
+                           cwd=ROOT, check=True, capture_output=True)
+        with engine.connect() as conn:
+            effective = set(conn.scalars(text("SELECT effective_at FROM transactions")))
+        assert effective == {"2026-01-01 05:00:00"}
+        assert db_path.with_suffix(".pre-utc-migration.bak").exists()
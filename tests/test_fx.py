@@ -0,0 +1,314 @@
+"""Tests for the cached FX rate provider.
+
+A local HTTP server stands in for open.er-api.com and counts requests per
+base currency.
+
+Run:
+    pytest tests/test_fx.py -v
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.config import settings
+from app.database import Base
+from app.models import FxRate
+from app.schemas import TransactionCreate, TransactionType
+from app.services import fx_service, transaction_service
+from tests.conftest import seed_test_accounts
+
+RATES = {"AUD": {"AUD": 1.0, "IDR": 10500.0, "USD": 0.65}}
+UPDATED_UNIX = 1791244801  # 2026-10-06 00:00:01 UTC
+
+
+class _Upstream(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _UpstreamHandler)
+        self.hits: dict[str, int] = {}
+        self.down = False
+        self.delay = 0.0
+
+
+class _UpstreamHandler(BaseHTTPRequestHandler):
+    server: _Upstream
+
+    def do_GET(self):
+        base = self.path.rsplit("/", 1)[-1]
+        self.server.hits[base] = self.server.hits.get(base, 0) + 1
+        time.sleep(self.server.delay)
+        if self.server.down:
+            self.send_response(503)
+            self.end_headers()
+            return
+        if base in RATES:
+            body = {
+                "result": "success", "base_code": base,
+                "time_last_update_unix": UPDATED_UNIX, "rates": RATES[base],
+            }
+        else:
+            body = {"result": "error", "error-type": "unsupported-code"}
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def upstream(monkeypatch):
+    server = _Upstream()
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    monkeypatch.setattr(settings, "fx_api_url", f"http://127.0.0.1:{server.server_port}/v6/latest")
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class TestConvertCurrency:
+
+    def test_fetches_once_then_serves_from_cache(self, db, _patch_db, upstream):
+        import mcp_server
+
+        first = mcp_server.convert_currency(50, "aud")
+        second = mcp_server.convert_currency(20, "AUD")
+        assert first["result"] == 525000
+        assert first["rate"] == 10500.0
+        assert first["stale"] is False
+        assert second["result"] == 210000
+        assert upstream.hits == {"AUD": 1}
+
+    def test_expired_table_is_refetched(self, db, _patch_db, upstream, monkeypatch):
+        import mcp_server
+
+        monkeypatch.setattr(settings, "fx_ttl_seconds", 0)
+        mcp_server.convert_currency(1, "AUD")
+        mcp_server.convert_currency(1, "AUD")
+        assert upstream.hits == {"AUD": 2}
+
+    def test_stale_rates_served_when_upstream_down(self, db, _patch_db, upstream, monkeypatch):
+        import mcp_server
+
+        mcp_server.convert_currency(1, "AUD", "USD")
+        monkeypatch.setattr(settings, "fx_ttl_seconds", 0)
+        upstream.down = True
+        result = mcp_server.convert_currency(100, "AUD", "USD")
+        assert result["stale"] is True
+        assert result["rate"] == 0.65
+
+    def test_upstream_down_without_cache_is_an_error(self, db, _patch_db, upstream):
+        import mcp_server
+
+        upstream.down = True
+        result = mcp_server.convert_currency(1, "AUD")
+        assert result["error"]["code"] == "CONVERSION_ERROR"
+
+    def test_unknown_target_currency(self, db, _patch_db, upstream):
+        import mcp_server
+
+        result = mcp_server.convert_currency(1, "AUD", "XYZ")
+        assert result["error"]["code"] == "VALIDATION_ERROR"
+
+    def test_same_currency_skips_upstream(self, db, _patch_db, upstream):
+        import mcp_server
+
+        result = mcp_server.convert_currency(12.4, "IDR", "idr")
+        assert result["result"] == 12
+        assert upstream.hits == {}
+
+
+class TestHistoricalRates:
+
+    def test_fetch_records_history_by_rate_date(self, db, _patch_db, upstream):
+        import mcp_server
+
+        mcp_server.convert_currency(1, "AUD")
+        rows = {(r.quote, r.date): r.rate for r in db.query(FxRate).filter(FxRate.base == "AUD")}
+        assert rows[("IDR", date(2026, 10, 6))] == 10500.0
+        assert len(rows) == len(RATES["AUD"])
+
+    def test_offline_convert_uses_latest_rate_on_or_before_date(self, db, _patch_db, upstream):
+        import mcp_server
+
+        db.add_all([
+            FxRate(base="AUD", quote="IDR", date=date(2026, 1, 1), rate=10000.0),
+            FxRate(base="AUD", quote="IDR", date=date(2026, 2, 1), rate=10200.0),
+        ])
+        db.commit()
+        result = mcp_server.convert_currency(10, "AUD", date="2026-01-20")
+        assert result["rate"] == 10000.0
+        assert result["result"] == 100000
+        assert result["as_of"] == "2026-01-01"
+        assert upstream.hits == {}
+
+    def test_offline_convert_inverts_stored_rate(self, db, _patch_db):
+        import mcp_server
+
+        db.add(FxRate(base="AUD", quote="IDR", date=date(2026, 1, 1), rate=10000.0))
+        db.commit()
+        result = mcp_server.convert_currency(50000, "IDR", "AUD", date="2026-03-01")
+        assert result["result"] == 5
+
+    def test_offline_convert_without_rate(self, db, _patch_db):
+        import mcp_server
+
+        result = mcp_server.convert_currency(10, "AUD", date="2020-01-01")
+        assert result["error"]["code"] == "RATE_NOT_FOUND"
+        assert mcp_server.convert_currency(10, "AUD", date="yesterday")["error"]["code"] == "VALIDATION_ERROR"
+
+
+class TestTransactionFxFields:
+
+    def _create(self, db, **fx):
+        seed_test_accounts(db)
+        data = TransactionCreate(
+            user_id="fazrin", transaction_type=TransactionType.expense, amount=525000,
+            category_id="coffee", from_account_id="fazrin_BCA", effective_at="2026-02-15T08:30:00",
+            timezone="Australia/Sydney", **fx,
+        )
+        return transaction_service.create_transaction(db, data)["transaction"]
+
+    def test_explicit_rate_is_recorded(self, db):
+        txn = self._create(db, original_amount=50, original_currency="aud", fx_rate=10512.5)
+        assert (txn.original_amount, txn.original_currency, txn.fx_rate) == (50, "AUD", 10512.5)
+
+    def test_rate_taken_from_history_for_effective_date(self, db):
+        db.add(FxRate(base="AUD", quote="IDR", date=date(2026, 2, 14), rate=10490.0))
+        db.commit()
+        txn = self._create(db, original_amount=50, original_currency="AUD")
+        assert txn.fx_rate == 10490.0
+
+    def test_rate_implied_by_amounts_without_history(self, db):
+        txn = self._create(db, original_amount=50, original_currency="AUD")
+        assert txn.fx_rate == 10500.0
+
+    def test_original_fields_must_come_together(self):
+        with pytest.raises(ValueError):
+            TransactionCreate(
+                user_id="fazrin", transaction_type=TransactionType.adjustment, amount=1,
+                original_amount=5,
+            )
+
+
+def test_concurrent_misses_share_one_fetch(tmp_path, upstream):
+    engine = create_engine(f"sqlite:///{tmp_path / 'fx.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    upstream.delay = 0.2
+    results = []
+
+    def _convert():
+        with Session(engine) as session:
+            results.append(fx_service.convert(session, 10, "AUD"))
+
+    threads = [threading.Thread(target=_convert) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    engine.dispose()
+
+    assert upstream.hits == {"AUD": 1}
+    assert [r["result"] for r in results] == [105000] * 8
+
+
+def test_cache_miss_does_not_hold_the_write_connection(tmp_path, upstream):
+    """The write engine has one connection; a slow fetch must not keep it."""
+    from app.models import User
+
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'fx.db'}", connect_args={"check_same_thread": False},
+        pool_size=1, max_overflow=0, pool_timeout=5,
+    )
+    Base.metadata.create_all(engine)
+    upstream.delay = 1.0
+    results = []
+
+    def _convert():
+        with Session(engine) as session:
+            results.append(fx_service.convert(session, 10, "AUD"))
+
+    thread = threading.Thread(target=_convert)
+    thread.start()
+    while not upstream.hits:
+        time.sleep(0.01)
+    started = time.monotonic()
+    with Session(engine) as writer:
+        writer.add(User(id="u1", display_name="U1"))
+        writer.commit()
+    waited = time.monotonic() - started
+    thread.join()
+    engine.dispose()
+
+    assert waited < 0.5
+    assert [r["result"] for r in results] == [105000]
+
+
+@pytest.fixture()
+def write_engine(tmp_path, monkeypatch):
+    """A file database behind a one-connection pool, like the write engine."""
+    import app.database
+    from app.seed import ensure_database
+
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'fx.db'}", connect_args={"check_same_thread": False},
+        pool_size=1, max_overflow=0, pool_timeout=5,
+    )
+    ensure_database(engine)
+    monkeypatch.setattr(app.database, "engine", engine)
+    monkeypatch.setattr(app.database, "SessionLocal", sessionmaker(bind=engine, autoflush=False))
+    yield engine
+    engine.dispose()
+
+
+class TestAtomicBatchConversion:
+
+    def test_concurrent_writer_is_not_blocked(self, write_engine, upstream):
+        import mcp_server
+        from app.models import User
+
+        upstream.delay = 1.0
+        results = []
+        thread = threading.Thread(target=lambda: results.append(mcp_server.batch([
+            {"tool": "convert_currency", "args": {"amount": 10, "from_currency": "AUD"}},
+            {"tool": "upsert_budget", "args": {"month": "2026-02", "category_id": "food", "limit_amount": 1000}},
+        ], atomic=True)))
+        thread.start()
+        while not upstream.hits:
+            time.sleep(0.01)
+        started = time.monotonic()
+        with Session(write_engine) as writer:
+            writer.add(User(id="u1", display_name="U1"))
+            writer.commit()
+        waited = time.monotonic() - started
+        thread.join()
+
+        assert waited < 0.5
+        assert results[0]["committed"] is True
+        assert results[0]["results"][0]["result"] == 105000
+
+    def test_rates_are_not_fetched_inside_the_transaction(self, write_engine, upstream):
+        import mcp_server
+
+        # The currency is only known once the batch runs, so it is not prefetched.
+        result = mcp_server.batch([
+            {"tool": "convert_currency", "args": {"amount": 1, "from_currency": "AUD", "to_currency": "AUD"}},
+            {"tool": "convert_currency", "args": {"amount": 10, "from_currency": {"$ref": "0.from"}}},
+        ], atomic=True)
+        assert upstream.hits == {}
+        assert result["results"][1]["error"]["code"] == "CONVERSION_ERROR"
+        assert result["committed"] is False
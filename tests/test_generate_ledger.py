@@ -0,0 +1,104 @@
+"""Tests for the synthetic ledger generator (scripts/generate_ledger.py).
+
+Most tests read the session's ``large_ledger`` (tests/conftest.py), which
+performance tests share; LEDGER_PERF_TRANSACTIONS sets its size.
+
+Run:
+    pytest tests/test_generate_ledger.py -v
+    LEDGER_PERF_TRANSACTIONS=2000000 pytest tests/test_generate_ledger.py -v
+"""
+
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.database import DATA_VERSION, REFERENCE_VERSION
+from app.services.summary_service import monthly_summary
+from scripts.generate_ledger import generate
+
+END = "2026-09"
+
+
+@pytest.fixture()
+def conn(large_ledger):
+    engine = create_engine(f"sqlite:///{large_ledger[0]}")
+    with engine.connect() as conn:
+        yield conn
+    engine.dispose()
+
+
+def _dump(path) -> list[tuple]:
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.connect() as conn:
+        rows = conn.execute(text("SELECT * FROM transactions ORDER BY id")).all()
+        rows += conn.execute(text("SELECT month, category_id, limit_amount, scope_user_id FROM budgets "
+                                  "ORDER BY id")).all()
+    engine.dispose()
+    return [tuple(row) for row in rows]
+
+
+class TestGenerate:
+
+    def test_same_seed_same_ledger(self, tmp_path):
+        a = generate(tmp_path / "a.db", 2_000, years=1, end=END, seed=7)
+        generate(tmp_path / "b.db", 2_000, years=1, end=END, seed=7)
+        generate(tmp_path / "c.db", 2_000, years=1, end=END, seed=8)
+        assert a["transactions"] >= 2_000
+        assert _dump(tmp_path / "a.db") == _dump(tmp_path / "b.db")
+        assert _dump(tmp_path / "a.db") != _dump(tmp_path / "c.db")
+
+    def test_refuses_an_existing_file(self, tmp_path):
+        (tmp_path / "ledger.db").write_bytes(b"")
+        with pytest.raises(FileExistsError):
+            generate(tmp_path / "ledger.db", 10, end=END)
+
+    def test_covers_types_users_and_months(self, large_ledger, conn):
+        _, result = large_ledger
+        assert all(result["by_type"][kind] for kind in ("expense", "income", "transfer", "adjustment"))
+        assert conn.scalar(text("SELECT count(*) FROM transactions")) == result["transactions"]
+        users = dict(conn.execute(text("SELECT user_id, count(*) FROM transactions GROUP BY user_id")).all())
+        assert set(users) == {"fazrin", "magfira", "user03"}
+        months = conn.scalar(text("SELECT count(DISTINCT substr(effective_at, 1, 7)) FROM transactions"))
+        assert months >= 36
+        assert conn.scalar(text("SELECT count(*) FROM transactions WHERE merchant IS NOT NULL")) > 0
+        assert conn.scalar(text("SELECT count(*) FROM transactions WHERE note IS NOT NULL")) > 0
+        assert conn.scalar(text("SELECT count(*) FROM transactions WHERE original_currency = 'AUD' "
+                                "AND user_id = 'magfira'")) > 0
+
+    def test_times_follow_each_users_local_day(self, conn):
+        # 18:00-21:59 UTC is 01:00-04:59 in Jakarta, when hardly anyone
+        # spends, but already morning in Sydney.
+        night = dict(conn.execute(text(
+            "SELECT user_id, avg(CAST(strftime('%H', effective_at) AS INTEGER) BETWEEN 18 AND 21)"
+            " FROM transactions GROUP BY user_id"
+        )).all())
+        assert night["fazrin"] < 0.04 < night["magfira"]
+
+    def test_corrections_replace_voided_originals(self, large_ledger, conn):
+        _, result = large_ledger
+        assert result["voided"] > result["corrections"] > 0
+        pairs = conn.execute(text(
+            "SELECT o.status, c.status, c.id > o.id, c.user_id = o.user_id FROM transactions c"
+            " JOIN transactions o ON o.id = c.correction_of"
+        )).all()
+        assert len(pairs) == result["corrections"]
+        assert set(pairs) == {("voided", "posted", 1, 1)}
+
+    def test_summary_and_budgets_match_the_rows(self, large_ledger, conn):
+        month = "2026-03"
+        expected = conn.scalar(text(
+            "SELECT sum(amount) FROM transactions WHERE status = 'posted' AND transaction_type = 'expense'"
+            " AND strftime('%Y-%m', effective_at, '+7 hours') = :month"
+        ), {"month": month})
+        db = sessionmaker(bind=conn)()
+        summary = monthly_summary(db, month)
+        assert summary.total_expenses == expected
+        assert summary.budget_status
+        assert {item.category_id for item in summary.budget_status} >= {"food", "transport"}
+
+    def test_counters_are_bumped(self, conn):
+        counters = dict(conn.execute(text("SELECT key, value FROM ledger_meta")).all())
+        assert counters[DATA_VERSION] > 0
+        assert counters[REFERENCE_VERSION] > 0
@@ -0,0 +1,92 @@
+"""Tests for database maintenance (app/maintenance.py) and its CLI command.
+
+Run:
+    pytest tests/test_maintenance.py -v
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+
+import pytest
+from sqlalchemy import create_engine, event
+
+import mcp_server
+from app import maintenance
+from app.database import configure_sqlite
+from app.seed import ensure_database
+
+
+@pytest.fixture()
+def db_file(tmp_path):
+    """A seeded WAL database that has grown and then deleted a lot of rows."""
+    path = tmp_path / "ledger.db"
+    engine = create_engine(f"sqlite:///{path}")
+    event.listen(engine, "connect", lambda conn, _rec: configure_sqlite(conn, "durable"))
+    ensure_database(engine)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("CREATE TABLE scratch (body TEXT)")
+        for _ in range(500):
+            conn.exec_driver_sql("INSERT INTO scratch VALUES (?)", ("x" * 4000,))
+    with engine.begin() as conn:
+        conn.exec_driver_sql("DELETE FROM scratch")
+    engine.dispose()
+    return path
+
+
+def test_new_database_uses_incremental_auto_vacuum(db_file):
+    conn = sqlite3.connect(db_file)
+    try:
+        assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+    finally:
+        conn.close()
+
+
+def test_tasks_reclaim_space(db_file):
+    result = maintenance.run_maintenance(db_path=db_file)
+
+    tasks = {t["task"]: t for t in result["tasks"]}
+    assert list(tasks) == ["optimize", "vacuum", "checkpoint"]
+    assert tasks["vacuum"]["freed_pages"] > 450
+    assert tasks["checkpoint"]["busy"] is False
+    assert tasks["checkpoint"]["reclaimed_bytes"] > 0
+    assert result["reclaimed_bytes"] > 450 * 4096
+    conn = sqlite3.connect(db_file)
+    try:
+        assert conn.execute("SELECT COUNT(*) FROM sqlite_stat1").fetchone()[0] > 0
+    finally:
+        conn.close()
+
+
+def test_older_database_needs_full_vacuum_once(tmp_path):
+    path = tmp_path / "old.db"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE t (x)")
+    conn.commit()
+    conn.close()
+
+    vacuum = maintenance.run_maintenance(["vacuum"], db_path=path)["tasks"][0]
+    assert "full_vacuum" in vacuum["note"]
+
+    maintenance.run_maintenance(["full_vacuum"], db_path=path)
+    assert "note" not in maintenance.run_maintenance(["vacuum"], db_path=path)["tasks"][0]
+
+
+def test_waits_for_idle_window(db_file):
+    assert maintenance.run_maintenance(db_path=db_file, idle_seconds=3600)["skipped"].startswith("last write")
+
+
+def test_unknown_task(db_file):
+    with pytest.raises(maintenance.MaintenanceError, match="Unknown"):
+        maintenance.run_maintenance(["defrag"], db_path=db_file)
+
+
+def test_cli_command(db_file, monkeypatch):
+    monkeypatch.setattr(maintenance.settings, "db_path", str(db_file))
+    output, code = mcp_server._dispatch(["maintenance", '{"tasks": ["checkpoint"]}'])
+    assert code == 0
+    assert [t["task"] for t in json.loads(output)["tasks"]] == ["checkpoint"]
+
+    output, _ = mcp_server._dispatch(["maintenance", '{"tasks": ["defrag"]}'])
+    assert json.loads(output)["error"]["code"] == "MAINTENANCE_FAILED"
@@ -13,83 +13,11 @@ from __future__ import annotations
 
 import json
 
-import pytest
-from sqlalchemy import create_engine, event
+from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
-from app.database import Base
 from app.models import Account, Category, Transaction, User
-from app.seed import seed_defaults
-
-
-# ---------------------------------------------------------------------------
-# Test database setup — in-memory SQLite, fresh per test
-# ---------------------------------------------------------------------------
-
-
-@pytest.fixture()
-def db():
-    """Create a fresh in-memory database for each test."""
-    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
-
-    @event.listens_for(engine, "connect")
-    def _set_pragmas(dbapi_conn, _connection_record):
-        cursor = dbapi_conn.cursor()
-        cursor.execute("PRAGMA foreign_keys=ON")
-        cursor.close()
-
-    Base.metadata.create_all(bind=engine)
-    Session = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
-    session = Session()
-
-    seed_defaults(session)
-
-    yield session
-
-    session.close()
-    engine.dispose()
-
-
-@pytest.fixture()
-def _patch_db(db, monkeypatch):
-    """Monkey-patch the MCP server's _db() context manager to use the test session."""
-    from contextlib import contextmanager
-
-    @contextmanager
-    def _test_db():
-        yield db
-
-    import mcp_server
-    monkeypatch.setattr(mcp_server, "_db", _test_db)
-
-
-# ---------------------------------------------------------------------------
-# Helpers
-# ---------------------------------------------------------------------------
-
-
-def _ensure_user(db, user_id="fazrin", display_name="Fazrin"):
-    if not db.query(User).filter(User.id == user_id).first():
-        db.add(User(id=user_id, display_name=display_name))
-        db.commit()
-
-
-def _ensure_account(db, account_id, display_name, owner_id, acct_type="bank"):
-    if not db.query(Account).filter(Account.id == account_id).first():
-        _ensure_user(db, owner_id, owner_id)
-        db.add(Account(id=account_id, display_name=display_name, type=acct_type, owner_id=owner_id))
-        db.commit()
-
-
-def _seed_test_accounts(db):
-    """Create the standard test accounts for fazrin."""
-    _ensure_user(db, "fazrin", "Fazrin")
-    for aid, name, atype in [
-        ("fazrin_BCA", "BCA", "bank"),
-        ("fazrin_JAGO", "Jago", "bank"),
-        ("fazrin_CASH", "Cash", "cash"),
-    ]:
-        _ensure_account(db, aid, name, "fazrin", atype)
+from tests.conftest import ensure_account, ensure_user, seed_test_accounts
 
 
 # ---------------------------------------------------------------------------
@@ -101,7 +29,7 @@ class TestCreateTransaction:
 
     def test_expense_success(self, db, _patch_db):
         import mcp_server
-        _seed_test_accounts(db)
+        seed_test_accounts(db)
 
         result = mcp_server.create_transaction(
             user_id="fazrin",
@@ -123,7 +51,7 @@ class TestCreateTransaction:
 
     def test_expense_missing_account_returns_clarification(self, db, _patch_db):
         import mcp_server
-        _ensure_user(db, "fazrin")
+        ensure_user(db, "fazrin")
 
         result = mcp_server.create_transaction(
             user_id="fazrin",
@@ -139,7 +67,7 @@ class TestCreateTransaction:
 
     def test_expense_missing_category_returns_clarification(self, db, _patch_db):
         import mcp_server
-        _seed_test_accounts(db)
+        seed_test_accounts(db)
 
         result = mcp_server.create_transaction(
             user_id="fazrin",
@@ -153,7 +81,7 @@ class TestCreateTransaction:
 
     def test_income_success(self, db, _patch_db):
         import mcp_server
-        _seed_test_accounts(db)
+        seed_test_accounts(db)
 
         result = mcp_server.create_transaction(
             user_id="fazrin",
@@ -169,7 +97,7 @@ class TestCreateTransaction:
 
     def test_transfer_success(self, db, _patch_db):
         import mcp_server
-        _seed_test_accounts(db)
+        seed_test_accounts(db)
 
         result = mcp_server.create_transaction(
             user_id="fazrin",
@@ -184,7 +112,7 @@ class TestCreateTransaction:
 
     def test_invalid_category_returns_error(self, db, _patch_db):
         import mcp_server
-        _seed_test_accounts(db)
+        seed_test_accounts(db)
 
         result = mcp_server.create_transaction(
             user_id="fazrin",
@@ -199,7 +127,7 @@ class TestCreateTransaction:
 
     def test_invalid_account_returns_error(self, db, _patch_db):
         import mcp_server
-        _ensure_user(db, "fazrin")
+        ensure_user(db, "fazrin")
 
         result = mcp_server.create_transaction(
             user_id="fazrin",
@@ -213,7 +141,7 @@ class TestCreateTransaction:
 
     def test_auto_creates_user(self, db, _patch_db):
         import mcp_server
-        _ensure_account(db, "newuser_CASH", "Cash", "newuser", "cash")
+        ensure_account(db, "newuser_CASH", "Cash", "newuser", "cash")
 
         result = mcp_server.create_transaction(
             user_id="newuser",
@@ -228,7 +156,7 @@ class TestCreateTransaction:
 
     def test_effective_at_with_timezone(self, db, _patch_db):
         import mcp_server
-        _seed_test_accounts(db)
+        seed_test_accounts(db)
 
         result = mcp_server.create_transaction(
             user_id="fazrin",
@@ -246,7 +174,7 @@ class TestCreateTransaction:
 
     def test_metadata_stored(self, db, _patch_db):
         import mcp_server
-        _seed_test_accounts(db)
+        seed_test_accounts(db)
 
         result = mcp_server.create_transaction(
             user_id="fazrin",
@@ -264,7 +192,7 @@ class TestCreateTransaction:
 
     def test_response_is_json_serializable(self, db, _patch_db):
         import mcp_server
-        _seed_test_accounts(db)
+        seed_test_accounts(db)
 
         result = mcp_server.create_transaction(
             user_id="fazrin",
@@ -287,7 +215,7 @@ class TestListTransactions:
 
     def test_filters_by_user(self, db, _patch_db):
         import mcp_server
-        _seed_test_accounts(db)
+        seed_test_accounts(db)
 
         mcp_server.create_transaction(
             user_id="fazrin", transaction_type="expense",
@@ -305,7 +233,7 @@ class TestGetTransaction:
 
     def test_found(self, db, _patch_db):
         import mcp_server
-        _seed_test_accounts(db)
+        seed_test_accounts(db)
 
         created = mcp_server.create_transaction(
             user_id="fazrin", transaction_type="expense",
@@ -328,7 +256,7 @@ class TestVoidTransaction:
 
     def test_void_success(self, db, _patch_db):
         import mcp_server
-        _seed_test_accounts(db)
+        seed_test_accounts(db)
 
         created = mcp_server.create_transaction(
             user_id="fazrin", transaction_type="expense",
@@ -347,7 +275,7 @@ class TestVoidTransaction:
 
     def test_double_void_fails(self, db, _patch_db):
         import mcp_server
-        _seed_test_accounts(db)
+        seed_test_accounts(db)
 
         created = mcp_server.create_transaction(
             user_id="fazrin", transaction_type="expense",
@@ -365,7 +293,7 @@ class TestCorrectTransaction:
 
     def test_correct_changes_amount(self, db, _patch_db):
         import mcp_server
-        _seed_test_accounts(db)
+        seed_test_accounts(db)
 
         created = mcp_server.create_transaction(
             user_id="fazrin", transaction_type="expense",
@@ -406,15 +334,15 @@ class TestListAccounts:
 
     def test_returns_seeded_accounts(self, db, _patch_db):
         import mcp_server
-        _seed_test_accounts(db)
+        seed_test_accounts(db)
 
         result = mcp_server.list_accounts()
         assert len(result) >= 3
 
     def test_filters_by_user(self, db, _patch_db):
         import mcp_server
-        _seed_test_accounts(db)
-        _ensure_account(db, "magfira_BCA", "BCA", "magfira")
+        seed_test_accounts(db)
+        ensure_account(db, "magfira_BCA", "BCA", "magfira")
 
         fazrin_accts = mcp_server.list_accounts(user_id="fazrin")
         magfira_accts = mcp_server.list_accounts(user_id="magfira")
@@ -427,7 +355,7 @@ class TestGetAccountBalances:
 
     def test_initial_zero(self, db, _patch_db):
         import mcp_server
-        _seed_test_accounts(db)
+        seed_test_accounts(db)
 
         result = mcp_server.get_account_balances(user_id="fazrin")
         assert len(result) >= 1
@@ -435,7 +363,7 @@ class TestGetAccountBalances:
 
     def test_balance_after_income(self, db, _patch_db):
         import mcp_server
-        _seed_test_accounts(db)
+        seed_test_accounts(db)
 
         mcp_server.create_transaction(
             user_id="fazrin", transaction_type="income",
@@ -448,7 +376,7 @@ class TestGetAccountBalances:
 
     def test_json_serializable(self, db, _patch_db):
         import mcp_server
-        _seed_test_accounts(db)
+        seed_test_accounts(db)
         result = mcp_server.get_account_balances()
         json.dumps(result)
 
@@ -457,7 +385,7 @@ class TestCreateAccount:
 
     def test_success(self, db, _patch_db):
         import mcp_server
-        _ensure_user(db, "fazrin")
+        ensure_user(db, "fazrin")
 
         result = mcp_server.create_account(
             id="fazrin_DANA", display_name="Dana",
@@ -470,7 +398,7 @@ class TestCreateAccount:
 
     def test_duplicate_rejected(self, db, _patch_db):
         import mcp_server
-        _seed_test_accounts(db)
+        seed_test_accounts(db)
 
         result = mcp_server.create_account(
             id="fazrin_BCA", display_name="BCA",
@@ -485,7 +413,7 @@ class TestAdjustAccountBalance:
 
     def test_credit(self, db, _patch_db):
         import mcp_server
-        _seed_test_accounts(db)
+        seed_test_accounts(db)
 
         result = mcp_server.adjust_account_balance(
             account_id="fazrin_BCA", amount=5000000,
@@ -497,7 +425,7 @@ class TestAdjustAccountBalance:
 
     def test_debit(self, db, _patch_db):
         import mcp_server
-        _seed_test_accounts(db)
+        seed_test_accounts(db)
 
         mcp_server.adjust_account_balance(
             account_id="fazrin_BCA", amount=5000000,
@@ -579,7 +507,7 @@ class TestGetBudgetStatus:
 
     def test_with_budget_and_spending(self, db, _patch_db):
         import mcp_server
-        _seed_test_accounts(db)
+        seed_test_accounts(db)
 
         mcp_server.upsert_budget(month="2026-02", category_id="food", limit_amount=1000000)
         mcp_server.create_transaction(
@@ -647,7 +575,7 @@ class TestGetMonthlySummary:
 
     def test_with_transactions(self, db, _patch_db):
         import mcp_server
-        _seed_test_accounts(db)
+        seed_test_accounts(db)
 
         mcp_server.create_transaction(
             user_id="fazrin", transaction_type="expense",
@@ -704,6 +632,101 @@ class TestHealthCheck:
         assert result == {"status": "ok"}
 
 
+class TestBatch:
+
+    def test_runs_calls_in_order_with_refs(self, db, _patch_db):
+        import mcp_server
+        seed_test_accounts(db)
+
+        result = mcp_server.batch([
+            {"tool": "create_transaction", "id": "lunch", "args": {
+                "user_id": "fazrin", "transaction_type": "expense", "amount": 45000,
+                "category_id": "eating_out", "from_account_id": "BCA",
+            }},
+            {"tool": "get_transaction", "args": {"txn_id": {"$ref": "lunch.transaction.id"}}},
+            {"tool": "health_check"},
+        ])
+
+        assert result["committed"] is True
+        created, fetched, health = result["results"]
+        assert fetched["id"] == created["transaction"]["id"]
+        assert fetched["amount"] == 45000
+        assert health == {"status": "ok"}
+
+    def test_failed_step_does_not_stop_non_atomic_batch(self, db, _patch_db):
+        import mcp_server
+
+        result = mcp_server.batch([
+            {"tool": "get_transaction", "args": {"txn_id": 999}},
+            {"tool": "get_transaction", "args": {"txn_id": {"$ref": "0.id"}}},
+            {"tool": "upsert_budget", "args": {"month": "2026-02", "category_id": "food", "limit_amount": 1000}},
+        ])
+
+        codes = [r.get("error", {}).get("code") for r in result["results"]]
+        assert codes == ["NOT_FOUND", "REF_ERROR", None]
+        assert mcp_server.list_budgets(month="2026-02")[0]["limit_amount"] == 1000
+
+    def test_cli_accepts_bare_list(self, db, _patch_db):
+        import mcp_server
+
+        output, exit_code = mcp_server._dispatch(["batch", '[{"tool": "health_check"}]'])
+        assert exit_code == 0
+        assert json.loads(output) == {"results": [{"status": "ok"}], "committed": True}
+
+    def test_atomic_batch_rolls_back_on_error(self, tmp_path, monkeypatch):
+        import app.database
+        import mcp_server
+        from app.seed import ensure_database
+
+        engine = create_engine(f"sqlite:///{tmp_path / 'ledger.db'}")
+        ensure_database(engine)
+        monkeypatch.setattr(app.database, "engine", engine)
+
+        result = mcp_server.batch([
+            {"tool": "upsert_budget", "args": {"month": "2026-02", "category_id": "food", "limit_amount": 1000}},
+            {"tool": "upsert_budget", "args": {"month": "2026-02", "category_id": "nonexistent", "limit_amount": 1000}},
+            {"tool": "health_check"},
+        ], atomic=True)
+
+        assert result["committed"] is False
+        codes = [r.get("error", {}).get("code") for r in result["results"]]
+        assert codes == [None, "NOT_FOUND", "ROLLED_BACK"]
+        with engine.connect() as conn:
+            assert conn.exec_driver_sql("SELECT COUNT(*) FROM budgets").scalar() == 0
+        engine.dispose()
+
+    def test_rolled_back_batch_leaves_no_cached_reads(self, tmp_path, monkeypatch):
+        """Reads after a step's commit (a SAVEPOINT release) must not be cached."""
+        import app.database
+        import mcp_server
+        from app.seed import ensure_database
+        from app.services import account_service
+
+        engine = create_engine(f"sqlite:///{tmp_path / 'ledger.db'}", connect_args={"check_same_thread": False})
+        ensure_database(engine)
+        monkeypatch.setattr(app.database, "engine", engine)
+
+        result = mcp_server.batch([
+            {"tool": "create_transaction", "args": {
+                "user_id": "fazrin", "transaction_type": "expense", "amount": 1_000_000,
+                "category_id": "groceries", "from_account_id": "fazrin_BCA",
+            }},
+            {"tool": "get_account_balances"},
+            {"tool": "get_transaction", "args": {"txn_id": 99999}},
+        ], atomic=True)
+        assert result["committed"] is False
+
+        # An unrelated commit brings data_version to the value the batch saw.
+        Session = sessionmaker(bind=engine)
+        with Session() as db:
+            db.add(Account(id="fazrin_DANA", display_name="DANA", type="ewallet", owner_id="fazrin"))
+            db.commit()
+        with Session() as db:
+            balances = {b.account_id: b.balance for b in account_service.compute_balances(db)}
+        assert balances["fazrin_BCA"] == 0
+        engine.dispose()
+
+
 # ---------------------------------------------------------------------------
 # Cross-cutting: account ownership enforcement
 # ---------------------------------------------------------------------------
@@ -714,8 +737,8 @@ class TestAccountOwnershipEnforcement:
 
     def test_cannot_use_other_users_account(self, db, _patch_db):
         import mcp_server
-        _seed_test_accounts(db)
-        _ensure_account(db, "magfira_BCA", "BCA", "magfira")
+        seed_test_accounts(db)
+        ensure_account(db, "magfira_BCA", "BCA", "magfira")
 
         result = mcp_server.create_transaction(
             user_id="magfira",
@@ -738,7 +761,7 @@ class TestVoidedTransactionsExcluded:
 
     def test_voided_not_in_list(self, db, _patch_db):
         import mcp_server
-        _seed_test_accounts(db)
+        seed_test_accounts(db)
 
         created = mcp_server.create_transaction(
             user_id="fazrin", transaction_type="expense",
@@ -756,7 +779,7 @@ class TestVoidedTransactionsExcluded:
 
     def test_voided_not_in_balance(self, db, _patch_db):
         import mcp_server
-        _seed_test_accounts(db)
+        seed_test_accounts(db)
 
         mcp_server.adjust_account_balance(
             account_id="fazrin_BCA", amount=1000000, user_id="fazrin",
@@ -0,0 +1,166 @@
+"""Tests for the versioned metadata cache, /v1/meta ETags and since_version.
+
+Run:
+    pytest tests/test_meta.py -v
+"""
+
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import REFERENCE_VERSION, read_counter
+from app.models import Account
+from app.services import account_service, meta_service
+
+
+@pytest.fixture()
+def builds(monkeypatch):
+    """Count how often the payload is actually rebuilt from the database."""
+    calls = []
+    real = meta_service._build_payload
+
+    def _counting(db):
+        calls.append(1)
+        return real(db)
+
+    monkeypatch.setattr(meta_service, "_build_payload", _counting)
+    return calls
+
+
+class TestMetadataCache:
+
+    def test_payload_reused_until_reference_data_changes(self, db, builds):
+        first, version = meta_service.get_metadata(db)
+        again, same = meta_service.get_metadata(db)
+        assert again is first and same == version
+        assert len(builds) == 1
+
+        account_service.create_account(db, "Jago", "Bank Jago", "bank", owner_id="fazrin")
+        db.commit()
+        rebuilt, new_version = meta_service.get_metadata(db)
+        assert len(builds) == 2
+        assert new_version != version
+        assert "Jago" in {a["id"] for a in rebuilt["accounts"]}
+
+    def test_counter_bumps_only_for_reference_tables(self, db):
+        from app.models import Budget
+
+        before = read_counter(db, REFERENCE_VERSION)
+        db.add(Budget(category_id="food", month="2026-02", limit_amount=1))
+        db.commit()
+        assert read_counter(db, REFERENCE_VERSION) == before
+
+    def test_uncommitted_changes_are_not_cached(self, db, builds):
+        db.add(Account(id="Jago", display_name="Bank Jago", type="bank", owner_id="fazrin"))
+        db.flush()
+        payload, _ = meta_service.get_metadata(db)
+        assert "Jago" in {a["id"] for a in payload["accounts"]}
+
+        db.rollback()
+        payload, _ = meta_service.get_metadata(db)
+        assert "Jago" not in {a["id"] for a in payload["accounts"]}
+        assert len(builds) == 2
+
+    def test_rolled_back_atomic_session_is_not_cached(self, tmp_path):
+        """A step's commit inside atomic_session only releases a SAVEPOINT."""
+        from app.database import atomic_session
+        from app.seed import ensure_database
+
+        engine = create_engine(f"sqlite:///{tmp_path / 'ledger.db'}")
+        ensure_database(engine)
+        with pytest.raises(RuntimeError), atomic_session(engine) as db:
+            account_service.create_account(db, "Ghost", "Ghost", "bank", owner_id="fazrin")
+            db.commit()
+            meta_service.get_metadata(db)
+            raise RuntimeError("batch step failed")
+
+        # The next commit reaches the reference_version the batch saw.
+        with sessionmaker(bind=engine)() as db:
+            account_service.create_account(db, "Real", "Real", "bank", owner_id="fazrin")
+            db.commit()
+            payload, _ = meta_service.get_metadata(db)
+        accounts = {a["id"] for a in payload["accounts"]}
+        assert "Real" in accounts and "Ghost" not in accounts
+        engine.dispose()
+
+
+class TestReferenceSnapshot:
+
+    def test_snapshot_reused_until_reference_data_changes(self, db, builds):
+        first = meta_service.reference_snapshot(db)
+        assert meta_service.reference_snapshot(db) is first
+
+        account_service.create_account(db, "Jago", "Bank Jago", "bank", owner_id="fazrin")
+        db.commit()
+        second = meta_service.reference_snapshot(db)
+        assert second is not first
+        assert "Jago" in {a.id for a in second.accounts}
+        assert len(builds) == 2
+
+    def test_snapshot_shape(self, db):
+        ref = meta_service.reference_snapshot(db)
+        food = next(g for g in ref.category_tree if g["parent"].id == "food")
+        assert "groceries" in {c.id for c in food["children"]}
+        assert ref.cat_name_map["groceries"] == "Groceries"
+        assert [c.display_name for c in ref.categories] == sorted(c.display_name for c in ref.categories)
+        assert {u.id for u in ref.users} >= {"fazrin", "magfira"}
+
+    def test_dashboard_context_costs_one_query_when_warm(self, db):
+        from sqlalchemy import event
+
+        from app.routers.dashboard import _common_ctx
+
+        _common_ctx(db)
+        statements = []
+        engine = db.get_bind().engine
+        listener = lambda *args: statements.append(args[2])  # noqa: E731
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            ctx = _common_ctx(db)
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+        assert len(statements) == 1  # the reference_version counter
+        assert ctx["cat_name_map"]["coffee"] == "Coffee"
+
+
+class TestMetaEndpoint:
+
+    def test_etag_round_trip(self, client):
+        resp = client.get("/v1/meta")
+        assert resp.status_code == 200
+        etag = resp.headers["etag"]
+        assert "server_time" in resp.json()
+
+        resp = client.get("/v1/meta", headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+        assert resp.headers["etag"] == etag
+        assert resp.content == b""
+
+    def test_stale_etag_gets_full_body(self, client):
+        resp = client.get("/v1/meta", headers={"If-None-Match": 'W/"stale"'})
+        assert resp.status_code == 200
+        assert resp.json()["categories"]
+
+
+class TestGetMetadataSinceVersion:
+
+    def test_unchanged_reply(self, db, _patch_db):
+        import mcp_server
+
+        full = mcp_server.get_metadata()
+        short = mcp_server.get_metadata(since_version=full["version"])
+        assert short["unchanged"] is True
+        assert short["version"] == full["version"]
+        assert "server_time" in short
+        assert "categories" not in short
+
+    def test_changed_reply_is_full(self, db, _patch_db):
+        import mcp_server
+
+        full = mcp_server.get_metadata()
+        mcp_server.create_account("Jago", "Bank Jago", "bank", owner_id="fazrin")
+        result = mcp_server.get_metadata(since_version=full["version"])
+        assert "unchanged" not in result
+        assert result["version"] != full["version"]
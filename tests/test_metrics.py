@@ -0,0 +1,110 @@
+"""Tests for the metrics registry, push file and GET /metrics (app/metrics.py).
+
+Run:
+    pytest tests/test_metrics.py -v
+"""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+import ledger_client
+from app import metrics
+from app.config import settings
+from tests.conftest import seed_test_accounts
+
+
+@pytest.fixture(autouse=True)
+def _fresh_registry():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+class TestRegistry:
+
+    def test_histogram_exposition(self):
+        metrics.observe("ledger_tool_seconds", 0.003, tool="get_metadata")
+        metrics.observe("ledger_tool_seconds", 0.2, tool="get_metadata")
+        lines = metrics.render().splitlines()
+        assert "# TYPE ledger_tool_seconds histogram" in lines
+        labels = 'tool="get_metadata",source="api"'
+        assert f'ledger_tool_seconds_bucket{{{labels},le="0.005"}} 1' in lines
+        assert f'ledger_tool_seconds_bucket{{{labels},le="0.25"}} 2' in lines
+        assert f'ledger_tool_seconds_bucket{{{labels},le="+Inf"}} 2' in lines
+        assert f"ledger_tool_seconds_count{{{labels}}} 2" in lines
+        assert f"ledger_tool_seconds_sum{{{labels}}} 0.203" in lines
+
+    def test_push_adds_to_the_file_and_clears_the_process(self, tmp_path):
+        path = str(tmp_path / "metrics.json")
+        for _ in range(2):
+            metrics.inc("ledger_db_queries_total", 3)
+            metrics.observe("ledger_tool_seconds", 0.01, tool="list_budgets")
+            metrics.push(path)
+        assert not metrics.pending()
+        lines = metrics.render(path).splitlines()
+        assert 'ledger_db_queries_total{source="cli"} 6' in lines
+        assert 'ledger_tool_seconds_count{tool="list_budgets",source="cli"} 2' in lines
+
+    def test_unreadable_file_is_ignored(self, tmp_path):
+        path = tmp_path / "metrics.json"
+        path.write_text("{not json")
+        metrics.inc("ledger_db_busy_total")
+        metrics.push(str(path))
+        assert 'ledger_db_busy_total{source="cli"} 1' in metrics.render(str(path))
+
+    def test_file_sizes(self, tmp_path):
+        (tmp_path / "ledger.db").write_bytes(b"x" * 4096)
+        text_ = metrics.render(files={"db": str(tmp_path / "ledger.db"), "wal": str(tmp_path / "missing")})
+        assert 'ledger_db_file_bytes{file="db"} 4096' in text_.splitlines()
+        assert 'file="wal"' not in text_
+
+    def test_busy_statements_are_counted(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'busy.db'}", connect_args={"timeout": 0})
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE t (x)"))
+        holder = engine.raw_connection()
+        holder.execute("BEGIN IMMEDIATE")
+        try:
+            with pytest.raises(OperationalError), engine.begin() as conn:
+                conn.execute(text("INSERT INTO t VALUES (1)"))
+        finally:
+            holder.rollback()
+            holder.close()
+            engine.dispose()
+        assert "ledger_db_busy_total{source=\"api\"} 1" in metrics.render()
+
+
+class TestEndpoint:
+
+    def test_reports_requests_services_queries_and_caches(self, client, monkeypatch):
+        monkeypatch.setattr(settings, "metrics_file", "")
+        for _ in range(2):
+            assert client.get("/v1/budgets/status?month=2026-02").status_code == 200
+        resp = client.get("/metrics")
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+        lines = resp.text.splitlines()
+        assert ('ledger_http_request_seconds_count{method="GET",route="/v1/budgets/status",source="api"} 2'
+                in lines)
+        assert 'ledger_service_seconds_count{function="compute_budget_status",source="api"} 2' in lines
+        assert 'ledger_cache_requests_total{cache="results",result="hit",source="api"} 1' in lines
+        assert any(line.startswith('ledger_db_queries_total{source="api"} ') for line in lines)
+
+
+class TestDaemonPush:
+
+    def test_tool_calls_reach_the_metrics_file(self, db, daemon, tmp_path):
+        seed_test_accounts(db)
+        output, exit_code = ledger_client.call_daemon(["get_budget_status", '{"month": "2026-02"}'], daemon)
+        assert exit_code == 0, output
+        path = tmp_path / "metrics.json"
+        deadline = time.monotonic() + 5
+        while not path.exists() and time.monotonic() < deadline:
+            time.sleep(0.01)  # pushed after the reply is written
+        lines = metrics.render(str(path)).splitlines()
+        assert 'ledger_tool_seconds_count{tool="get_budget_status",source="cli"} 1' in lines
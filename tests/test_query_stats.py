@@ -0,0 +1,74 @@
+"""Tests for per-request query instrumentation (app/query_stats.py).
+
+Run:
+    pytest tests/test_query_stats.py -v
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import re
+
+from sqlalchemy import text
+
+from app import query_stats
+
+
+class TestTrack:
+
+    def test_counts_and_times_queries_in_scope(self, db):
+        with query_stats.track() as stats:
+            db.execute(text("SELECT 1")).all()
+            db.execute(text("SELECT count(*) FROM transactions")).all()
+        assert stats.queries == 2
+        assert stats.db_seconds >= stats.slowest_seconds > 0
+        assert stats.slowest_statement.startswith("SELECT")
+        assert query_stats.current() is None
+
+    def test_queries_outside_a_scope_are_not_counted(self, db):
+        with query_stats.track() as stats:
+            pass
+        db.execute(text("SELECT 1")).all()
+        assert stats.queries == 0
+
+    def test_log_line_is_logfmt(self, caplog):
+        stats = query_stats.QueryStats()
+        stats.add("SELECT *\n  FROM transactions", 0.002)
+        with caplog.at_level(logging.INFO, logger="app.requests"):
+            query_stats.log(stats, 0.0123, method="GET", path="/v1/accounts")
+        assert caplog.messages == [
+            'method=GET path=/v1/accounts duration_ms=12.3 db_queries=1 db_ms=2.0 '
+            'db_slowest_ms=2.0 db_slowest="SELECT * FROM transactions"'
+        ]
+
+
+class TestHttp:
+
+    def test_server_timing_header_and_log_line(self, client, caplog):
+        with caplog.at_level(logging.INFO, logger="app.requests"):
+            resp = client.get("/v1/budgets/status?month=2026-02")
+        assert resp.status_code == 200
+        timing = resp.headers["server-timing"]
+        match = re.match(r'db;dur=[\d.]+;desc="(\d+) queries", db-slowest;dur=[\d.]+, total;dur=[\d.]+$', timing)
+        assert match and int(match.group(1)) > 0
+
+        line = next(m for m in caplog.messages if "path=/v1/budgets/status" in m)
+        assert line.startswith("method=GET path=/v1/budgets/status status=200 duration_ms=")
+        assert f"db_queries={match.group(1)} " in line
+
+    def test_request_without_queries(self, client):
+        resp = client.get("/health")
+        assert resp.headers["server-timing"].startswith('db;dur=0.0;desc="0 queries", total;dur=')
+
+
+class TestCli:
+
+    def test_tool_call_is_logged(self, _patch_db, caplog):
+        import mcp_server
+
+        with caplog.at_level(logging.INFO, logger="app.requests"):
+            output, code = mcp_server._dispatch(["get_budget_status", json.dumps({"month": "2026-02"})])
+        assert code == 0
+        line = next(m for m in caplog.messages if m.startswith("tool=get_budget_status"))
+        assert re.match(r"tool=get_budget_status exit_code=0 duration_ms=[\d.]+ db_queries=[1-9]", line)
@@ -0,0 +1,57 @@
+"""Tests for the read-only engine used by GET routes and read tools.
+
+Run:
+    pytest tests/test_read_engine.py -v
+"""
+
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import OperationalError
+
+from app.config import Settings
+from app.database import ReadSessionLocal, SessionLocal, configure_sqlite, database_key, engine, read_engine
+from app.seed import ensure_database
+
+
+@pytest.fixture()
+def engines(tmp_path):
+    """Write and read engines for a throwaway file, configured like the app's."""
+    cfg = Settings(db_path=str(tmp_path / "ledger.db"))
+    writer = create_engine(cfg.db_url, connect_args={"check_same_thread": False}, pool_size=1, max_overflow=0)
+    reader = create_engine(cfg.db_read_url, connect_args={"check_same_thread": False, "uri": True})
+    event.listen(writer, "connect", lambda conn, _rec: configure_sqlite(conn, "durable"))
+    event.listen(reader, "connect", lambda conn, _rec: configure_sqlite(conn, "durable", read_only=True))
+    ensure_database(writer)
+    yield writer, reader
+    reader.dispose()
+    writer.dispose()
+
+
+def test_read_engine_rejects_writes(engines):
+    _, reader = engines
+    with reader.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA query_only").scalar() == 1
+        assert conn.exec_driver_sql("SELECT COUNT(*) FROM users").scalar() == 2
+        with pytest.raises(OperationalError, match="readonly"):
+            conn.exec_driver_sql("INSERT INTO users (id, display_name, created_at) VALUES ('x', 'x', 0)")
+
+
+def test_running_report_does_not_block_writer(engines):
+    writer, reader = engines
+    with reader.connect() as report:
+        rows = report.exec_driver_sql("SELECT id FROM categories")
+        rows.fetchone()  # statement still active, holding its read snapshot
+        with writer.begin() as conn:
+            conn.exec_driver_sql("INSERT INTO users (id, display_name, created_at) VALUES ('x', 'x', 0)")
+        assert len(rows.fetchall()) > 0
+    with reader.connect() as conn:
+        assert conn.exec_driver_sql("SELECT COUNT(*) FROM users").scalar() == 3
+
+
+def test_app_engines():
+    assert engine.pool.size() == 1
+    assert "mode=ro" in str(read_engine.url)
+    with SessionLocal() as write_db, ReadSessionLocal() as read_db:
+        assert database_key(read_db) is database_key(write_db) is engine
@@ -0,0 +1,68 @@
+"""Tests for schema creation, seeding, and the user_version fast path.
+
+Run:
+    pytest tests/test_seed.py -v
+"""
+
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import create_engine, event, text
+
+from app.seed import SCHEMA_VERSION, ensure_database
+
+
+@pytest.fixture()
+def file_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'ledger.db'}")
+    yield engine
+    engine.dispose()
+
+
+def _user_version(engine) -> int:
+    with engine.connect() as conn:
+        return conn.exec_driver_sql("PRAGMA user_version").scalar()
+
+
+class TestEnsureDatabase:
+
+    def test_first_run_creates_seeds_and_stamps(self, file_engine):
+        assert ensure_database(file_engine) is True
+        assert _user_version(file_engine) == SCHEMA_VERSION
+
+        with file_engine.connect() as conn:
+            users = {r.id for r in conn.execute(text("SELECT id FROM users"))}
+            categories = conn.execute(text("SELECT COUNT(*) FROM categories")).scalar()
+        assert {"fazrin", "magfira"} <= users
+        assert categories > 0
+
+    def test_stamped_database_is_a_single_query(self, file_engine):
+        ensure_database(file_engine)
+
+        statements: list[str] = []
+        event.listen(file_engine, "before_cursor_execute", lambda *a: statements.append(a[2]))
+
+        assert ensure_database(file_engine) is False
+        assert statements == ["PRAGMA user_version"]
+
+    def test_older_stamp_reruns_create_and_seed(self, file_engine):
+        ensure_database(file_engine)
+        with file_engine.begin() as conn:
+            conn.execute(text("DELETE FROM users WHERE id = 'magfira'"))
+            conn.exec_driver_sql("PRAGMA user_version = 0")
+
+        assert ensure_database(file_engine) is True
+        assert _user_version(file_engine) == SCHEMA_VERSION
+        with file_engine.connect() as conn:
+            assert conn.execute(text("SELECT 1 FROM users WHERE id = 'magfira'")).scalar() == 1
+
+    def test_older_stamp_adds_new_nullable_columns(self, file_engine):
+        ensure_database(file_engine)
+        with file_engine.begin() as conn:
+            conn.exec_driver_sql("ALTER TABLE transactions DROP COLUMN fx_rate")
+            conn.exec_driver_sql("PRAGMA user_version = 0")
+
+        ensure_database(file_engine)
+        with file_engine.connect() as conn:
+            columns = {row[1] for row in conn.exec_driver_sql("PRAGMA table_info(transactions)")}
+        assert "fx_rate" in columns
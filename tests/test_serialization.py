@@ -0,0 +1,76 @@
+"""Tests for the fast JSON serialization path.
+
+The row-tuple listing and the orjson/pydantic-core encoder must produce the
+same JSON values as the pydantic models they replace, so the OpenClaw tool
+contracts do not change.
+
+Run:
+    pytest tests/test_serialization.py -v
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime
+
+import pytest
+
+from app import serialization
+from app.schemas import TransactionCreate, TransactionOut, TransactionType
+from app.services import summary_service, transaction_service
+from tests.conftest import seed_test_accounts
+
+
+def _create(db, **overrides):
+    data = dict(
+        user_id="fazrin", transaction_type=TransactionType.expense, amount=25000,
+        category_id="coffee", from_account_id="BCA", merchant="Kopi Kenangan",
+        effective_at=datetime(2026, 2, 15, 8, 30), timezone="Asia/Jakarta",
+    )
+    data.update(overrides)
+    return transaction_service.create_transaction(db, TransactionCreate(**data))["transaction"]
+
+
+class TestTransactionRows:
+
+    def test_matches_transaction_out(self, db):
+        seed_test_accounts(db)
+        _create(db, metadata={"raw_text": "kopi 25k ☕"})
+        _create(db, amount=1_000_000, description="laptop bag", note=None, merchant=None)
+        txn = _create(db)
+        txn.created_at = datetime(2026, 2, 15, 1, 30, 0, 123456)
+        db.commit()
+
+        orm_rows, orm_total = transaction_service.list_transactions(db, month="2026-02")
+        fast_rows, fast_total = transaction_service.list_transaction_rows(db, month="2026-02")
+
+        assert fast_total == orm_total == 3
+        assert fast_rows == [TransactionOut.model_validate(r).model_dump(mode="json") for r in orm_rows]
+
+    def test_filters_match(self, db):
+        seed_test_accounts(db)
+        _create(db)
+        _create(db, category_id="fuel", merchant="Pertamina")
+
+        fast_rows, total = transaction_service.list_transaction_rows(db, category_id="transport", search="pertamina")
+        assert total == 1
+        assert fast_rows[0]["category_id"] == "fuel"
+
+
+class TestDumps:
+
+    @pytest.mark.parametrize("value", [
+        {"a": 1, "b": [1.5, None, True], "nested": {"x": "ünïcödé"}},
+        [{"status": "ok"}],
+    ])
+    def test_same_values_as_json_dumps(self, value):
+        assert json.loads(serialization.dumps(value)) == json.loads(json.dumps(value, ensure_ascii=False, default=str))
+
+    def test_pydantic_model_single_pass(self, db):
+        summary = summary_service.monthly_summary(db, "2026-02")
+        assert json.loads(serialization.dumps(summary)) == summary.model_dump(mode="json")
+
+    def test_pydantic_core_fallback(self, monkeypatch):
+        monkeypatch.setattr(serialization, "orjson", None)
+        value = {"when": datetime(2026, 2, 15), "n": 3}
+        assert json.loads(serialization.dumps(value)) == {"when": "2026-02-15T00:00:00", "n": 3}
@@ -0,0 +1,181 @@
+"""Tests for single-flight coalescing of expensive service reads.
+
+Run:
+    pytest tests/test_singleflight.py -v
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+from sqlalchemy import create_engine, event, update
+from sqlalchemy.orm import Session
+
+from app.database import DATA_VERSION, Base, read_counter
+from app.models import User
+from app.services.singleflight import coalesce
+
+
+@pytest.fixture()
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'sf.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def _run_concurrently(engine, fn, *args, n=6):
+    results, errors = [], []
+
+    def _call():
+        with Session(engine) as session:
+            try:
+                results.append(fn(session, *args))
+            except Exception as exc:
+                errors.append(exc)
+
+    threads = [threading.Thread(target=_call) for _ in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results, errors
+
+
+class TestCoalesce:
+
+    def test_concurrent_identical_calls_share_one_run(self, engine):
+        runs = []
+
+        @coalesce
+        def slow(db, month):
+            runs.append(month)
+            time.sleep(0.2)
+            return {"month": month}
+
+        results, errors = _run_concurrently(engine, slow, "2026-02")
+        assert not errors
+        assert runs == ["2026-02"]
+        assert all(r is results[0] for r in results)
+
+    def test_different_args_run_separately(self, engine):
+        runs = []
+
+        @coalesce
+        def slow(db, month):
+            runs.append(month)
+            time.sleep(0.1)
+            return month
+
+        threads = [
+            threading.Thread(target=lambda m=m: slow(Session(engine), m))
+            for m in ("2026-01", "2026-02")
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert sorted(runs) == ["2026-01", "2026-02"]
+
+    def test_error_reaches_every_waiter(self, engine):
+        runs = []
+
+        @coalesce
+        def failing(db):
+            runs.append(1)
+            time.sleep(0.2)
+            raise ValueError("boom")
+
+        results, errors = _run_concurrently(engine, failing)
+        assert runs == [1]
+        assert len(errors) == 6 and not results
+
+    def test_new_data_version_is_not_shared(self, engine):
+        @coalesce
+        def count(db):
+            return db.query(User).count()
+
+        with Session(engine) as db:
+            assert count(db) == 0
+            db.add(User(id="u1", display_name="U1"))
+            db.commit()
+            assert count(db) == 1
+
+    def test_session_with_pending_writes_bypasses_coalescing(self, engine, monkeypatch):
+        from app.services import singleflight
+
+        @coalesce
+        def count(db):
+            return db.query(User).count()
+
+        def _no_key(*_args):
+            raise AssertionError("a session with its own writes was keyed for sharing")
+
+        monkeypatch.setattr(singleflight, "read_counter", _no_key)
+        with Session(engine) as db:
+            db.add(User(id="u1", display_name="U1"))
+            assert count(db) == 1  # pending object
+            assert count(db) == 1  # flushed, not committed
+
+
+class TestVersionedCache:
+
+    def test_result_reused_until_data_changes(self, engine):
+        runs = []
+
+        @coalesce
+        def count(db):
+            runs.append(1)
+            return db.query(User).count()
+
+        with Session(engine) as db:
+            assert count(db) == 0
+        with Session(engine) as db:
+            assert count(db) == 0
+            assert len(runs) == 1
+            db.add(User(id="u1", display_name="U1"))
+            db.commit()
+        with Session(engine) as db:
+            assert count(db) == 1
+            assert len(runs) == 2
+
+    def test_write_from_another_process_invalidates(self, engine, tmp_path):
+        """A second engine on the same file stands in for the CLI process."""
+        other = create_engine(f"sqlite:///{tmp_path / 'sf.db'}")
+
+        @coalesce
+        def count(db):
+            return db.query(User).count()
+
+        with Session(engine) as db:
+            assert count(db) == 0
+            with Session(other) as writer:
+                writer.add(User(id="u1", display_name="U1"))
+                writer.commit()
+            assert count(db) == 1
+        other.dispose()
+
+    def test_bulk_statements_bump_the_data_version(self, engine):
+        with Session(engine) as db:
+            db.add(User(id="u1", display_name="U1"))
+            db.commit()
+            before = read_counter(db, DATA_VERSION)
+            db.execute(update(User).values(display_name="Renamed"))
+            db.commit()
+            assert read_counter(db, DATA_VERSION) == before + 1
+
+    def test_counter_check_skips_the_table_when_nothing_changed(self, engine):
+        with Session(engine) as db:
+            db.add(User(id="u1", display_name="U1"))
+            db.commit()
+            read_counter(db, DATA_VERSION)
+            statements: list[str] = []
+            listener = lambda *a: statements.append(a[2])  # noqa: E731
+            event.listen(engine, "before_cursor_execute", listener)
+            try:
+                read_counter(db, DATA_VERSION)
+            finally:
+                event.remove(engine, "before_cursor_execute", listener)
+        assert statements == ["PRAGMA data_version"]
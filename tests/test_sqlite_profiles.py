@@ -0,0 +1,44 @@
+"""Tests for the LEDGER_DB_PROFILE connection pragmas.
+
+Run:
+    pytest tests/test_sqlite_profiles.py -v
+"""
+
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+from app.config import Settings
+from app.database import SQLITE_PROFILES, configure_sqlite
+
+_SYNCHRONOUS = {"OFF": 0, "NORMAL": 1, "FULL": 2}
+_TEMP_STORE = {"DEFAULT": 0, "FILE": 1, "MEMORY": 2}
+
+
+@pytest.mark.parametrize("profile", sorted(SQLITE_PROFILES))
+def test_profile_pragmas_are_applied(tmp_path, profile):
+    conn = sqlite3.connect(tmp_path / "ledger.db")
+    configure_sqlite(conn, profile)
+    read = {name: conn.execute(f"PRAGMA {name}").fetchone()[0] for name in SQLITE_PROFILES[profile]}
+    expected = dict(SQLITE_PROFILES[profile])
+    expected["synchronous"] = _SYNCHRONOUS[expected["synchronous"]]
+    expected["temp_store"] = _TEMP_STORE[expected["temp_store"]]
+    assert read == expected
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+    conn.close()
+
+
+def test_profile_setting_is_validated(monkeypatch):
+    monkeypatch.setenv("LEDGER_DB_PROFILE", "balanced")
+    assert Settings().db_profile == "balanced"
+    monkeypatch.setenv("LEDGER_DB_PROFILE", "reckless")
+    with pytest.raises(ValueError):
+        Settings()
+
+
+def test_default_profile_keeps_full_sync():
+    assert Settings.model_fields["db_profile"].default == "durable"
+    assert SQLITE_PROFILES["durable"]["synchronous"] == "FULL"
@@ -0,0 +1,77 @@
+"""Cold-start import budget for the CLI.
+
+Every bot step runs ``mcp_server.py`` (or its fallback) in a fresh
+interpreter, so import time is paid on every call.  These tests run the CLI
+under ``python -X importtime`` and fail if a simple tool starts importing
+heavy modules again or its imports grow past the budget.
+
+The budget can be raised on slow machines with LEDGER_IMPORT_BUDGET_MS.
+
+Run:
+    pytest tests/test_startup.py -v
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parent.parent
+
+IMPORT_BUDGET_MS = float(os.environ.get("LEDGER_IMPORT_BUDGET_MS", "100"))
+
+HEAVY_MODULES = {"fastapi", "fastmcp", "httpx"}
+
+
+def _parse_importtime(stderr: str) -> dict[str, tuple[int, int]]:
+    """Parse -X importtime output into {module: (nesting depth, cumulative µs)}."""
+    imports: dict[str, tuple[int, int]] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        imports[name.strip()] = (depth, int(cumulative))
+    return imports
+
+
+def _importtime(tmp_path: Path, *args: str) -> dict[str, tuple[int, int]]:
+    env = {**os.environ, "LEDGER_DB_PATH": str(tmp_path / "ledger.db")}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True, text=True, cwd=tmp_path, env=env, check=True,
+    )
+    return _parse_importtime(proc.stderr)
+
+
+@pytest.fixture()
+def interpreter_imports(tmp_path) -> set[str]:
+    """Modules a bare interpreter imports before any of our code runs."""
+    return set(_importtime(tmp_path, "-c", "pass"))
+
+
+class TestColdStart:
+
+    def test_health_check_within_budget(self, tmp_path, interpreter_imports):
+        imports = _importtime(tmp_path, str(ROOT / "mcp_server.py"), "health_check")
+        ours = {
+            name: us for name, (depth, us) in imports.items()
+            if depth == 0 and name not in interpreter_imports
+        }
+
+        total_ms = sum(ours.values()) / 1000
+        slowest = sorted(ours.items(), key=lambda kv: kv[1], reverse=True)[:5]
+        assert total_ms <= IMPORT_BUDGET_MS, f"{total_ms:.1f}ms of imports, slowest: {slowest}"
+
+    def test_health_check_skips_database_stack(self, tmp_path):
+        imports = _importtime(tmp_path, str(ROOT / "mcp_server.py"), "health_check")
+        assert not ({"sqlalchemy", "pydantic", "app.schemas"} | HEAVY_MODULES) & imports.keys()
+
+    def test_db_tool_skips_heavy_modules(self, tmp_path):
+        imports = _importtime(tmp_path, str(ROOT / "mcp_server.py"), "list_budgets", '{"month": "2026-02"}')
+        assert "sqlalchemy" in imports
+        assert not HEAVY_MODULES & imports.keys()